@@ -0,0 +1,2 @@
+& ./venv/bin/python -O -m src.benchmarks run @args ; `
+& ./venv/bin/python -m src.benchmarks compare
\ No newline at end of file
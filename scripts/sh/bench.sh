@@ -0,0 +1,3 @@
+#!/bin/bash
+./venv/bin/python -O -m src.benchmarks run "$@" && \
+./venv/bin/python -m src.benchmarks compare
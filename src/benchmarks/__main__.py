@@ -0,0 +1,136 @@
+"""
+Runs the engine benchmarks and tracks their results per commit.
+
+    python -m src.benchmarks run [--games N] [--repeats N] [--only NAME ...]
+    python -m src.benchmarks compare [BASE] [TARGET] [--threshold 0.1]
+
+`run` adds the results to the JSON results file under the current commit (with
+a "-dirty" suffix if tracked files are modified). `compare` compares two
+commits of the results file, by default the two latest runs, and exits with 1
+if any benchmark got worse by more than the threshold (a fraction).
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from typing import Any
+
+from src.benchmarks.suite import BENCHMARKS, record_games
+
+_DEFAULT_RESULTS = "benchmark_results.json"
+
+
+def _commit() -> str:
+    def git(*args: str) -> str:
+        return subprocess.run(
+            ("git",) + args, capture_output=True, text=True, check=True
+        ).stdout.strip()
+
+    try:
+        commit = git("rev-parse", "--short", "HEAD")
+        if git("status", "--porcelain", "--untracked-files=no"):
+            commit += "-dirty"
+        return commit
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def _load(path: str) -> dict[str, Any]:
+    if not os.path.exists(path):
+        return {}
+    with open(path) as file:
+        return json.load(file)
+
+
+def run(args: argparse.Namespace) -> int:
+    names = args.only if args.only else list(BENCHMARKS)
+    unknown = [name for name in names if name not in BENCHMARKS]
+    if unknown:
+        print(f"Unknown benchmarks: {', '.join(unknown)}", file=sys.stderr)
+        return 2
+    recorded = record_games(args.games, args.repeats)
+    results = {}
+    for name in names:
+        result = BENCHMARKS[name](recorded)
+        results[name] = {
+            "value": result.value,
+            "unit": result.unit,
+            "higher_is_better": result.higher_is_better,
+        }
+        print(f"{name:>28} {result.value:12.2f} {result.unit}")
+    all_results = _load(args.results)
+    commit = _commit()
+    # re-inserted so the latest run of a commit comes last
+    all_results.pop(commit, None)
+    all_results[commit] = {
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "games": args.games,
+        "repeats": args.repeats,
+        "results": results,
+    }
+    with open(args.results, "w") as file:
+        json.dump(all_results, file, indent=2)
+    print(f"Results of {commit} saved to {args.results}")
+    return 0
+
+
+def compare(args: argparse.Namespace) -> int:
+    all_results = _load(args.results)
+    commits = list(all_results)
+    base = args.base if args.base is not None else (commits[-2] if len(commits) >= 2 else None)
+    target = args.target if args.target is not None else (commits[-1] if commits else None)
+    if base is None or target is None:
+        print(f"{args.results} needs two runs to compare", file=sys.stderr)
+        return 2
+    for commit in (base, target):
+        if commit not in all_results:
+            print(f"No results of {commit} in {args.results}", file=sys.stderr)
+            return 2
+    base_results = all_results[base]["results"]
+    target_results = all_results[target]["results"]
+    regressions = []
+    print(f"{'':>28} {base:>12} {target:>12} {'change':>8}")
+    for name, target_result in target_results.items():
+        base_result = base_results.get(name)
+        if base_result is None or base_result["value"] == 0:
+            continue
+        change = target_result["value"] / base_result["value"] - 1
+        worse = -change if target_result["higher_is_better"] else change
+        flag = ""
+        if worse > args.threshold:
+            flag = "  REGRESSION"
+            regressions.append(name)
+        print(
+            f"{name:>28} {base_result['value']:12.2f} {target_result['value']:12.2f}"
+            f" {change:+8.1%}{flag}"
+        )
+    if regressions:
+        print(f"{len(regressions)} regression(s) beyond {args.threshold:.0%}")
+        return 1
+    return 0
+
+
+def main(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(prog="python -m src.benchmarks")
+    parser.add_argument("--results", default=_DEFAULT_RESULTS, help="the JSON results file")
+    commands = parser.add_subparsers(dest="command", required=True)
+    run_parser = commands.add_parser("run", help="run the benchmarks")
+    run_parser.add_argument("--games", type=int, default=20)
+    run_parser.add_argument("--repeats", type=int, default=5)
+    run_parser.add_argument("--only", nargs="*", metavar="NAME")
+    run_parser.set_defaults(func=run)
+    compare_parser = commands.add_parser("compare", help="compare the results of two commits")
+    compare_parser.add_argument("base", nargs="?")
+    compare_parser.add_argument("target", nargs="?")
+    compare_parser.add_argument("--threshold", type=float, default=0.1)
+    compare_parser.set_defaults(func=compare)
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,241 @@
+"""
+The benchmarks of the engine, run on seeded RandomAgent games so runs on the
+same code play the same games.
+
+Each benchmark takes the recorded games and returns a Result; timings are the
+best of `repeats` runs, which is the least disturbed by other processes.
+"""
+import time
+import tracemalloc
+from dataclasses import dataclass
+from typing import Callable, Iterable
+
+from src.dgisim import dices as dcs
+from src.dgisim.agents import RandomAgent
+from src.dgisim.dices import AbstractDices, ActualDices
+from src.dgisim.effect.effect import SpecificDamageEffect
+from src.dgisim.element.element import Element
+from src.dgisim.game_state_machine import GameStateMachine, HistoryPolicy
+from src.dgisim.phase.action_phase import ActionPhase
+from src.dgisim.phase.game_end_phase import GameEndPhase
+from src.dgisim.state.game_state import GameState
+
+__all__ = [
+    "BENCHMARKS",
+    "Recorded",
+    "Result",
+    "record_games",
+]
+
+# costs the dice solver is benchmarked on
+_REQUIREMENTS = (
+    AbstractDices({Element.OMNI: 3}),
+    AbstractDices({Element.PYRO: 3}),
+    AbstractDices({Element.CRYO: 1, Element.ANY: 2}),
+    AbstractDices({Element.GEO: 2, Element.ANY: 1}),
+    AbstractDices({Element.ANY: 2}),
+    AbstractDices({Element.OMNI: 2}),
+    AbstractDices({Element.HYDRO: 4}),
+)
+
+
+@dataclass(frozen=True)
+class Result:
+    value: float
+    unit: str
+    higher_is_better: bool
+
+
+@dataclass(frozen=True)
+class Recorded:
+    """ the histories of the benchmarked games """
+    histories: tuple[tuple[GameState, ...], ...]
+    repeats: int
+
+    def game_states(self) -> Iterable[GameState]:
+        return (game_state for history in self.histories for game_state in history)
+
+    def decision_states(self) -> list[GameState]:
+        return [
+            game_state
+            for game_state in self.game_states()
+            if not game_state.game_end() and game_state.waiting_for() is not None
+        ]
+
+
+def _state_machine(seed: int, history_policy: HistoryPolicy = HistoryPolicy.FULL) -> GameStateMachine:
+    return GameStateMachine(
+        GameState.from_default(seed=seed),
+        RandomAgent(seed=seed),
+        RandomAgent(seed=seed + 1),
+        history_policy=history_policy,
+    )
+
+
+def record_games(num_games: int, repeats: int) -> Recorded:
+    histories = []
+    for seed in range(num_games):
+        state_machine = _state_machine(seed)
+        state_machine.step_until_phase(GameEndPhase)
+        histories.append(state_machine.get_history())
+    return Recorded(tuple(histories), repeats)
+
+
+def _best_time(repeats: int, run: Callable[[], None], setup: Callable[[], None] = lambda: None) -> float:
+    """ the shortest of repeats runs of run(), each after an untimed setup() """
+    best = float("inf")
+    for _ in range(repeats):
+        setup()
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _fresh_copies(game_states: list[GameState]) -> list[GameState]:
+    """ equal game states that share no objects (or cached hashes) with game_states """
+    return [GameState.from_bytes(game_state.to_bytes()) for game_state in game_states]
+
+
+def games_per_sec(recorded: Recorded) -> Result:
+    """ the benchmarked games played without keeping any history """
+    num_games = len(recorded.histories)
+
+    def run() -> None:
+        for seed in range(num_games):
+            _state_machine(seed, HistoryPolicy.NONE).step_until_phase(GameEndPhase)
+
+    return Result(num_games / _best_time(recorded.repeats, run), "games/s", True)
+
+
+def action_phase_steps_per_sec(recorded: Recorded) -> Result:
+    game_states = [
+        game_state
+        for game_state in recorded.game_states()
+        if isinstance(game_state.get_phase(), ActionPhase)
+        and not game_state.game_end()
+        and game_state.waiting_for() is None
+    ]
+
+    def run() -> None:
+        for game_state in game_states:
+            game_state.step()
+
+    return Result(len(game_states) / _best_time(recorded.repeats, run), "steps/s", True)
+
+
+def damage_us(recorded: Recorded) -> Result:
+    """ SpecificDamageEffect.execute() on the damages at the top of effect stacks """
+    damages = [
+        (game_state, game_state.get_effect_stack().peek())
+        for game_state in recorded.game_states()
+        if game_state.get_effect_stack().is_not_empty()
+        and isinstance(game_state.get_effect_stack().peek(), SpecificDamageEffect)
+    ]
+
+    def run() -> None:
+        for game_state, damage in damages:
+            damage.execute(game_state)
+
+    return Result(_best_time(recorded.repeats, run) / len(damages) * 1e6, "us", False)
+
+
+def _hash_eq_states(recorded: Recorded) -> list[GameState]:
+    return list(recorded.game_states())[::4]
+
+
+def hash_us(recorded: Recorded) -> Result:
+    """ GameState.__hash__() on states whose hashes are not computed yet """
+    game_states = _hash_eq_states(recorded)
+    copies: list[GameState] = []
+
+    def setup() -> None:
+        copies[:] = _fresh_copies(game_states)
+
+    def run() -> None:
+        for game_state in copies:
+            hash(game_state)
+
+    return Result(_best_time(recorded.repeats, run, setup) / len(game_states) * 1e6, "us", False)
+
+
+def eq_us(recorded: Recorded) -> Result:
+    """ GameState.__eq__() between equal states that share no objects """
+    game_states = _hash_eq_states(recorded)
+    pairs: list[tuple[GameState, GameState]] = []
+
+    def setup() -> None:
+        pairs[:] = zip(_fresh_copies(game_states), _fresh_copies(game_states))
+
+    def run() -> None:
+        for game_state, other in pairs:
+            game_state == other
+
+    return Result(_best_time(recorded.repeats, run, setup) / len(game_states) * 1e6, "us", False)
+
+
+def dice_solver_us(recorded: Recorded) -> Result:
+    """ uncached ActualDices.basically_satisfy() on the dices of decision states """
+    pairs = sorted(set(
+        (dices, requirement)
+        for game_state in recorded.decision_states()
+        for dices in (
+            game_state.get_player1().get_dices(),
+            game_state.get_player2().get_dices(),
+        )
+        for requirement in _REQUIREMENTS
+        if dices.num_dices() >= requirement.num_dices()
+    ), key=lambda pair: (pair[0]._counts, pair[1]._counts))
+
+    def setup() -> None:
+        dcs._satisfy.cache_clear()
+        dcs._basically_satisfy.cache_clear()
+
+    def run() -> None:
+        for dices, requirement in pairs:
+            dices.basically_satisfy(requirement)
+
+    return Result(_best_time(recorded.repeats, run, setup) / len(pairs) * 1e6, "us", False)
+
+
+def legal_actions_us(recorded: Recorded) -> Result:
+    """ GameState.legal_actions() of decision states, without the per state cache """
+    game_states = recorded.decision_states()
+    copies: list[GameState] = []
+
+    def setup() -> None:
+        copies[:] = _fresh_copies(game_states)
+
+    def run() -> None:
+        for game_state in copies:
+            pid = game_state.waiting_for()
+            assert pid is not None
+            game_state.legal_actions(pid)
+
+    return Result(_best_time(recorded.repeats, run, setup) / len(game_states) * 1e6, "us", False)
+
+
+def peak_memory_kib(recorded: Recorded) -> Result:
+    """ the peak memory allocated while playing a game with its full history """
+    num_games = min(len(recorded.histories), 3)
+    peaks = []
+    for seed in range(num_games):
+        tracemalloc.start()
+        try:
+            _state_machine(seed).step_until_phase(GameEndPhase)
+            peaks.append(tracemalloc.get_traced_memory()[1])
+        finally:
+            tracemalloc.stop()
+    return Result(sum(peaks) / num_games / 1024, "KiB", False)
+
+
+BENCHMARKS: dict[str, Callable[[Recorded], Result]] = {
+    "games_per_sec": games_per_sec,
+    "action_phase_steps_per_sec": action_phase_steps_per_sec,
+    "damage_us": damage_us,
+    "hash_us": hash_us,
+    "eq_us": eq_us,
+    "dice_solver_us": dice_solver_us,
+    "legal_actions_us": legal_actions_us,
+    "peak_memory_kib": peak_memory_kib,
+}
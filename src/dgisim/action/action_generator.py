@@ -57,6 +57,31 @@ class ActionGenerator:
     def choose(self, choice: DecidedChoiceType) -> ActionGenerator:
         return self._fill_helper(self, choice)
 
+    def all_actions(self) -> tuple[PlayerAction, ...]:
+        """
+        Returns all distinct actions this generator can be filled into (in the order
+        of the choices). Dices are always paid by `ActualDices.basically_satisfy()`.
+        """
+        from ..dices import AbstractDices
+        if self.filled():
+            return (self.generate_action(),)
+        choices = self.choices()
+        next_generators: tuple[ActionGenerator, ...]
+        if isinstance(choices, tuple):
+            next_generators = tuple(self.choose(choice) for choice in choices)
+        elif isinstance(choices, AbstractDices):
+            payment = self.dices_available().basically_satisfy(choices)
+            if payment is None:
+                return ()
+            next_generators = (self.choose(payment),)
+        else:
+            raise Exception(f"Unknown choices type {type(choices)}")
+        return tuple(dict.fromkeys(
+            action
+            for action_generator in next_generators
+            for action in action_generator.all_actions()
+        ))
+
     def __str__(self) -> str:
         field_pairs = [f"<{field.name}, {getattr(self, field.name)}>" for field in fields(self)]
         content = '\n'.join(field_pairs)
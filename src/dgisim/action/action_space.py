@@ -0,0 +1,234 @@
+"""
+A fixed size integer action space of a Mode, for policies that output one logit
+per action.
+
+Requires numpy (`pip install dgisim[numpy]`).
+"""
+from __future__ import annotations
+
+from typing import Iterable, Optional, Sequence, TYPE_CHECKING
+
+import numpy as np
+
+from ..character.character_skill_enum import CharacterSkill
+from ..effect.enums import ZONE
+from ..element.element import Element
+from ..state.enums import PID
+from .action import *
+
+if TYPE_CHECKING:
+    from ..card.card import Card
+    from ..mode import Mode
+    from ..state.game_state import GameState
+
+__all__ = [
+    "ActionSpace",
+]
+
+# the elements a die can be tuned from
+_TUNING_ELEMS: tuple[Element, ...] = (
+    Element.PYRO,
+    Element.HYDRO,
+    Element.ANEMO,
+    Element.ELECTRO,
+    Element.DENDRO,
+    Element.CRYO,
+    Element.GEO,
+)
+_TUNING_ELEM_IDXS: dict[Element, int] = dict(
+    (elem, i) for i, elem in enumerate(_TUNING_ELEMS)
+)
+_SKILLS: tuple[CharacterSkill, ...] = tuple(CharacterSkill)
+
+
+class ActionSpace:
+    """
+    Maps the legal actions of a game state to indices in [0, size()).
+
+    The layout only depends on the mode and the number of characters per player:
+
+    - end round
+    - select character, per character id
+    - swap, per character id
+    - death swap, per character id
+    - skill, per CharacterSkill
+    - play card, per card x target (no target, each character id, each support id)
+    - elemental tuning, per card x die element
+    - redraw one copy of a card, per card
+
+    Dices are not part of an index: every index stands for the payment chosen by
+    `GameState.legal_actions()` (`ActualDices.basically_satisfy()`), so a skill has
+    a single payment class. Redrawing a card is the only card selection covered.
+    """
+
+    def __init__(
+            self,
+            mode: Mode,
+            num_chars: int = 3,
+            cards: Optional[Iterable[type[Card]]] = None,
+            cache_size: int = 1024,
+    ) -> None:
+        """
+        `cards` defaults to the cards of the mode and the cards created during a game
+        """
+        if cards is None:
+            from ..card.cards_set import generated_cards
+            cards = mode.all_cards() | generated_cards()
+        self._mode = mode
+        self._num_chars = num_chars
+        self._num_supports = mode.supports_limit() + 1  # a sid may reach limit + 1
+        self._cards: tuple[type[Card], ...] = tuple(
+            sorted(set(cards), key=lambda card: card.name())
+        )
+        self._card_idxs: dict[type[Card], int] = dict(
+            (card, i) for i, card in enumerate(self._cards)
+        )
+        self._num_targets = 1 + num_chars + self._num_supports
+        num_cards = len(self._cards)
+
+        self._end_round_offset = 0
+        self._char_select_offset = self._end_round_offset + 1
+        self._swap_offset = self._char_select_offset + num_chars
+        self._death_swap_offset = self._swap_offset + num_chars
+        self._skill_offset = self._death_swap_offset + num_chars
+        self._card_offset = self._skill_offset + len(_SKILLS)
+        self._tuning_offset = self._card_offset + num_cards * self._num_targets
+        self._redraw_offset = self._tuning_offset + num_cards * len(_TUNING_ELEMS)
+        self._size = self._redraw_offset + num_cards
+
+        # (game_state, pid) -> (legal indices, index -> legal action)
+        self._cache_size = cache_size
+        self._legal_cache: dict[
+            tuple[GameState, PID],
+            tuple[np.ndarray, dict[int, PlayerAction]],
+        ] = {}
+
+    def size(self) -> int:
+        return self._size
+
+    def get_mode(self) -> Mode:
+        return self._mode
+
+    def encode(self, action: PlayerAction) -> Optional[int]:
+        """ the index of action, None if the action is not covered by this space """
+        if isinstance(action, EndRoundAction):
+            return self._end_round_offset
+        elif isinstance(action, CharacterSelectAction):
+            return self._char_index(self._char_select_offset, action.char_id)
+        elif isinstance(action, SwapAction):
+            return self._char_index(self._swap_offset, action.char_id)
+        elif isinstance(action, DeathSwapAction):
+            return self._char_index(self._death_swap_offset, action.char_id)
+        elif isinstance(action, SkillAction):
+            return self._skill_offset + action.skill.value
+        elif isinstance(action, CardAction):
+            card_idx = self._card_idxs.get(action.card)
+            target_idx = self._target_index(action.instruction)
+            if card_idx is None or target_idx is None:
+                return None
+            return self._card_offset + card_idx * self._num_targets + target_idx
+        elif isinstance(action, ElementalTuningAction):
+            card_idx = self._card_idxs.get(action.card)
+            elem_idx = _TUNING_ELEM_IDXS.get(action.dice_elem)
+            if card_idx is None or elem_idx is None:
+                return None
+            return self._tuning_offset + card_idx * len(_TUNING_ELEMS) + elem_idx
+        elif isinstance(action, CardSelectAction):
+            selected_cards = action.selected_cards
+            if selected_cards.num_cards() != 1:
+                return None
+            card_idx = self._card_idxs.get(next(iter(selected_cards)))
+            if card_idx is None:
+                return None
+            return self._redraw_offset + card_idx
+        return None
+
+    def _char_index(self, offset: int, char_id: int) -> Optional[int]:
+        if 1 <= char_id <= self._num_chars:
+            return offset + char_id - 1
+        return None
+
+    def _target_index(self, instruction: Instruction) -> Optional[int]:
+        if type(instruction) is DiceOnlyInstruction:
+            return 0
+        if type(instruction) is StaticTargetInstruction:
+            target = instruction.target
+            if target.zone is ZONE.CHARACTERS and 1 <= target.id <= self._num_chars:
+                return target.id
+            if target.zone is ZONE.SUPPORTS and 1 <= target.id <= self._num_supports:
+                return self._num_chars + target.id
+        return None
+
+    def _legal(
+            self,
+            game_state: GameState,
+            pid: PID,
+    ) -> tuple[np.ndarray, dict[int, PlayerAction]]:
+        key = (game_state, pid)
+        legal = self._legal_cache.get(key)
+        if legal is not None:
+            return legal
+        index_actions: dict[int, PlayerAction] = {}
+        for action in game_state.legal_actions(pid):
+            index = self.encode(action)
+            if index is not None and index not in index_actions:
+                index_actions[index] = action
+        idxs = np.fromiter(index_actions, dtype=np.intp, count=len(index_actions))
+        legal = (idxs, index_actions)
+        if len(self._legal_cache) >= self._cache_size:
+            del self._legal_cache[next(iter(self._legal_cache))]
+        self._legal_cache[key] = legal
+        return legal
+
+    def legal_indices(self, game_state: GameState, pid: Optional[PID] = None) -> np.ndarray:
+        """
+        the indices of the legal actions of pid, which defaults to the player
+        game_state is waiting for
+        """
+        if pid is None:
+            pid = game_state.waiting_for()
+            if pid is None:
+                return np.empty(0, dtype=np.intp)
+        return self._legal(game_state, pid)[0]
+
+    def mask(self, game_state: GameState, pid: Optional[PID] = None) -> np.ndarray:
+        """ boolean vector of length size(), True at the legal actions of pid """
+        mask = np.zeros(self._size, dtype=np.bool_)
+        mask[self.legal_indices(game_state, pid)] = True
+        return mask
+
+    def batch_mask(
+            self,
+            game_states: Sequence[GameState],
+            pids: None | PID | Iterable[Optional[PID]] = None,
+    ) -> np.ndarray:
+        """
+        boolean matrix of shape (len(game_states), size()), row i is the mask of
+        game_states[i]; `pids` is either one pid for all game states or one per
+        game state, None means the player the game state is waiting for
+        """
+        if pids is None or isinstance(pids, PID):
+            pids = [pids] * len(game_states)
+        idxs = [
+            self.legal_indices(game_state, pid)
+            for game_state, pid in zip(game_states, pids)
+        ]
+        mask = np.zeros((len(game_states), self._size), dtype=np.bool_)
+        if idxs:
+            rows = np.repeat(
+                np.arange(len(idxs), dtype=np.intp),
+                [len(row_idxs) for row_idxs in idxs],
+            )
+            mask[rows, np.concatenate(idxs)] = True
+        return mask
+
+    def decode(self, index: int, game_state: GameState, pid: Optional[PID] = None) -> PlayerAction:
+        """ the legal action of pid at index, raises if the index is not legal """
+        if pid is None:
+            pid = game_state.waiting_for()
+            if pid is None:
+                raise Exception(f"Game state is not waiting for any player: index {index}")
+        action = self._legal(game_state, pid)[1].get(int(index))
+        if action is None:
+            raise Exception(f"Index {index} is not a legal action of {pid}")
+        return action
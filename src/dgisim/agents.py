@@ -1,4 +1,9 @@
+import math
+import multiprocessing as mp
+import multiprocessing.pool
 import random
+import time
+from collections import OrderedDict
 from typing import Optional, Iterable, TYPE_CHECKING
 
 from .action.action import *
@@ -9,6 +14,7 @@ from .character.character_skill_enum import CharacterSkill
 from .dices import AbstractDices, ActualDices
 from .effect.effect import *
 from .element.element import Element
+from .history_view import HistoryView
 from .phase.action_phase import ActionPhase
 from .phase.card_select_phase import CardSelectPhase
 from .phase.end_phase import EndPhase
@@ -20,19 +26,24 @@ from .state.game_state import GameState
 
 
 class NoneAgent(PlayerAgent):
-    pass
+    NEEDS_HISTORY = False
 
 
 class LazyAgent(PlayerAgent):
+    NEEDS_HISTORY = False
     _NUM_PICKED_CARDS = 3
 
-    def choose_action(self, history: list[GameState], pid: PID) -> PlayerAction:
+    def __init__(self, seed: Optional[int] = None) -> None:
+        # without a seed, the agent is seeded from the global random
+        self._random = random.Random(random.getrandbits(64) if seed is None else seed)
+
+    def choose_action(self, history: HistoryView, pid: PID) -> PlayerAction:
         game_state = history[-1]
         curr_phase = game_state.get_phase()
 
         if isinstance(curr_phase, CardSelectPhase):
             _, selected_cards = game_state.get_player(
-                pid).get_hand_cards().pick_random_cards(self._NUM_PICKED_CARDS)
+                pid).get_hand_cards().pick_random_cards(self._NUM_PICKED_CARDS, self._random)
             return CardSelectAction(selected_cards=selected_cards)
 
         elif isinstance(curr_phase, StartingHandSelectPhase):
@@ -49,6 +60,8 @@ class LazyAgent(PlayerAgent):
 
 
 class PuppetAgent(PlayerAgent):
+    NEEDS_HISTORY = False
+
     def __init__(self, actions: Optional[list[PlayerAction]] = None) -> None:
         if actions is None:
             self._actions = []
@@ -61,7 +74,7 @@ class PuppetAgent(PlayerAgent):
     def inject_actions(self, actions: list[PlayerAction]) -> None:
         self._actions += actions
 
-    def choose_action(self, history: list[GameState], pid: PID) -> PlayerAction:
+    def choose_action(self, history: HistoryView, pid: PID) -> PlayerAction:
         assert self._actions
         return self._actions.pop(0)
 
@@ -73,15 +86,20 @@ class PuppetAgent(PlayerAgent):
 
 
 class HardCodedRandomAgent(PlayerAgent):
+    NEEDS_HISTORY = False
     _NUM_PICKED_CARDS = 3
 
-    def choose_action(self, history: list[GameState], pid: PID) -> PlayerAction:
+    def __init__(self, seed: Optional[int] = None) -> None:
+        # without a seed, the agent is seeded from the global random
+        self._random = random.Random(random.getrandbits(64) if seed is None else seed)
+
+    def choose_action(self, history: HistoryView, pid: PID) -> PlayerAction:
         game_state = history[-1]
         curr_phase = game_state.get_phase()
 
         if isinstance(curr_phase, CardSelectPhase):
             _, selected_cards = game_state.get_player(
-                pid).get_hand_cards().pick_random_cards(self._NUM_PICKED_CARDS)
+                pid).get_hand_cards().pick_random_cards(self._NUM_PICKED_CARDS, self._random)
             return CardSelectAction(selected_cards=selected_cards)
 
         elif isinstance(curr_phase, StartingHandSelectPhase):
@@ -91,7 +109,7 @@ class HardCodedRandomAgent(PlayerAgent):
             raise Exception("No Action Defined")
 
         elif isinstance(curr_phase, ActionPhase):
-            selection = random.random()
+            selection = self._random.random()
             me = game_state.get_player(pid)
             available_dices = me.get_dices()
             active_character = me.get_active_character()
@@ -107,7 +125,7 @@ class HardCodedRandomAgent(PlayerAgent):
                 if active_id in alive_ids:
                     alive_ids.remove(active_id)
                 if alive_ids:
-                    return DeathSwapAction(char_id=random.choice(alive_ids))
+                    return DeathSwapAction(char_id=self._random.choice(alive_ids))
                 else:
                     raise Exception("Game should end here but not implemented(NOT REACHED)")
 
@@ -158,7 +176,7 @@ class HardCodedRandomAgent(PlayerAgent):
                     alive_ids.remove(active_id)
                 if dices is not None and alive_ids:
                     return SwapAction(
-                        char_id=random.choice(alive_ids),
+                        char_id=self._random.choice(alive_ids),
                         instruction=DiceOnlyInstruction(dices=dices),
                     )
 
@@ -221,7 +239,7 @@ class HardCodedRandomAgent(PlayerAgent):
                     alive_ids.remove(active_id)
                 if dices is not None and alive_ids:
                     return SwapAction(
-                        char_id=random.choice(alive_ids),
+                        char_id=self._random.choice(alive_ids),
                         instruction=DiceOnlyInstruction(dices=dices),
                     )
 
@@ -240,7 +258,7 @@ class HardCodedRandomAgent(PlayerAgent):
                 if active_id in alive_ids:
                     alive_ids.remove(active_id)
                 if alive_ids:
-                    return DeathSwapAction(char_id=random.choice(alive_ids))
+                    return DeathSwapAction(char_id=self._random.choice(alive_ids))
                 else:
                     raise Exception("Game should end here but not implemented(NOT REACHED)")
 
@@ -251,23 +269,28 @@ class HardCodedRandomAgent(PlayerAgent):
 
 
 class RandomAgent(PlayerAgent):
+    NEEDS_HISTORY = False
     _NUM_PICKED_CARDS = 3
 
-    def _card_select_phase(self, history: list[GameState], pid: PID) -> PlayerAction:
+    def __init__(self, seed: Optional[int] = None) -> None:
+        # without a seed, the agent is seeded from the global random
+        self._random = random.Random(random.getrandbits(64) if seed is None else seed)
+
+    def _card_select_phase(self, history: HistoryView, pid: PID) -> PlayerAction:
         game_state = history[-1]
         _, selected_cards = game_state.get_player(
             pid
-        ).get_hand_cards().pick_random_cards(self._NUM_PICKED_CARDS)
+        ).get_hand_cards().pick_random_cards(self._NUM_PICKED_CARDS, self._random)
         return CardSelectAction(selected_cards=selected_cards)
 
     def _starting_hand_select_phase(
             self,
-            history: list[GameState],
+            history: HistoryView,
             pid: PID
     ) -> PlayerAction:
-        return CharacterSelectAction(char_id=random.randint(1, 3))
+        return CharacterSelectAction(char_id=self._random.randint(1, 3))
 
-    def _roll_phase(self, history: list[GameState], pid: PID) -> PlayerAction:
+    def _roll_phase(self, history: HistoryView, pid: PID) -> PlayerAction:
         raise Exception("No Action Defined")
 
     def _random_action_generator_chooser(self, action_generator: ActionGenerator) -> PlayerAction:
@@ -275,7 +298,7 @@ class RandomAgent(PlayerAgent):
             choices = action_generator.choices()
             choice: DecidedChoiceType  # type: ignore
             if isinstance(choices, tuple):
-                choice = random.choice(choices)
+                choice = self._random.choice(choices)
                 action_generator = action_generator.choose(choice)
             elif isinstance(choices, AbstractDices):
                 optional_choice = action_generator.dices_available().basically_satisfy(choices)
@@ -289,7 +312,7 @@ class RandomAgent(PlayerAgent):
                 raise NotImplementedError
         return action_generator.generate_action()
 
-    def _action_phase(self, history: list[GameState], pid: PID) -> PlayerAction:
+    def _action_phase(self, history: HistoryView, pid: PID) -> PlayerAction:
         game_state = history[-1]
         me = game_state.get_player(pid)
         active_character = me.just_get_active_character()
@@ -302,7 +325,7 @@ class RandomAgent(PlayerAgent):
             return player_action
 
         # elemental tuning
-        decision = random.random()
+        decision = self._random.random()
         if decision < 0.3:
             elem_tuning_generator = game_state.elem_tuning_checker().action_generator(pid)
             if elem_tuning_generator is not None:
@@ -310,7 +333,7 @@ class RandomAgent(PlayerAgent):
                 return player_action
 
         # cast skill
-        decision = random.random()
+        decision = self._random.random()
         if decision < 0.5:
             skill_action_generator = game_state.skill_checker().action_generator(pid)
             if skill_action_generator is not None:
@@ -318,16 +341,16 @@ class RandomAgent(PlayerAgent):
                 return player_action
 
         # play card
-        decision = random.random()
+        decision = self._random.random()
         if decision < 0.5:
             cards = game_state.get_player(pid).get_hand_cards()
-            cards_list = list(cards)
-            random.shuffle(cards_list)
+            cards_list = sorted(cards, key=lambda card: card.name())
+            self._random.shuffle(cards_list)
             action_generator = next(
                 (
                     act_generator
                     for act_generator in (
-                        card.action_generator(game_state, pid) for card in cards
+                        card.action_generator(game_state, pid) for card in cards_list
                     )
                     if act_generator is not None
                 ),
@@ -338,7 +361,7 @@ class RandomAgent(PlayerAgent):
                 return player_action
 
         # swap
-        decision = random.random()
+        decision = self._random.random()
         if decision < 0.5:
             swap_action_generator = game_state.swap_checker().action_generator(pid)
             if swap_action_generator is not None:
@@ -347,7 +370,7 @@ class RandomAgent(PlayerAgent):
 
         return EndRoundAction()
 
-    def _end_phase(self, history: list[GameState], pid: PID) -> PlayerAction:
+    def _end_phase(self, history: HistoryView, pid: PID) -> PlayerAction:
         game_state = history[-1]
 
         # death swap
@@ -359,7 +382,7 @@ class RandomAgent(PlayerAgent):
 
         raise Exception("NOT REACHED")
 
-    def choose_action(self, history: list[GameState], pid: PID) -> PlayerAction:
+    def choose_action(self, history: HistoryView, pid: PID) -> PlayerAction:
         game_state = history[-1]
         curr_phase = game_state.get_phase()
 
@@ -384,6 +407,7 @@ class CustomChoiceAgent(RandomAgent):
             choose_handler: Callable[[Iterable[DecidedChoiceType]], DecidedChoiceType],
             any_handler: Callable[[Iterable[Any]], Any],
     ) -> None:
+        super().__init__()
         self._prompt_handler = prompt_handler
         self._choose_handler = choose_handler
         self._any_handler = any_handler
@@ -407,7 +431,7 @@ class CustomChoiceAgent(RandomAgent):
                 raise NotImplementedError
         return action_generator.generate_action()
 
-    def _action_phase(self, history: list[GameState], pid: PID) -> PlayerAction:
+    def _action_phase(self, history: HistoryView, pid: PID) -> PlayerAction:
         game_state = history[-1]
         me = game_state.get_player(pid)
         active_character = me.just_get_active_character()
@@ -476,7 +500,7 @@ class CustomChoiceAgent(RandomAgent):
 
         return player_action
 
-    def _end_phase(self, history: list[GameState], pid: PID) -> PlayerAction:
+    def _end_phase(self, history: HistoryView, pid: PID) -> PlayerAction:
         game_state = history[-1]
 
         self._prompt_handler("info", f"Player{pid.value}'s Action Time!")
@@ -490,3 +514,213 @@ class CustomChoiceAgent(RandomAgent):
             return player_action
 
         raise Exception("NOT REACHED")
+
+
+class _MCTSNode:
+    """ the statistics of the legal actions of a game state in the search """
+    __slots__ = ("pid", "actions", "visits", "values", "total_visits")
+
+    def __init__(self, pid: PID, actions: tuple[PlayerAction, ...]) -> None:
+        self.pid = pid
+        self.actions = actions
+        self.visits = [0] * len(actions)
+        self.values = [0.0] * len(actions)
+        self.total_visits = 0
+
+
+class _MCTSSearch:
+    """
+    UCT search whose nodes are kept in a bounded transposition table keyed on the
+    game states they stand for, so transpositions and the subtrees of past moves
+    are shared
+    """
+    _PATIENCE = 5
+
+    def __init__(
+            self,
+            exploration: float,
+            rollout_depth: Optional[int],
+            table_size: int,
+            seed: int,
+    ) -> None:
+        self._exploration = exploration
+        self._rollout_depth = rollout_depth
+        self._table_size = table_size
+        # least recently used first, so stale subtrees of past moves are evicted first
+        self._table: OrderedDict[GameState, _MCTSNode] = OrderedDict()
+        self._random = random.Random(seed)
+        self._rollout_agent = RandomAgent(seed=seed)
+
+    def search(
+            self,
+            game_state: GameState,
+            iterations: Optional[int],
+            time_limit: Optional[float],
+    ) -> dict[PlayerAction, int]:
+        """ returns the number of visits of each legal action of game_state """
+        deadline = None if time_limit is None else time.perf_counter() + time_limit
+        i = 0
+        while (iterations is None or i < iterations) \
+                and (deadline is None or time.perf_counter() < deadline):
+            self._iterate(game_state)
+            i += 1
+        node = self._table.get(game_state)
+        if node is None:
+            return {}
+        return dict(zip(node.actions, node.visits))
+
+    def _node_of(self, game_state: GameState) -> _MCTSNode:
+        pid = game_state.waiting_for()
+        assert pid is not None
+        if len(self._table) >= self._table_size:
+            self._table.popitem(last=False)
+        node = _MCTSNode(pid, game_state.legal_actions(pid))
+        self._table[game_state] = node
+        return node
+
+    def _select(self, node: _MCTSNode) -> int:
+        log_total = math.log(node.total_visits + 1)
+        best_idx = -1
+        best_score = -math.inf
+        for i, visits in enumerate(node.visits):
+            if visits == 0:
+                score = math.inf
+            else:
+                score = node.values[i] / visits \
+                    + self._exploration * math.sqrt(log_total / visits)
+            # ties are broken at random so unvisited actions are tried in random order
+            if score > best_score or (score == best_score and self._random.random() < 0.5):
+                best_idx, best_score = i, score
+        return best_idx
+
+    def _iterate(self, game_state: GameState) -> None:
+        path: list[tuple[_MCTSNode, int]] = []
+        winner: Optional[PID] = None
+        while True:
+            if game_state.game_end():
+                winner = game_state.get_winner()
+                break
+            node = self._table.get(game_state)
+            if node is None:
+                node = self._node_of(game_state)
+                if path:
+                    winner = self._rollout(game_state)
+                    break
+            else:
+                self._table.move_to_end(game_state)
+            idx = self._select(node)
+            path.append((node, idx))
+            next_state = game_state.action_step(node.pid, node.actions[idx])
+            assert next_state is not None
+            game_state = next_state.auto_step()
+        for node, idx in path:
+            node.total_visits += 1
+            node.visits[idx] += 1
+            if winner is None:
+                node.values[idx] += 0.5
+            elif winner is node.pid:
+                node.values[idx] += 1
+
+    def _rollout(self, game_state: GameState) -> Optional[PID]:
+        """ plays random actions from game_state, None means a draw or a cut-off """
+        num_actions = 0
+        while not game_state.game_end():
+            if self._rollout_depth is not None and num_actions >= self._rollout_depth:
+                return None
+            pid = game_state.waiting_for()
+            assert pid is not None
+            next_state: Optional[GameState] = None
+            patience = self._PATIENCE
+            while next_state is None and patience > 0:
+                next_state = game_state.action_step(
+                    pid,
+                    self._rollout_agent.choose_action(HistoryView.of_state(game_state), pid),
+                )
+                patience -= 1
+            if next_state is None:
+                return None
+            game_state = next_state.auto_step()
+            num_actions += 1
+        return game_state.get_winner()
+
+
+def _mcts_root_search(
+        args: tuple[GameState, float, Optional[int], int, int, Optional[int], Optional[float]],
+) -> dict[PlayerAction, int]:
+    game_state, exploration, rollout_depth, table_size, seed, iterations, time_limit = args
+    return _MCTSSearch(exploration, rollout_depth, table_size, seed).search(
+        game_state, iterations, time_limit
+    )
+
+
+class MCTSAgent(PlayerAgent):
+    """
+    Monte Carlo tree search (UCT) agent with random rollouts by RandomAgent.
+
+    - each move runs `iterations` iterations and / or for `time_limit` seconds
+    - the search tree lives in a transposition table of at most `table_size`
+      game states, which is kept between moves and evicts the least recently
+      visited game states first
+    - `rollout_depth` cuts rollouts off after that many actions, counted as draws
+    - `num_workers` > 1 enables root parallelization: each worker process searches
+      with the full budget and a table of its own, and the action visited the most
+      in total is played; call `close()` to stop the workers
+
+    Note that the search sees the whole game state, including the opponent's
+    hand and deck.
+    """
+    NEEDS_HISTORY = False
+
+    def __init__(
+            self,
+            iterations: Optional[int] = 100,
+            time_limit: Optional[float] = None,
+            exploration: float = math.sqrt(2),
+            rollout_depth: Optional[int] = None,
+            table_size: int = 1 << 16,
+            num_workers: int = 1,
+            seed: Optional[int] = None,
+    ) -> None:
+        if iterations is None and time_limit is None:
+            raise Exception("MCTSAgent needs an iteration or time budget")
+        self._iterations = iterations
+        self._time_limit = time_limit
+        self._exploration = exploration
+        self._rollout_depth = rollout_depth
+        self._table_size = table_size
+        self._num_workers = num_workers
+        self._random = random.Random(random.getrandbits(64) if seed is None else seed)
+        self._search = _MCTSSearch(
+            exploration, rollout_depth, table_size, self._random.getrandbits(64)
+        )
+        self._pool: Optional[mp.pool.Pool] = None
+
+    def choose_action(self, history: HistoryView, pid: PID) -> PlayerAction:
+        game_state = history[-1]
+        actions = game_state.legal_actions(pid)
+        if not actions:
+            raise Exception(f"No legal action for {pid} at game state:\n{game_state}")
+        if len(actions) == 1:
+            return actions[0]
+        if self._num_workers <= 1:
+            visits = self._search.search(game_state, self._iterations, self._time_limit)
+        else:
+            if self._pool is None:
+                self._pool = mp.Pool(self._num_workers)
+            visits = {}
+            for worker_visits in self._pool.map(_mcts_root_search, [
+                (
+                    game_state, self._exploration, self._rollout_depth, self._table_size,
+                    self._random.getrandbits(64), self._iterations, self._time_limit,
+                )
+                for _ in range(self._num_workers)
+            ]):
+                for action, num in worker_visits.items():
+                    visits[action] = visits.get(action, 0) + num
+        return max(actions, key=lambda action: visits.get(action, 0))
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
@@ -79,9 +79,7 @@ class Card:
 
     @classmethod
     def _loosely_usable(cls, game_state: gs.GameState, pid: PID) -> bool:
-        """Checks if the player with give PID can loosley use a card."""
-        active_PID = game_state.get_active_player_id() # Get the active PID frpm the game state
-        return active_PID == pid # Compares the active PID with the provided one
+        return True
 
     @classmethod
     def loosely_usable(cls, game_state: gs.GameState, pid: PID) -> bool:
@@ -90,17 +88,17 @@ class Card:
 
         Does't check if the player has the card in hand
         """
-        active_PID = game_state.get_active_player_id()
-        effect_stack_empty = game_state.get_effect_stack().is_empty()
-        return active_PID == pid and  effect_stack_empty 
+        return game_state.get_active_player_id() is pid \
+            and game_state.get_effect_stack().is_empty() \
+            and cls._loosely_usable(game_state, pid)
+
     @classmethod
     def usable(cls, game_state: gs.GameState, pid: PID) -> bool:
         """
         checks if card can be used (but neglect if player have enough dices for this)
         """
-        active_PID = game_state.get_active_player_id()
-        hand_cards = game_state.get_player(pid).get_hand_cards()
-        return active_PID == pid and bool(hand_cards)
+        return cls.loosely_usable(game_state, pid) \
+            and game_state.get_player(pid).get_hand_cards().contains(cls)
 
     @classmethod
     def strictly_usable(cls, game_state: gs.GameState, pid: PID) -> bool:
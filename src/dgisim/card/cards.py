@@ -1,65 +1,129 @@
 from __future__ import annotations
 import random
-from collections import Counter
-from typing import Union, Iterator, TYPE_CHECKING
+from bisect import bisect_right
+from itertools import accumulate, zip_longest
+from typing import Optional, Union, Iterable, Iterator, TYPE_CHECKING
 
-from ..helper.hashable_dict import HashableDict
 from ..helper.level_print import level_print
 
 if TYPE_CHECKING:
     from .card import Card
 
 
+# Card ids index the count vectors of Cards. The cards of the default mode, then
+# the cards generated during games, get ids in the order of their names, so their
+# ids (and the iteration order of Cards) are the same in every process; any other
+# card gets the next free id on first use.
+_CARD_IDS: dict[type[Card], int] = {}
+_ID_CARDS: list[type[Card]] = []
+
+
+def _register_cards(cards: Iterable[type[Card]]) -> None:
+    for card in sorted(cards, key=lambda card: card.name()):
+        if card not in _CARD_IDS:
+            _CARD_IDS[card] = len(_ID_CARDS)
+            _ID_CARDS.append(card)
+
+
+def card_id(card: type[Card]) -> int:
+    """ the stable index of card in the count vector of Cards """
+    if not _ID_CARDS:
+        from .cards_set import default_cards, generated_cards
+        _register_cards(default_cards())
+        _register_cards(generated_cards())
+    if card not in _CARD_IDS:
+        _register_cards((card,))
+    return _CARD_IDS[card]
+
+
+def _trimmed(counts: Iterable[int]) -> tuple[int, ...]:
+    """ counts without trailing zeros, so equal Cards have equal count vectors """
+    counts = list(counts)
+    while counts and counts[-1] == 0:
+        counts.pop()
+    return tuple(counts)
+
+
 class Cards:
+    """
+    A multiset of cards, stored as a vector of counts indexed by card_id()
+    """
+    __slots__ = ("_counts", "_num", "_cum_counts")
+
     def __init__(self, mapping: dict[type[Card], int]) -> None:
-        self._cards = HashableDict(mapping)
+        counts: list[int] = []
+        for card, num in mapping.items():
+            i = card_id(card)
+            if i >= len(counts):
+                counts.extend([0] * (i + 1 - len(counts)))
+            counts[i] += num
+        self._counts = _trimmed(counts)
+        self._num: Optional[int] = None
+        self._cum_counts: Optional[list[int]] = None
+
+    @classmethod
+    def _from_counts(cls, counts: tuple[int, ...]) -> Cards:
+        cards = cls.__new__(cls)
+        cards._counts = counts
+        cards._num = None
+        cards._cum_counts = None
+        return cards
 
     @classmethod
     def from_empty(cls) -> Cards:
-        return Cards({})
+        return Cards._from_counts(())
 
     def __add__(self, other: Cards | dict[type[Card], int]) -> Cards:
-        other_cards: dict[type[Card], int]
-        if isinstance(other, Cards):
-            other_cards = other._cards
-        else:
-            other_cards = other
-        return Cards(self._cards + other_cards)
+        if not isinstance(other, Cards):
+            other = Cards(other)
+        return Cards._from_counts(_trimmed(
+            a + b for a, b in zip_longest(self._counts, other._counts, fillvalue=0)
+        ))
 
     def __sub__(self, other: Cards | dict[type[Card], int]) -> Cards:
-        other_cards: dict[type[Card], int]
-        if isinstance(other, Cards):
-            other_cards = other._cards
-        else:
-            other_cards = other
-        return Cards(self._cards - other_cards)
-
-    def pick_random_cards(self, num: int) -> tuple[Cards, Cards]:
+        if not isinstance(other, Cards):
+            other = Cards(other)
+        return Cards._from_counts(_trimmed(
+            a - b for a, b in zip_longest(self._counts, other._counts, fillvalue=0)
+        ))
+
+    def pick_random_cards(
+            self,
+            num: int,
+            rng: Optional[random.Random] = None,
+    ) -> tuple[Cards, Cards]:
         """
         Returns the left cards and selected cards
+
+        Draws from `rng` if provided, otherwise from the global `random`
         """
         num = min(self.num_cards(), num)
         if num == 0:
             return (self, Cards.from_empty())
-        picked_cards: dict[type[Card], int] = dict(Counter(
-            random.sample(list(self._cards.keys()), counts=self._cards.values(), k=num)
-        ))
-        return Cards(self._cards - picked_cards), Cards(picked_cards)
+        sample = random.sample if rng is None else rng.sample
+        # same draws as sample(cards, counts=counts, k=num) with cards ordered by ids
+        if self._cum_counts is None:
+            self._cum_counts = list(accumulate(self._counts))
+        cum_counts = self._cum_counts
+        picked = [0] * len(self._counts)
+        for selection in sample(range(cum_counts[-1]), k=num):
+            picked[bisect_right(cum_counts, selection)] += 1
+        picked_cards = Cards._from_counts(_trimmed(picked))
+        return self - picked_cards, picked_cards
 
     def num_cards(self) -> int:
-        return sum(self._cards.values())
+        if self._num is None:
+            self._num = sum(self._counts)
+        return self._num
 
     def empty(self) -> bool:
-        return all(value == 0 for value in self._cards.values())
+        return self.num_cards() == 0
 
     def not_empty(self) -> bool:
-        return any(value > 0 for value in self._cards.values())
+        return self.num_cards() > 0
 
     def contains(self, card: type[Card]) -> bool:
-        for c in self._cards:
-            if c == card and self._cards[c] >= 1:
-                return True
-        return False
+        return self[card] >= 1
 
     def __contains__(self, card: type[Card]) -> bool:
         return self.contains(card)
@@ -68,49 +132,61 @@ class Cards:
         return self + {card: 1}
 
     def remove(self, card: type[Card]) -> Cards:
-        assert card in self._cards
-        assert self._cards[card] >= 1
+        assert self[card] >= 1
         return self - {card: 1}
 
     def remove_all(self, card: type[Card]) -> Cards:
-        assert card in self._cards
-        assert self._cards[card] >= 1
-        return self - {card: self._cards[card]}
+        assert self[card] >= 1
+        return self - {card: self[card]}
 
     def __getitem__(self, card: type[Card]) -> int:
-        assert card in self._cards
-        return self._cards[card]
+        i = card_id(card)
+        if i < len(self._counts):
+            return self._counts[i]
+        return 0
+
+    def to_dict(self) -> dict[type[Card], int]:
+        """ the non-zero counts of cards """
+        return dict(
+            (_ID_CARDS[i], num)
+            for i, num in enumerate(self._counts)
+            if num != 0
+        )
 
     def __eq__(self, other: object) -> bool:
+        if self is other:
+            return True
         if not isinstance(other, Cards):
             return False
-        return self._cards == other._cards
+        return self._counts == other._counts
 
     def __hash__(self) -> int:
-        return hash(self._cards)
+        return hash(self._counts)
+
+    def __reduce__(self):
+        # ids of cards outside the default and generated cards may differ between processes
+        return (Cards, (self.to_dict(),))
 
     def __str__(self) -> str:
         return self.to_string(0)
 
     def __iter__(self) -> Iterator[type[Card]]:
-        return (  # type: ignore
-            card
-            for card in self._cards.keys()
-            if self[card] > 0
+        return (
+            _ID_CARDS[i]
+            for i, num in enumerate(self._counts)
+            if num > 0
         )
 
     def to_string(self, indent: int = 0) -> str:
         existing_cards = dict([
             (card.name(), str(num))
-            for card, num in self._cards.items()
-            if num != 0
+            for card, num in self.to_dict().items()
         ])
         return level_print(existing_cards, indent)
 
     def dict_str(self) -> Union[dict, str]:
         existing_cards = dict([
             (card.name(), str(num))
-            for card, num in self._cards.items()
-            if num != 0
+            for card, num in self.to_dict().items()
         ])
         return existing_cards
@@ -36,6 +36,11 @@ _DEFAULT_CARDS: list[type[Card]] = [
     Xudong,
 ]
 
+# Cards not in decks that characters create during a game
+_GENERATED_CARDS: frozenset[type[Card]] = frozenset({
+    LightningStiletto,
+})
+
 _DEFAULT_CARDS_FSET = None
 
 
@@ -44,3 +49,7 @@ def default_cards() -> frozenset[type[Card]]:
     if _DEFAULT_CARDS_FSET is None:
         _DEFAULT_CARDS_FSET = frozenset(_DEFAULT_CARDS)
     return _DEFAULT_CARDS_FSET
+
+
+def generated_cards() -> frozenset[type[Card]]:
+    return _GENERATED_CARDS
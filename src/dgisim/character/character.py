@@ -7,6 +7,7 @@ from ..card import card as cd
 from ..effect import effect as eft
 from ..status import status as stt
 from ..status import statuses as stts
+from ..state import zobrist as zb
 from ..summon import summon as sm
 
 from ..dices import AbstractDices
@@ -14,6 +15,7 @@ from ..effect.effects_template import *
 from ..effect.enums import ZONE, DYNAMIC_CHARACTER_TARGET
 from ..effect.structs import StaticTarget, DamageType
 from ..element.element import *
+from ..helper.hash_cache import HashCache
 from ..helper.level_print import INDENT, level_print
 from ..state.enums import PID
 
@@ -22,7 +24,14 @@ from .character_skill_enum import CharacterSkill
 if TYPE_CHECKING:
     from ..state.game_state import GameState
 
-class Character:
+class Character(HashCache):
+    """ subclasses should declare `__slots__ = ()` """
+    __slots__ = (
+        "_id", "_hp", "_max_hp", "_energy", "_max_energy",
+        "_talents", "_equipments", "_statuses", "_aura",
+        "_hash", "_zobrist",
+    )
+
     _ELEMENT = Element.ANY
 
     def __init__(
@@ -46,6 +55,8 @@ class Character:
         self._equipments = equipments
         self._statuses = statuses
         self._aura = elemental_aura
+        self._hash: Optional[int] = None
+        self._zobrist: Optional[int] = None
 
     @staticmethod
     def _talent_status() -> Optional[type[stt.EquipmentStatus]]:
@@ -78,6 +89,12 @@ class Character:
     def get_elemental_aura(self) -> ElementalAura:
         return self._aura
 
+    def zobrist_key(self) -> int:
+        """ 64-bit Zobrist key, maintained incrementally once computed (see state/zobrist.py) """
+        if self._zobrist is None:
+            self._zobrist = zb.character_key(self)
+        return self._zobrist
+
     def get_all_statuses_ordered(self) -> list[stts.Statuses]:
         return [self._talents, self._equipments, self._statuses]
 
@@ -277,15 +294,23 @@ class Character:
             self._max_hp,
             self._energy,
             self._max_energy,
+            self._talents,
+            self._equipments,
+            self._statuses,
+            self._aura,
         )
 
     def __eq__(self, other: object) -> bool:
+        if self is other:
+            return True
         if not isinstance(other, type(self)):
             return False
         return self._all_unique_data() == other._all_unique_data()
 
     def __hash__(self) -> int:
-        return hash(self._all_unique_data())
+        if self._hash is None:
+            self._hash = hash(self._all_unique_data())
+        return self._hash
 
     def __str__(self) -> str:
         return self.to_string(0)
@@ -320,6 +345,7 @@ class Character:
 
 class CharacterFactory:
     def __init__(self, character: Character, char_type: type[Character]) -> None:
+        self._base = character
         self._char = char_type
         self._id = character.get_id()
         self._hp = character.get_hp()
@@ -365,7 +391,7 @@ class CharacterFactory:
         return self
 
     def build(self) -> Character:
-        return self._char(
+        char = self._char(
             id=self._id,
             hp=self._hp,
             max_hp=self._max_hp,
@@ -376,9 +402,15 @@ class CharacterFactory:
             statuses=self._statuses,
             elemental_aura=self._aura,
         )
+        base_key = self._base._zobrist
+        if base_key is not None:
+            char._zobrist = zb.updated_character_key(self._base, char, base_key)
+        return char
 
 
 class Keqing(Character):
+    __slots__ = ()
+
     # basic info
     _ELEMENT = Element.ELECTRO
 
@@ -522,6 +554,8 @@ class Keqing(Character):
 
 
 class Kaeya(Character):
+    __slots__ = ()
+
     # basic info
     _ELEMENT = Element.CRYO
 
@@ -605,6 +639,8 @@ class Kaeya(Character):
 
 
 class RhodeiaOfLoch(Character):
+    __slots__ = ()
+
     # basic info
     _ELEMENT = Element.HYDRO
 
@@ -664,7 +700,8 @@ class RhodeiaOfLoch(Character):
         )
 
     def _elemental_skill1(self, game_state: GameState) -> tuple[eft.Effect, ...]:
-        from random import choice
+        # callers of skill() move game_state onto the next rng
+        choice = game_state.get_rng().generator().choice
         source = self.location(game_state)
 
         summons_to_choose = self._not_summoned_types(game_state, source.pid)
@@ -681,7 +718,8 @@ class RhodeiaOfLoch(Character):
         )
 
     def _elemental_skill2(self, game_state: GameState) -> tuple[eft.Effect, ...]:
-        from random import choice
+        # callers of skill() move game_state onto the next rng
+        choice = game_state.get_rng().generator().choice
         source = self.location(game_state)
 
         # first choice
@@ -1,16 +1,20 @@
 from __future__ import annotations
 from typing import Callable, Iterator, Optional, TYPE_CHECKING, Union
 
+from ..helper.hash_cache import HashCache
 from ..helper.level_print import level_print, INDENT
 
 if TYPE_CHECKING:
     from .character import Character
 
 
-class Characters:
+class Characters(HashCache):
+    __slots__ = ("_characters", "_active_character_id", "_hash")
+
     def __init__(self, characters: tuple[Character, ...], active_character_id: Optional[int]):
         self._characters = characters
         self._active_character_id = active_character_id
+        self._hash: Optional[int] = None
 
     @classmethod
     def from_default(cls, characters: tuple[Character, ...]) -> Characters:
@@ -109,12 +113,16 @@ class Characters:
         return (self._characters, self._active_character_id)
 
     def __eq__(self, other: object) -> bool:
+        if self is other:
+            return True
         if not isinstance(other, Characters):
             return False
         return self._all_unique_data() == other._all_unique_data()
 
     def __hash__(self) -> int:
-        return hash(self._all_unique_data())
+        if self._hash is None:
+            self._hash = hash(self._all_unique_data())
+        return self._hash
 
     def __str__(self) -> str:
         return self.to_string(0)
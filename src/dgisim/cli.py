@@ -3,7 +3,7 @@ from enum import Enum
 from typing import Iterable, Any
 
 from .agents import *
-from .game_state_machine import GameStateMachine
+from .game_state_machine import GameStateMachine, HistoryPolicy
 from .helper.level_print import GamePrinter
 from .state.game_state import GameState
 
@@ -26,18 +26,21 @@ class CLISession:
                 GameState.from_default(),
                 RandomAgent(),
                 RandomAgent(),
+                history_policy=HistoryPolicy.KEYFRAMES,
             )
         elif self._mode is GameMode.PVE:
             self._game_session = GameStateMachine(
                 GameState.from_default(),
                 CustomChoiceAgent(self.prompt_handler, self.game_action_chooser, self.chooser),
                 RandomAgent(),
+                history_policy=HistoryPolicy.KEYFRAMES,
             )
         elif self._mode is GameMode.PVP:
             self._game_session = GameStateMachine(
                 GameState.from_default(),
                 CustomChoiceAgent(self.prompt_handler, self.game_action_chooser, self.chooser),
                 CustomChoiceAgent(self.prompt_handler, self.game_action_chooser, self.chooser),
+                history_policy=HistoryPolicy.KEYFRAMES,
             )
         self._state_idx = 0
 
@@ -0,0 +1,88 @@
+"""
+Sampling of determinizations: full GameStates consistent with what one player
+can observe, for information set search.
+
+Requires numpy (`pip install dgisim[numpy]`).
+"""
+from __future__ import annotations
+
+from typing import Optional, TYPE_CHECKING
+
+import numpy as np
+
+from .card.cards import Cards
+from .helper.rng import RNG
+from .state.enums import PID
+
+if TYPE_CHECKING:
+    from .card.card import Card
+    from .state.game_state import GameState
+
+__all__ = [
+    "Determinizer",
+]
+
+
+class Determinizer:
+    """
+    Samples determinizations of a game state from the perspective of a player.
+
+    What the player cannot see is the split of the opponent's unseen cards (their
+    deck list minus the cards they have used publicly, i.e. their hand and deck
+    together) between the hand and the deck, and the future random draws. Each
+    determinization deals the opponent a uniformly random hand of the right size
+    from the unseen cards, puts the rest in the deck, and reseeds the RNG of the
+    game state; everything else, including the player states' public sub-objects,
+    is shared with the original game state.
+
+    Splits are drawn for a whole batch at once, and cached per information set
+    (the unseen cards and the hand size), so the many game states of one
+    information set reuse the same samples.
+    """
+
+    def __init__(self, seed: Optional[int] = None, cache_size: int = 256) -> None:
+        self._np_random = np.random.default_rng(seed)
+        self._cache_size = cache_size
+        # (unseen cards, hand size) -> sampled (hand, deck) splits
+        self._splits: dict[tuple[Cards, int], list[tuple[Cards, Cards]]] = {}
+
+    def _splits_of(self, unseen: Cards, hand_size: int, num: int) -> list[tuple[Cards, Cards]]:
+        key = (unseen, hand_size)
+        splits = self._splits.get(key)
+        if splits is None:
+            if len(self._splits) >= self._cache_size:
+                del self._splits[next(iter(self._splits))]
+            splits = []
+            self._splits[key] = splits
+        if len(splits) < num:
+            cards: list[type[Card]] = list(unseen)
+            counts = np.fromiter(
+                (unseen[card] for card in cards), dtype=np.int64, count=len(cards)
+            )
+            hands = self._np_random.multivariate_hypergeometric(
+                counts, hand_size, size=num - len(splits)
+            )
+            for hand_counts in hands.tolist():
+                hand = Cards(dict(
+                    (card, num_card)
+                    for card, num_card in zip(cards, hand_counts)
+                    if num_card > 0
+                ))
+                splits.append((hand, unseen - hand))
+        return splits[:num]
+
+    def sample(self, game_state: GameState, pid: PID, num: int) -> tuple[GameState, ...]:
+        """ num determinizations of game_state from the perspective of pid """
+        opponent_pid = pid.other()
+        opponent = game_state.get_player(opponent_pid)
+        hand_cards = opponent.get_hand_cards()
+        unseen = hand_cards + opponent.get_deck_cards()
+        splits = self._splits_of(unseen, hand_cards.num_cards(), num)
+        seeds = self._np_random.integers(0, 1 << 63, size=num).tolist()
+        return tuple(
+            game_state.factory().player(
+                opponent_pid,
+                opponent.factory().hand_cards(hand).deck_cards(deck).build(),
+            ).rng(RNG(seed)).build()
+            for (hand, deck), seed in zip(splits, seeds)
+        )
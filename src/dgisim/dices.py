@@ -1,10 +1,11 @@
 from __future__ import annotations
+import operator
 import random
 from enum import Enum
+from functools import lru_cache
 from typing import Optional, Iterator, Iterable, TypeVar, Union
 from typing_extensions import Self, override, TYPE_CHECKING
 
-from .helper.hashable_dict import HashableDict
 from .helper.level_print import level_print
 from .helper.quality_of_life import BIG_INT
 from .element.element import Element
@@ -13,72 +14,112 @@ if TYPE_CHECKING:
     from .state.game_state import GameState
 
 
+_ELEMS: tuple[Element, ...] = tuple(Element)
+assert all(elem.value == i for i, elem in enumerate(_ELEMS))
+_NUM_ELEMS = len(_ELEMS)
+
+
 class Dices:
+    """
+    A pool of dices, stored as a tuple of counts indexed by `Element.value`
+    """
+    __slots__ = ("_counts", "_num")
+
     _LEGAL_ELEMS = frozenset(elem for elem in Element)
+    _ILLEGAL_IDXS: tuple[int, ...] = ()
 
     def __init__(self, dices: dict[Element, int]) -> None:
-        self._dices = HashableDict(dices)
+        counts = [0] * _NUM_ELEMS
+        for elem, num in dices.items():
+            counts[elem.value] += num
+        self._counts = tuple(counts)
+        self._num: Optional[int] = None
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+        cls._ILLEGAL_IDXS = tuple(
+            elem.value
+            for elem in _ELEMS
+            if elem not in cls._LEGAL_ELEMS
+        )
+
+    @classmethod
+    def _from_counts(cls, counts: tuple[int, ...]) -> Self:
+        dices = cls.__new__(cls)
+        dices._counts = counts
+        dices._num = None
+        return dices
 
     def __add__(self, other: Dices | dict[Element, int]) -> Self:
-        dices: dict[Element, int]
-        if isinstance(other, Dices):
-            dices = other._dices
-        else:
-            dices = other
-        return type(self)(self._dices + dices)
+        if not isinstance(other, Dices):
+            other = Dices(other)
+        return self._from_counts(tuple(map(operator.add, self._counts, other._counts)))
 
     def __sub__(self, other: Dices | dict[Element, int]) -> Self:
-        dices: dict[Element, int]
-        if isinstance(other, Dices):
-            dices = other._dices
-        else:
-            dices = other
-        return type(self)(self._dices - dices)
+        if not isinstance(other, Dices):
+            other = Dices(other)
+        return self._from_counts(tuple(map(operator.sub, self._counts, other._counts)))
 
     def num_dices(self) -> int:
-        return sum(self._dices.values())
+        if self._num is None:
+            self._num = sum(self._counts)
+        return self._num
 
     def is_legal(self) -> bool:
-        return all(map(lambda x: x >= 0, self._dices.values())) \
-            and all(elem in self._LEGAL_ELEMS for elem in self._dices)
+        counts = self._counts
+        return min(counts) >= 0 \
+            and not any(counts[i] for i in self._ILLEGAL_IDXS)
 
     def validify(self) -> Self:
         if self.is_legal():
             return self
-        return type(self)(dict(
-            (elem, max(0, n))
-            for elem, n in self._dices.items()
-            if elem in self._LEGAL_ELEMS
+        illegal_idxs = self._ILLEGAL_IDXS
+        return self._from_counts(tuple(
+            0 if i in illegal_idxs else max(0, n)
+            for i, n in enumerate(self._counts)
         ))
 
     def elems(self) -> Iterable[Element]:
-        return self._dices.keys()
+        """ the elements with non-zero counts """
+        return tuple(
+            _ELEMS[i]
+            for i, n in enumerate(self._counts)
+            if n != 0
+        )
+
+    def to_dict(self) -> dict[Element, int]:
+        """ the non-zero counts of elements """
+        return dict(
+            (_ELEMS[i], n)
+            for i, n in enumerate(self._counts)
+            if n != 0
+        )
 
     def __contains__(self, elem: Element) -> bool:
         return (
             elem in self._LEGAL_ELEMS
-            and self[elem] > 0
+            and self._counts[elem.value] > 0
         )
 
     def __iter__(self) -> Iterator[Element]:
         return (
-            elem
-            for elem in self._dices
-            if self[elem] > 0
+            _ELEMS[i]
+            for i, n in enumerate(self._counts)
+            if n > 0
         )
 
     def __getitem__(self, index: Element) -> int:
-        if index in self._dices:
-            return self._dices[index]
-        return 0
+        return self._counts[index.value]
 
     def __eq__(self, other: object) -> bool:
+        if self is other:
+            return True
         if not isinstance(other, Dices):
             return False
-        return self._dices == other._dices
+        return self._counts == other._counts
 
     def __hash__(self) -> int:
-        return hash(self._dices)
+        return hash(self._counts)
 
     def __str__(self) -> str:
         return self.to_string(0)
@@ -86,16 +127,14 @@ class Dices:
     def to_string(self, indent: int = 0) -> str:
         existing_dices = dict([
             (dice.name, str(num))
-            for dice, num in self._dices.items()
-            if num != 0
+            for dice, num in self.to_dict().items()
         ])
         return level_print(existing_dices, indent)
 
     def dict_str(self) -> Union[dict, str]:
         existing_dices = dict([
             (dice.name, str(num))
-            for dice, num in self._dices.items()
-            if num != 0
+            for dice, num in self.to_dict().items()
         ])
         return existing_dices
 
@@ -109,12 +148,17 @@ _PURE_ELEMS = frozenset({
     Element.CRYO,
     Element.GEO,
 })
+_PURE_IDXS: tuple[int, ...] = tuple(sorted(elem.value for elem in _PURE_ELEMS))
+_OMNI_IDX = Element.OMNI.value
+_ANY_IDX = Element.ANY.value
 
 
 class ActualDices(Dices):
     """
     Used for the actual dices a player can have.
     """
+    __slots__ = ()
+
     _LEGAL_ELEMS = frozenset({
         Element.OMNI,
         Element.PYRO,
@@ -129,30 +173,7 @@ class ActualDices(Dices):
 
     def _satisfy(self, requirement: AbstractDices) -> bool:
         assert self.is_legal() and requirement.is_legal()
-
-        # satisfy all pure elements first
-        pure_deducted = HashableDict((
-            (elem, self[elem] - requirement[elem])
-            for elem in _PURE_ELEMS
-        ), frozen=False)
-        omni_needed = sum(
-            -num
-            for num in pure_deducted.values()
-            if num < 0
-        )
-
-        # if OMNI given cannot cover pure misses, fail
-        if self[Element.OMNI] < omni_needed:
-            return False
-
-        # test OMNI requirement
-        omni_remained = self[Element.OMNI] - omni_needed
-        most_pure = max(pure_deducted.values())
-        if omni_remained + most_pure < requirement[Element.OMNI]:
-            return False
-
-        # We have enough dices to satisfy Element.ANY, so success
-        return True
+        return _satisfy(self._counts, requirement._counts)
 
     def loosely_satisfy(self, requirement: AbstractDices) -> bool:
         """
@@ -179,95 +200,45 @@ class ActualDices(Dices):
             requirement: AbstractDices,
             game_state: Optional[GameState] = None,
     ) -> Optional[ActualDices]:
+        """
+        Returns the preferred payment of requirement from self, or None if requirement
+        cannot be paid. Results are cached on the counts of self and requirement.
+        """
         if requirement.num_dices() > self.num_dices():
             return None
         # TODO: optimize for having game_state
-        from collections import defaultdict
-        remaining: dict[Element, int] = self._dices.copy()
-        answer: dict[Element, int] = defaultdict(int)
-        pures: dict[Element, int] = HashableDict(frozen=False)
-        omni = 0
-        any = 0
-        omni_required = 0
-        for elem in requirement:
-            if elem in _PURE_ELEMS:
-                pures[elem] = requirement[elem]
-            elif elem is Element.OMNI:
-                omni = requirement[elem]
-            elif elem is Element.ANY:
-                any = requirement[elem]
-            else:
-                raise Exception("Unknown element")
-        if len(pures) > 0:
-            for elem in pures:
-                if remaining.get(elem, 0) < pures[elem]:
-                    answer[elem] += remaining.get(elem, 0)
-                    omni_required += pures[elem] - remaining.get(elem, 0)
-                    remaining[elem] = 0
-                else:
-                    answer[elem] += pures[elem]
-                    remaining[elem] -= pures[elem]
-        if omni > 0:
-            best_elem: Optional[Element] = None
-            count = BIG_INT
-            for elem in list(_PURE_ELEMS) + [Element.OMNI]:
-                this_count = remaining.get(elem, 0)
-                if this_count >= omni and this_count < count:
-                    best_elem = elem
-                    count = this_count
-            if best_elem is None:
-                return None
-            else:
-                answer[best_elem] += omni
-                remaining[best_elem] -= omni
-        if any > 0:
-            from operator import itemgetter
-            sorted_elems = sorted(remaining.items(), key=itemgetter(1))
-            for elem, num in sorted_elems:
-                if elem in _PURE_ELEMS:
-                    num = min(num, any)
-                    answer[elem] += num
-                    remaining[elem] -= num
-                    any -= num
-                    if any == 0:
-                        break
-            if any > 0:
-                answer[Element.OMNI] += any
-                remaining[Element.OMNI] -= any
-        if omni_required > 0:
-            if remaining[Element.OMNI] < omni_required:
-                return None
-            answer[Element.OMNI] += omni_required
-        return ActualDices(answer)
+        return _basically_satisfy(self._counts, requirement._counts)
+
+    def all_payments(self, requirement: AbstractDices) -> tuple[ActualDices, ...]:
+        """
+        Returns all distinct payments from self that just satisfy requirement, in a
+        fixed order. Results are cached on the counts of self and requirement.
+        """
+        if requirement.num_dices() > self.num_dices():
+            return ()
+        return _all_payments(self._counts, requirement._counts)
 
     @classmethod
     def from_empty(cls) -> ActualDices:
-        return ActualDices(dict([
-            (elem, 0)
-            for elem in ActualDices._LEGAL_ELEMS
-        ]))
+        return ActualDices._from_counts((0,) * _NUM_ELEMS)
 
     @classmethod
-    def from_random(cls, size: int) -> ActualDices:
-        dices = ActualDices.from_empty()
-        dices._dices._unfreeze()
+    def from_random(cls, size: int, rng: Optional[random.Random] = None) -> ActualDices:
+        """ draws from `rng` if provided, otherwise from the global `random` """
+        choice = random.choice if rng is None else rng.choice
+        legal_idxs = sorted(elem.value for elem in ActualDices._LEGAL_ELEMS)
+        counts = [0] * _NUM_ELEMS
         for i in range(size):
-            elem = random.choice(tuple(ActualDices._LEGAL_ELEMS))
-            dices._dices[elem] += 1
-        dices._dices.freeze()
-        return dices
+            counts[choice(legal_idxs)] += 1
+        return ActualDices._from_counts(tuple(counts))
 
     @classmethod
     def from_all(cls, size: int, elem: Element) -> ActualDices:
-        dices = ActualDices.from_empty()
-        dices._dices._unfreeze()
-        dices._dices[Element.OMNI] = size
-        dices._dices.freeze()
-        return dices
+        return ActualDices({Element.OMNI: size})
 
     @classmethod
     def from_dices(cls, dices: Dices) -> Optional[ActualDices]:
-        new_dices = ActualDices(dices._dices)
+        new_dices = ActualDices._from_counts(dices._counts)
         if not new_dices.is_legal():
             return None
         else:
@@ -278,6 +249,8 @@ class AbstractDices(Dices):
     """
     Used for the dice cost of cards and other actions
     """
+    __slots__ = ()
+
     _LEGAL_ELEMS = frozenset({
         Element.OMNI,  # represents the request for dices of the same type
         Element.PYRO,
@@ -300,8 +273,129 @@ class AbstractDices(Dices):
 
     @classmethod
     def from_dices(cls, dices: Dices) -> Optional[AbstractDices]:
-        new_dices = AbstractDices(dices._dices)
+        new_dices = AbstractDices._from_counts(dices._counts)
         if not new_dices.is_legal():
             return None
         else:
             return new_dices
+
+
+############################## Payment Solver ##############################
+# The solver works on count tuples, as (pool, requirement) pairs repeat a lot in
+# a game, results are cached in bounded LRU caches.
+
+_SOLVER_CACHE_SIZE = 1 << 14
+_ACTUAL_IDXS: tuple[int, ...] = tuple(sorted(elem.value for elem in ActualDices._LEGAL_ELEMS))
+
+
+@lru_cache(maxsize=_SOLVER_CACHE_SIZE)
+def _satisfy(counts: tuple[int, ...], required: tuple[int, ...]) -> bool:
+    """ if counts can pay required, given counts has enough dices """
+    # satisfy all pure elements first
+    pure_deducted = [counts[i] - required[i] for i in _PURE_IDXS]
+    omni_needed = sum(
+        -num
+        for num in pure_deducted
+        if num < 0
+    )
+
+    # if OMNI given cannot cover pure misses, fail
+    if counts[_OMNI_IDX] < omni_needed:
+        return False
+
+    # test OMNI requirement
+    omni_remained = counts[_OMNI_IDX] - omni_needed
+    most_pure = max(pure_deducted)
+    if omni_remained + most_pure < required[_OMNI_IDX]:
+        return False
+
+    # We have enough dices to satisfy Element.ANY, so success
+    return True
+
+
+@lru_cache(maxsize=_SOLVER_CACHE_SIZE)
+def _basically_satisfy(
+        counts: tuple[int, ...],
+        required: tuple[int, ...],
+) -> Optional[ActualDices]:
+    """
+    Pays pure elements with the same element first, OMNI with the least abundant
+    element that can cover it, and ANY with the least abundant pure elements.
+    """
+    if any(required[i] > 0 for i in AbstractDices._ILLEGAL_IDXS):
+        raise Exception("Unknown element")
+    remaining = list(counts)
+    answer = [0] * _NUM_ELEMS
+    omni_required = 0
+    for i in _PURE_IDXS:
+        if required[i] <= 0:
+            continue
+        if remaining[i] < required[i]:
+            answer[i] += remaining[i]
+            omni_required += required[i] - remaining[i]
+            remaining[i] = 0
+        else:
+            answer[i] += required[i]
+            remaining[i] -= required[i]
+    omni = required[_OMNI_IDX]
+    if omni > 0:
+        best_idx: Optional[int] = None
+        count = BIG_INT
+        for i in _PURE_IDXS + (_OMNI_IDX,):
+            this_count = remaining[i]
+            if this_count >= omni and this_count < count:
+                best_idx = i
+                count = this_count
+        if best_idx is None:
+            return None
+        else:
+            answer[best_idx] += omni
+            remaining[best_idx] -= omni
+    any_required = required[_ANY_IDX]
+    if any_required > 0:
+        # stable sort, so ties are broken by the order of elements
+        for i in sorted(_PURE_IDXS, key=remaining.__getitem__):
+            num = min(remaining[i], any_required)
+            answer[i] += num
+            remaining[i] -= num
+            any_required -= num
+            if any_required == 0:
+                break
+        if any_required > 0:
+            answer[_OMNI_IDX] += any_required
+            remaining[_OMNI_IDX] -= any_required
+    if omni_required > 0:
+        if remaining[_OMNI_IDX] < omni_required:
+            return None
+        answer[_OMNI_IDX] += omni_required
+    return ActualDices._from_counts(tuple(answer))
+
+
+@lru_cache(maxsize=_SOLVER_CACHE_SIZE)
+def _all_payments(
+        counts: tuple[int, ...],
+        required: tuple[int, ...],
+) -> tuple[ActualDices, ...]:
+    num = sum(required)
+    if not _satisfy(counts, required):
+        return ()
+    payments: list[ActualDices] = []
+    payment = [0] * _NUM_ELEMS
+
+    def pick(pos: int, num_left: int) -> None:
+        """ picks dices of elements _ACTUAL_IDXS[pos:] to make up num_left dices """
+        if num_left == 0:
+            candidate = tuple(payment)
+            if _satisfy(candidate, required):
+                payments.append(ActualDices._from_counts(candidate))
+            return
+        if pos == len(_ACTUAL_IDXS):
+            return
+        i = _ACTUAL_IDXS[pos]
+        for n in range(min(counts[i], num_left), -1, -1):
+            payment[i] = n
+            pick(pos + 1, num_left - n)
+        payment[i] = 0
+
+    pick(0, num)
+    return tuple(payments)
@@ -1,39 +1,101 @@
 from __future__ import annotations
-from typing import Iterable, TYPE_CHECKING
+from typing import Iterable, Iterator, Optional, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from .effect import Effect
 
 
+class _EffectNode:
+    """
+    Immutable node of the persistent (linked) stack of effects.
+
+    Each node only points to the node below, so successive EffectStacks share all
+    nodes they have in common, and push / pop are O(1).
+    """
+    __slots__ = ("effect", "below", "size", "_hash")
+
+    def __init__(self, effect: Effect, below: Optional[_EffectNode]) -> None:
+        self.effect = effect
+        self.below = below
+        self.size: int = 1 if below is None else below.size + 1
+        self._hash: Optional[int] = None
+
+    def stack_hash(self) -> int:
+        """ hash of all effects from the bottom up to this node, cached per node """
+        if self._hash is not None:
+            return self._hash
+        pending: list[_EffectNode] = []
+        node: Optional[_EffectNode] = self
+        while node is not None and node._hash is None:
+            pending.append(node)
+            node = node.below
+        stack_hash: int = hash(())
+        if node is not None and node._hash is not None:
+            stack_hash = node._hash
+        for node in reversed(pending):
+            stack_hash = hash((stack_hash, node.effect))
+            node._hash = stack_hash
+        return stack_hash
+
+    def __reduce__(self):
+        # the cached hash is not pickled as it differs between processes
+        return (_EffectNode, (self.effect, self.below))
+
+
 class EffectStack:
+    __slots__ = ("_top",)
+
     def __init__(self, effects: tuple[Effect, ...]) -> None:
-        self._effects = effects
+        """ effects[-1] is the top of the stack """
+        top: Optional[_EffectNode] = None
+        for effect in effects:
+            top = _EffectNode(effect, top)
+        self._top = top
+
+    @classmethod
+    def _from_top(cls, top: Optional[_EffectNode]) -> EffectStack:
+        effect_stack = cls.__new__(cls)
+        effect_stack._top = top
+        return effect_stack
+
+    @property
+    def _effects(self) -> tuple[Effect, ...]:
+        """ all effects from the bottom to the top, O(n) """
+        return tuple(reversed(tuple(self._iter_from_top())))
+
+    def _iter_from_top(self) -> Iterator[Effect]:
+        node = self._top
+        while node is not None:
+            yield node.effect
+            node = node.below
 
     def is_not_empty(self) -> bool:
         return not self.is_empty()
 
     def is_empty(self) -> bool:
-        return len(self._effects) == 0
+        return self._top is None
 
     def pop(self) -> tuple[EffectStack, Effect]:
-        assert not self.is_empty()
-        return (EffectStack(tuple(self._effects[:-1])), self._effects[-1])
+        assert self._top is not None
+        return (EffectStack._from_top(self._top.below), self._top.effect)
 
     def peek(self) -> Effect:
-        assert not self.is_empty()
-        return self._effects[-1]
+        assert self._top is not None
+        return self._top.effect
 
     def push_one(self, effect: Effect) -> EffectStack:
-        return EffectStack(self._effects + (effect, ))
+        return EffectStack._from_top(_EffectNode(effect, self._top))
 
     def push_many_lf(self, effects: Iterable[Effect]) -> EffectStack:
         """
         lf means the effects passed in are executed from the last to the first
         """
-        effects = tuple(effects)
-        if not effects:
+        top = self._top
+        for effect in effects:
+            top = _EffectNode(effect, top)
+        if top is self._top:
             return self
-        return EffectStack(self._effects + effects)
+        return EffectStack._from_top(top)
 
     def push_many_fl(self, effects: Iterable[Effect]) -> EffectStack:
         """
@@ -42,21 +104,40 @@ class EffectStack:
         effects = tuple(effects)
         if not effects:
             return self
-        return EffectStack(self._effects + effects[::-1])
+        top = self._top
+        for effect in reversed(effects):
+            top = _EffectNode(effect, top)
+        return EffectStack._from_top(top)
 
     def contains(self, effect_type: type[Effect]) -> bool:
-        for effect in self._effects:
+        for effect in self._iter_from_top():
             if type(effect) == effect_type:
                 return True
         return False
 
+    def _size(self) -> int:
+        return 0 if self._top is None else self._top.size
+
     def __eq__(self, other: object) -> bool:
+        if self is other:
+            return True
         if not isinstance(other, EffectStack):
             return False
-        return self._effects == other._effects
+        node, other_node = self._top, other._top
+        if self._size() != other._size():
+            return False
+        while node is not other_node:
+            # both are not None because the stacks have the same size
+            assert node is not None and other_node is not None
+            if node.effect != other_node.effect:
+                return False
+            node, other_node = node.below, other_node.below
+        return True
 
     def __hash__(self) -> int:
-        return hash(self._effects)
+        if self._top is None:
+            return hash(())
+        return self._top.stack_hash()
 
     def to_string(self, indent: int) -> str:
         return str(self)
@@ -66,6 +147,6 @@ class EffectStack:
 
     def dict_str(self) -> dict | str:
         content = {}
-        for i, effect in enumerate(reversed(self._effects)):
+        for i, effect in enumerate(self._iter_from_top()):
             content[f"{str(i)}-{effect.name()}"] = effect.dict_str()
         return content
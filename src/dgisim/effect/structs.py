@@ -5,7 +5,7 @@ from ..state.enums import PID
 from .enums import ZONE
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class StaticTarget:
     pid: PID
     zone: ZONE
@@ -13,7 +13,7 @@ class StaticTarget:
 
 # TODO: postpone this until further tests are done
 #       needs to investigate how Klee's burst and Mona's or Sucrose's Talent co-work
-@dataclass(frozen=True, kw_only=True)
+@dataclass(frozen=True, slots=True, kw_only=True)
 class DamageType:
     normal_attack: bool = False
     charged_attack: bool = False
@@ -132,6 +132,8 @@ class ReactionDetail:
 
 
 class ElementalAura:
+    __slots__ = ("_aura",)
+
     def __init__(self, aura: dict[Element, bool] = {}) -> None:
         assert aura.keys() <= AURA_ELEMENTS
         self._aura = HashableDict.from_dict(aura)
@@ -187,6 +189,8 @@ class ElementalAura:
         )
 
     def __eq__(self, other: object) -> bool:
+        if self is other:
+            return True
         if not isinstance(other, ElementalAura):
             return False
         return self._aura == other._aura
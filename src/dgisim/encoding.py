@@ -0,0 +1,303 @@
+"""
+Fixed shape numpy encodings of GameStates from the perspective of a player, for
+learners that consume game states as tensors.
+
+Requires numpy (`pip install dgisim[numpy]`).
+"""
+from __future__ import annotations
+
+from types import ModuleType
+from typing import Iterable, Optional, Sequence, TYPE_CHECKING
+
+import numpy as np
+
+from .card.cards_set import generated_cards
+from .element.element import AURA_ELEMENTS_ORDERED, Element
+from .state.enums import ACT, PID
+from .status import status as stt
+from .summon import summon as sm
+from .support import support as sp
+
+if TYPE_CHECKING:
+    from .card.card import Card
+    from .character.character import Character
+    from .mode import Mode
+    from .state.game_state import GameState
+    from .state.player_state import PlayerState
+    from .status.statuses import Statuses
+
+__all__ = [
+    "ObservationEncoder",
+]
+
+_DICE_ELEMS: tuple[Element, ...] = (
+    Element.OMNI,
+    Element.PYRO,
+    Element.HYDRO,
+    Element.ANEMO,
+    Element.ELECTRO,
+    Element.DENDRO,
+    Element.CRYO,
+    Element.GEO,
+)
+_ACT_IDXS: dict[ACT, int] = dict((act, i) for i, act in enumerate(ACT))
+_AURA_IDXS: dict[Element, int] = dict(
+    (elem, i) for i, elem in enumerate(AURA_ELEMENTS_ORDERED)
+)
+
+
+def _concrete_classes(module: ModuleType, base: type) -> tuple[type, ...]:
+    """ the public classes derived from base that are not extended in module """
+    classes = [
+        cls
+        for cls in vars(module).values()
+        if isinstance(cls, type)
+        and issubclass(cls, base)
+        and cls.__module__ == module.__name__
+        and not cls.__name__.startswith("_")
+    ]
+    return tuple(
+        cls
+        for cls in classes
+        if not any(sub.__module__ == module.__name__ for sub in cls.__subclasses__())
+    )
+
+
+def _indices(classes: Iterable[type]) -> dict[type, int]:
+    return dict(
+        (cls, i)
+        for i, cls in enumerate(sorted(classes, key=lambda cls: cls.__name__))
+    )
+
+
+class ObservationEncoder:
+    """
+    Encodes a GameState as a float32 vector of length size(), laid out as:
+
+    - round, one-hot phase, whether the game waits for me / the opponent, and
+      whether I am the active player
+    - my player block, then the opponent's player block
+
+    A player block holds the one-hot ACT of the player, dice counts per element
+    and in total, hand card counts per card and in total, the number of cards
+    in the deck, then per character slot (in character id order): one-hot
+    character type, alive, active, hp, max hp, energy, max energy, aura bits and
+    statuses; then the combat statuses, the summons and the supports.
+
+    Each status, summon and support type has a presence (or count) column and a
+    usages column. With `hide_opponent`, the opponent's dice elements and hand
+    cards are left zero, only their totals are encoded.
+    """
+
+    def __init__(
+            self,
+            mode: Mode,
+            num_chars: int = 3,
+            cards: Optional[Iterable[type[Card]]] = None,
+            hide_opponent: bool = True,
+    ) -> None:
+        if cards is None:
+            cards = mode.all_cards() | generated_cards()
+        self._mode = mode
+        self._num_chars = num_chars
+        self._hide_opponent = hide_opponent
+
+        self._card_idxs: dict[type, int] = _indices(set(cards))
+        self._char_idxs: dict[type, int] = _indices(mode.all_chars())
+        self._status_idxs: dict[type, int] = _indices(
+            _concrete_classes(stt, stt.Status)
+        )
+        self._summon_idxs: dict[type, int] = _indices(
+            _concrete_classes(sm, sm.Summon)
+        )
+        self._support_idxs: dict[type, int] = _indices(
+            _concrete_classes(sp, sp.Support)
+        )
+        self._phase_idxs: dict[type, int] = dict(
+            (type(phase), i)
+            for i, phase in enumerate((
+                mode.card_select_phase(),
+                mode.starting_hand_select_phase(),
+                mode.roll_phase(),
+                mode.action_phase(),
+                mode.end_phase(),
+                mode.game_end_phase(),
+            ))
+        )
+
+        # offsets within a character block
+        self._c_alive = len(self._char_idxs)
+        self._c_active = self._c_alive + 1
+        self._c_hp = self._c_active + 1
+        self._c_max_hp = self._c_hp + 1
+        self._c_energy = self._c_max_hp + 1
+        self._c_max_energy = self._c_energy + 1
+        self._c_aura = self._c_max_energy + 1
+        self._c_statuses = self._c_aura + len(AURA_ELEMENTS_ORDERED)
+        self._char_size = self._c_statuses + 2 * len(self._status_idxs)
+
+        # offsets within a player block
+        self._p_act = 0
+        self._p_dices = self._p_act + len(_ACT_IDXS)
+        self._p_dice_num = self._p_dices + len(_DICE_ELEMS)
+        self._p_hand = self._p_dice_num + 1
+        self._p_hand_num = self._p_hand + len(self._card_idxs)
+        self._p_deck_num = self._p_hand_num + 1
+        self._p_chars = self._p_deck_num + 1
+        self._p_combat_statuses = self._p_chars + num_chars * self._char_size
+        self._p_summons = self._p_combat_statuses + 2 * len(self._status_idxs)
+        self._p_supports = self._p_summons + 2 * len(self._summon_idxs)
+        self._player_size = self._p_supports + 2 * len(self._support_idxs)
+
+        # offsets of the whole vector
+        self._round = 0
+        self._phase = self._round + 1
+        self._waiting_for_me = self._phase + len(self._phase_idxs)
+        self._waiting_for_opponent = self._waiting_for_me + 1
+        self._active_player = self._waiting_for_opponent + 1
+        self._me = self._active_player + 1
+        self._opponent = self._me + self._player_size
+        self._size = self._opponent + self._player_size
+
+    def size(self) -> int:
+        return self._size
+
+    def get_mode(self) -> Mode:
+        return self._mode
+
+    def encode(
+            self,
+            game_state: GameState,
+            pid: PID,
+            out: Optional[np.ndarray] = None,
+    ) -> np.ndarray:
+        """ encodes game_state from the perspective of pid into out (if provided) """
+        if out is None:
+            out = np.empty(self._size, dtype=np.float32)
+        out[:] = self._encode_row(game_state, pid)
+        return out
+
+    def encode_batch(
+            self,
+            game_states: Sequence[GameState],
+            pids: PID | Iterable[PID],
+            out: Optional[np.ndarray] = None,
+    ) -> np.ndarray:
+        """
+        encodes game_states into the rows of out, a (len(game_states), size())
+        array that is allocated if not provided; `pids` is either one pid for all
+        game states or one per game state
+        """
+        if isinstance(pids, PID):
+            pids = [pids] * len(game_states)
+        if out is None:
+            out = np.empty((len(game_states), self._size), dtype=np.float32)
+        elif out.shape[0] < len(game_states) or out.shape[1] != self._size:
+            raise Exception(
+                f"Output of shape {out.shape} cannot hold {len(game_states)} x {self._size}"
+            )
+        for i, (game_state, pid) in enumerate(zip(game_states, pids)):
+            out[i] = self._encode_row(game_state, pid)
+        return out
+
+    def _encode_row(self, game_state: GameState, pid: PID) -> list[float]:
+        row = [0.0] * self._size
+        row[self._round] = game_state.get_round()
+        phase_idx = self._phase_idxs.get(type(game_state.get_phase()))
+        if phase_idx is not None:
+            row[self._phase + phase_idx] = 1
+        waiting_for = None if game_state.game_end() else game_state.waiting_for()
+        if waiting_for is pid:
+            row[self._waiting_for_me] = 1
+        elif waiting_for is not None:
+            row[self._waiting_for_opponent] = 1
+        if game_state.get_active_player_id() is pid:
+            row[self._active_player] = 1
+        self._encode_player(row, self._me, game_state.get_player(pid), hidden=False)
+        self._encode_player(
+            row,
+            self._opponent,
+            game_state.get_other_player(pid),
+            hidden=self._hide_opponent,
+        )
+        return row
+
+    def _encode_player(
+            self,
+            row: list[float],
+            offset: int,
+            player: PlayerState,
+            hidden: bool,
+    ) -> None:
+        row[offset + self._p_act + _ACT_IDXS[player.get_phase()]] = 1
+
+        dices = player.get_dices()
+        row[offset + self._p_dice_num] = dices.num_dices()
+        hand_cards = player.get_hand_cards()
+        row[offset + self._p_hand_num] = hand_cards.num_cards()
+        row[offset + self._p_deck_num] = player.get_deck_cards().num_cards()
+        if not hidden:
+            dices_offset = offset + self._p_dices
+            for i, elem in enumerate(_DICE_ELEMS):
+                row[dices_offset + i] = dices[elem]
+            hand_offset = offset + self._p_hand
+            for card, num in hand_cards.to_dict().items():
+                card_idx = self._card_idxs.get(card)
+                if card_idx is not None:
+                    row[hand_offset + card_idx] = num
+
+        characters = player.get_characters()
+        active_id = characters.get_active_character_id()
+        for char in characters:
+            char_id = char.get_id()
+            if 1 <= char_id <= self._num_chars:
+                self._encode_character(
+                    row,
+                    offset + self._p_chars + (char_id - 1) * self._char_size,
+                    char,
+                    char_id == active_id,
+                )
+
+        self._encode_statuses(
+            row, offset + self._p_combat_statuses, player.get_combat_statuses()
+        )
+        summons_offset = offset + self._p_summons
+        for summon in player.get_summons():
+            summon_idx = self._summon_idxs.get(type(summon))
+            if summon_idx is not None:
+                row[summons_offset + 2 * summon_idx] = 1
+                row[summons_offset + 2 * summon_idx + 1] = summon.usages
+        supports_offset = offset + self._p_supports
+        for support in player.get_supports():
+            support_idx = self._support_idxs.get(type(support))
+            if support_idx is not None:
+                row[supports_offset + 2 * support_idx] += 1
+                row[supports_offset + 2 * support_idx + 1] += getattr(support, "usages", 0)
+
+    def _encode_character(
+            self,
+            row: list[float],
+            offset: int,
+            char: Character,
+            active: bool,
+    ) -> None:
+        char_idx = self._char_idxs.get(type(char))
+        if char_idx is not None:
+            row[offset + char_idx] = 1
+        row[offset + self._c_alive] = 0 if char.defeated() else 1
+        row[offset + self._c_active] = 1 if active else 0
+        row[offset + self._c_hp] = char.get_hp()
+        row[offset + self._c_max_hp] = char.get_max_hp()
+        row[offset + self._c_energy] = char.get_energy()
+        row[offset + self._c_max_energy] = char.get_max_energy()
+        for elem in char.get_elemental_aura():
+            row[offset + self._c_aura + _AURA_IDXS[elem]] = 1
+        for statuses in char.get_all_statuses_ordered():
+            self._encode_statuses(row, offset + self._c_statuses, statuses)
+
+    def _encode_statuses(self, row: list[float], offset: int, statuses: Statuses) -> None:
+        for status in statuses:
+            status_idx = self._status_idxs.get(type(status))
+            if status_idx is not None:
+                row[offset + 2 * status_idx] = 1
+                row[offset + 2 * status_idx + 1] = getattr(status, "usages", 0)
@@ -1,53 +1,128 @@
+from enum import Enum
 from typing import Callable, Optional
 
 from .action.action import PlayerAction
 from .helper.level_print import GamePrinter
+from .history_view import HistoryView
 from .phase.phase import Phase
 from .player_agent import PlayerAgent
 from .state.enums import PID
 from .state.game_state import GameState
 
 
+class HistoryPolicy(Enum):
+    """
+    What a GameStateMachine keeps of the past states of a game
+
+    - FULL: every state
+    - KEYFRAMES: the initial state, the state after every `keyframe_interval`
+      actions and the transitions between states; other states are re-simulated
+      from the closest earlier keyframe when asked for
+    - ACTIONS: the initial state and the transitions, every past state is
+      re-simulated from the start when asked for
+    - NONE: only the current state, for rollouts
+    """
+    FULL = "Full"
+    KEYFRAMES = "Keyframes"
+    ACTIONS = "Actions"
+    NONE = "None"
+
+
+# called with the game state an action is taken in, the acting player and the action
+ActionHook = Callable[[GameState, PID, PlayerAction], None]
+
+
 class GameStateMachine:
-    def __init__(self, game_state: GameState, player1: PlayerAgent, player2: PlayerAgent):
-        self._history = [game_state]
+    def __init__(
+            self,
+            game_state: GameState,
+            player1: PlayerAgent,
+            player2: PlayerAgent,
+            history_policy: HistoryPolicy = HistoryPolicy.FULL,
+            keyframe_interval: int = 16,
+    ):
+        self._history_policy = history_policy
+        self._keyframe_interval = keyframe_interval
+        # all states, only kept by HistoryPolicy.FULL
+        self._history: Optional[list[GameState]] = (
+            [game_state] if history_policy is HistoryPolicy.FULL else None
+        )
+        # states re-simulation starts from, index -> state
+        self._keyframes: dict[int, GameState] = (
+            {0: game_state}
+            if history_policy is HistoryPolicy.KEYFRAMES or history_policy is HistoryPolicy.ACTIONS
+            else {}
+        )
+        # the last re-simulated state, so walking through the history is cheap
+        self._resimulated: Optional[tuple[int, GameState]] = None
+        # indices of states left by GameState.auto_step() instead of step(), for re-simulation
+        self._fast_steps: set[int] = set()
+        self._num_states = 1
+        self._num_actions = 0
+        self._last_action: Optional[tuple[int, PlayerAction]] = None
         self._action_history: list[int] = []
         self._actions: dict[int, PlayerAction] = {}
         self._game_state = game_state
         self._playerAgent1 = player1
         self._playerAgent2 = player2
+        self._history_view = HistoryView(self)
+        self._action_hooks: list[ActionHook] = []
 
     @classmethod
     def from_default(cls, player1: PlayerAgent, player2: PlayerAgent):
         return cls(GameState.from_default(), player1, player2)
 
+    def add_action_hook(self, hook: ActionHook) -> None:
+        """ hook is called after each action that is taken, in the order added """
+        self._action_hooks.append(hook)
+
+    def remove_action_hook(self, hook: ActionHook) -> None:
+        self._action_hooks.remove(hook)
+
+    def get_history_policy(self) -> HistoryPolicy:
+        return self._history_policy
+
+    def _keeps_actions(self) -> bool:
+        return self._history_policy is not HistoryPolicy.NONE
+
     def get_history(self) -> tuple[GameState, ...]:
-        return tuple(self._history)
+        """ all states so far, re-simulated unless HistoryPolicy.FULL """
+        if self._history is not None:
+            return tuple(self._history)
+        return tuple(self.get_game_state_at(i) for i in range(self._num_states))
 
     def get_action_history(self) -> tuple[GameState, ...]:
-        return tuple([self._history[i] for i in self._action_history])
+        return tuple([self.get_game_state_at(i) for i in self._action_history])
+
+    def get_actions(self) -> tuple[PlayerAction, ...]:
+        """ the actions taken so far in order, not kept by HistoryPolicy.NONE """
+        return tuple(self._actions[i] for i in self._action_history)
+
+    def num_actions(self) -> int:
+        """ the number of actions taken so far, under any history policy """
+        return self._num_actions
 
     def get_last_action(self) -> Optional[PlayerAction]:
-        if self._action_history:
-            return self._actions[self._action_history[-1]]
+        if self._last_action is not None:
+            return self._last_action[1]
         return None
 
     def get_last_action_idx(self) -> Optional[int]:
-        if self._action_history:
-            return self._action_history[-1]
+        if self._last_action is not None:
+            return self._last_action[0]
         return None
 
     def get_game_state(self) -> GameState:
         return self._game_state
 
     def curr_index(self) -> int:
-        return len(self._history) - 1
+        return self._num_states - 1
 
     def is_latest_index(self, index: int) -> bool:
         return index == self.latest_index()
 
     def latest_index(self) -> int:
-        return len(self._history) - 1
+        return self._num_states - 1
 
     def prev_action_index(self, index: int) -> int:
         if not self._action_history:
@@ -79,27 +154,68 @@ class GameStateMachine:
         return min(self.latest_index(), index + 1)
 
     def get_game_state_at(self, index: int) -> GameState:
-        return self._history[index]
+        if index == self._num_states - 1:
+            return self._game_state
+        if self._history is not None:
+            return self._history[index]
+        if not self._keyframes or not 0 <= index < self._num_states:
+            raise Exception(
+                f"State {index} is not available under {self._history_policy}"
+            )
+        start = max(i for i in self._keyframes if i <= index)
+        game_state = self._keyframes[start]
+        if self._resimulated is not None and start <= self._resimulated[0] <= index:
+            start, game_state = self._resimulated
+        for i in range(start, index):
+            game_state = self._next_state_of(i, game_state)
+        self._resimulated = (index, game_state)
+        return game_state
+
+    def _next_state_of(self, index: int, game_state: GameState) -> GameState:
+        """ replays the transition from the state at index """
+        action = self._actions.get(index)
+        if action is not None:
+            pid = game_state.waiting_for()
+            assert pid is not None
+            next_state = game_state.action_step(pid, action)
+            assert next_state is not None
+            return next_state
+        if index in self._fast_steps:
+            return game_state.auto_step()
+        return game_state.step()
+
+    def _append(self, game_state: GameState) -> None:
+        self._game_state = game_state
+        self._num_states += 1
+        if self._history is not None:
+            self._history.append(game_state)
 
     def _step(self, observe=False) -> None:
-        self._game_state = self._game_state.step()
+        self._append(self._game_state.step())
         if observe:
             print(GamePrinter.dict_game_printer(self._game_state.dict_str()))
             input(">>> ")
-        self._history.append(self._game_state)
 
     def _action_step(self, pid: PID, action: PlayerAction, observe=False) -> bool:
-        next_state = self._game_state.action_step(pid, action)
+        game_state = self._game_state
+        next_state = game_state.action_step(pid, action)
         if next_state is None:
             return False
-        action_idx = len(self._history) - 1
-        self._action_history.append(action_idx)
-        self._actions[action_idx] = action
-        self._game_state = next_state
+        action_idx = self._num_states - 1
+        self._num_actions += 1
+        self._last_action = (action_idx, action)
+        if self._keeps_actions():
+            self._action_history.append(action_idx)
+            self._actions[action_idx] = action
+        self._append(next_state)
+        if self._history_policy is HistoryPolicy.KEYFRAMES \
+                and self._num_actions % self._keyframe_interval == 0:
+            self._keyframes[self._num_states - 1] = next_state
+        for hook in self._action_hooks:
+            hook(game_state, pid, action)
         if observe:
             print(GamePrinter.dict_game_printer(self._game_state.dict_str()))
             input(">>> ")
-        self._history.append(self._game_state)
         return True
 
     def step_until_phase(self, phase: type[Phase] | Phase, observe=False) -> None:
@@ -134,32 +250,51 @@ class GameStateMachine:
             while patience > 0 \
                     and not self._action_step(
                         pid,
-                        self.player_agent(pid).choose_action(self._history, pid),
+                        self.player_agent(pid).choose_action(self._agent_history(pid), pid),
                         observe=observe,
                     ):
                 patience -= 1
 
+    def _agent_history(self, pid: PID) -> HistoryView:
+        """ the history passed to the agent of pid """
+        if self.player_agent(pid).NEEDS_HISTORY:
+            return self._history_view
+        return HistoryView.of_state(self._game_state, self.get_last_action())
+
+    def get_history_view(self) -> HistoryView:
+        """ read-only view of the history under the current HistoryPolicy """
+        return self._history_view
+
     def changing_step(self, observe=False) -> None:
         game_state = self._game_state
         self.one_step(observe=observe)
         while not self.game_end() and game_state is self._game_state:
             self.one_step(observe=observe)
 
-    def auto_step(self, observe=False) -> None:
+    def auto_step(self, observe=False, fast=False) -> None:
         """
         fast-forward to the game state where a player action is required
+
+        if fast is True (and observe is False), the intermediate game states are
+        skipped and only the final one is added to the history
         """
+        if fast and not observe:
+            if not self.game_end() and self._game_state.waiting_for() is None:
+                if self._keyframes:
+                    self._fast_steps.add(self._num_states - 1)
+                self._append(self._game_state.auto_step())
+            return
         pid = self._game_state.waiting_for()
         while not self.game_end() and pid is None:
             self._step(observe=observe)
             pid = self._game_state.waiting_for()
 
-    def player_step(self, observe=False) -> None:
+    def player_step(self, observe=False, fast=False) -> None:
         """
         fast-forward to the game state where a player action is required,
         and then make one step taking the player's action
         """
-        self.auto_step(observe=observe)
+        self.auto_step(observe=observe, fast=fast)
         self.one_step(observe=observe)
 
     def run(self) -> None:
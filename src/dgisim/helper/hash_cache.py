@@ -0,0 +1,71 @@
+from __future__ import annotations
+from typing import ClassVar, Optional
+
+__all__ = [
+    "HashCache",
+]
+
+_SLOT_NAMES: dict[type, tuple[str, ...]] = {}
+
+
+def _slot_names(cls: type) -> tuple[str, ...]:
+    names = _SLOT_NAMES.get(cls)
+    if names is None:
+        names = _SLOT_NAMES[cls] = tuple(
+            name
+            for klass in cls.__mro__
+            for name in klass.__dict__.get("__slots__", ())
+        )
+    return names
+
+
+class HashCache:
+    """
+    Mixin for immutable objects that cache their hash in `_hash`.
+
+    Subclasses compute their hash once and store it in `_hash`, e.g.:
+
+        def __hash__(self) -> int:
+            if self._hash is None:
+                self._hash = hash(self._all_unique_data())
+            return self._hash
+
+    Subclasses are expected to declare `__slots__` (including their caches, which
+    must then be initialised to None in `__init__()`).
+
+    Cached values (`_hash`, the Zobrist key `_zobrist`, the `_status_index` of
+    PlayerState, and the `_legal_actions` and checkers of GameState) are dropped on
+    pickling, as hashes of str, enums and classes differ between Python processes,
+    and the rest is cheap to rebuild.
+    """
+    __slots__ = ()
+
+    _CACHES: ClassVar[frozenset[str]] = frozenset((
+        "_hash",
+        "_zobrist",
+        "_status_index",
+        "_legal_actions",
+        "_swap_checker",
+        "_skill_checker",
+        "_elem_tuning_checker",
+    ))
+
+    # defaults of subclasses without slots
+    _hash: Optional[int] = None
+    _zobrist: Optional[int] = None
+
+    def __getstate__(self) -> dict:
+        state = dict(getattr(self, "__dict__", {}))
+        for name in _slot_names(type(self)):
+            if hasattr(self, name):
+                state[name] = getattr(self, name)
+        for name in self._CACHES:
+            state.pop(name, None)
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        for name in _slot_names(type(self)):
+            if name in self._CACHES:
+                object.__setattr__(self, name, None)
+        for name, value in state.items():
+            object.__setattr__(self, name, value)
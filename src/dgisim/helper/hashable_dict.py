@@ -2,8 +2,10 @@ from __future__ import annotations
 from typing import Dict, Any
 from typing_extensions import override
 
+from .hash_cache import HashCache
 
-class HashableDict(dict):
+
+class HashableDict(dict, HashCache):
     """
     Inheritates dict but implements __hash__().
 
@@ -17,6 +19,8 @@ class HashableDict(dict):
 
     You cannot call any setter, deleter or hash method of a frozen HashableDict.
     If you do so, Exception will be raised.
+
+    The hash is computed once and cached until the HashableDict is unfrozen.
     """
 
     def __init__(self, *args, frozen=True, **kwargs):
@@ -44,6 +48,7 @@ class HashableDict(dict):
         """
         # use a trick to bypass overriden __setattr__() avoiding exception
         object.__setattr__(self, "_frozen", False)
+        object.__setattr__(self, "_hash", None)
 
     def frozen(self) -> bool:
         if hasattr(self, "_frozen"):
@@ -86,7 +91,11 @@ class HashableDict(dict):
         """ Exception is raised if the HashableDict is not frozen. """
         if not self.frozen():
             raise Exception("Calling __hash__() to a non-frozen HashableDict!")
-        return hash(frozenset(self.items()))
+        if self._hash is None:
+            hash_value = hash(frozenset(self.items()))
+            object.__setattr__(self, "_hash", hash_value)
+            return hash_value
+        return self._hash
 
     @classmethod
     def from_dict(cls, d: dict) -> HashableDict:
@@ -0,0 +1,41 @@
+from __future__ import annotations
+import random
+from dataclasses import dataclass
+
+__all__ = [
+    "RNG",
+]
+
+
+@dataclass(frozen=True)
+class RNG:
+    """
+    Immutable random number generator made of a seed and a counter.
+
+    The same (seed, counter) pair always produces the same random draws, so any
+    stochastic transition of a game state is reproducible. Whoever consumes
+    `generator()` is responsible to move the game state on to `next()`.
+    """
+    seed: int
+    counter: int = 0
+
+    @classmethod
+    def from_random(cls) -> RNG:
+        """ seeded from the global `random`, so `random.seed()` still controls it """
+        return cls(seed=random.getrandbits(64))
+
+    def generator(self) -> random.Random:
+        return random.Random((self.seed << 64) + self.counter)
+
+    def next(self) -> RNG:
+        return RNG(self.seed, self.counter + 1)
+
+    def split(self) -> tuple[RNG, RNG]:
+        """
+        Returns the next state of this RNG and an independent child RNG,
+        useful for handing randomness to parallel simulations.
+        """
+        return self.next(), RNG(seed=self.generator().getrandbits(64))
+
+    def __str__(self) -> str:
+        return f"{self.seed}:{self.counter}"
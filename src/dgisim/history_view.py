@@ -0,0 +1,76 @@
+from __future__ import annotations
+from typing import Optional, Sequence, TYPE_CHECKING, overload
+
+if TYPE_CHECKING:
+    from .action.action import PlayerAction
+    from .game_state_machine import GameStateMachine
+    from .state.game_state import GameState
+
+__all__ = [
+    "HistoryView",
+]
+
+
+class HistoryView(Sequence["GameState"]):
+    """
+    Read-only view of the states of a game that agents choose actions on.
+
+    A view of a GameStateMachine fetches states lazily from whatever the machine
+    keeps under its HistoryPolicy, so past states may be re-simulated or be
+    unavailable. A view of a single state (`of_state()`) only holds that state.
+    `history[-1]` is always the current state.
+    """
+
+    def __init__(self, state_machine: GameStateMachine) -> None:
+        self._state_machine: Optional[GameStateMachine] = state_machine
+        self._game_state: Optional[GameState] = None
+        self._last_action: Optional[PlayerAction] = None
+
+    @classmethod
+    def of_state(
+            cls,
+            game_state: GameState,
+            last_action: Optional[PlayerAction] = None,
+    ) -> HistoryView:
+        """ a view of game_state alone, that keeps no other state alive """
+        view = cls.__new__(cls)
+        view._state_machine = None
+        view._game_state = game_state
+        view._last_action = last_action
+        return view
+
+    def current(self) -> GameState:
+        if self._state_machine is not None:
+            return self._state_machine.get_game_state()
+        assert self._game_state is not None
+        return self._game_state
+
+    def last_action(self) -> Optional[PlayerAction]:
+        """ the last action taken in the game, None if there is none """
+        if self._state_machine is not None:
+            return self._state_machine.get_last_action()
+        return self._last_action
+
+    def __len__(self) -> int:
+        if self._state_machine is not None:
+            return self._state_machine.latest_index() + 1
+        return 1
+
+    @overload
+    def __getitem__(self, index: int) -> GameState: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> tuple[GameState, ...]: ...
+
+    def __getitem__(self, index: int | slice) -> GameState | tuple[GameState, ...]:
+        if isinstance(index, slice):
+            return tuple(self[i] for i in range(*index.indices(len(self))))
+        length = len(self)
+        if index < 0:
+            index += length
+        if not 0 <= index < length:
+            raise IndexError(f"History index {index} out of range")
+        if index == length - 1:
+            return self.current()
+        assert self._state_machine is not None
+        return self._state_machine.get_game_state_at(index)
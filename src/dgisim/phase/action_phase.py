@@ -51,6 +51,12 @@ class ActionPhase(ph.Phase):
         return not effect_stack.is_empty() \
             and not isinstance(effect_stack.peek(), DeathSwapPhaseStartEffect)
 
+    def _step_executes_effect(self, game_state: GameState) -> bool:
+        return (
+            game_state.get_player1().get_phase() is ACT.ACTION_PHASE
+            or game_state.get_player2().get_phase() is ACT.ACTION_PHASE
+        ) and self._is_executing_effects(game_state)
+
     def step(self, game_state: GameState) -> GameState:
         p1 = game_state.get_player1()
         p2 = game_state.get_player2()
@@ -136,6 +142,8 @@ class ActionPhase(ph.Phase):
         # Afterwards
         return game_state.factory().f_effect_stack(
             lambda es: es.push_many_fl(new_effects)
+        ).f_rng(
+            lambda rng: rng.next()
         ).player(
             pid,
             player.factory().dices(new_dices).build()
@@ -329,6 +337,28 @@ class ActionPhase(ph.Phase):
             return self._handle_end_round(game_state, pid, action)
         raise Exception("Unknown Game State to process")
 
+    def legal_actions(self, game_state: GameState, pid: PID) -> tuple[PlayerAction, ...]:
+        swap_checker = game_state.swap_checker()
+        if swap_checker.should_death_swap():
+            death_swap_generator = swap_checker.action_generator(pid)
+            assert death_swap_generator is not None
+            return death_swap_generator.all_actions()
+        action_generators = (
+            game_state.elem_tuning_checker().action_generator(pid),
+            game_state.skill_checker().action_generator(pid),
+            *(
+                card.action_generator(game_state, pid)
+                for card in game_state.get_player(pid).get_hand_cards()
+            ),
+            swap_checker.action_generator(pid),
+        )
+        return tuple(dict.fromkeys(
+            action
+            for action_generator in action_generators
+            if action_generator is not None
+            for action in action_generator.all_actions()
+        )) + (EndRoundAction(),)
+
     def waiting_for(self, game_state: GameState) -> Optional[PID]:
         effect_stack = game_state.get_effect_stack()
         # if no effects are to be executed or death swap phase is inserted
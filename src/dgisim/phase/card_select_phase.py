@@ -4,6 +4,7 @@ from typing import Optional, TYPE_CHECKING
 from ..phase import phase as ph
 
 from ..action.action import CardSelectAction, PlayerAction, EndRoundAction
+from ..card.cards import Cards
 from ..state.enums import PID, ACT
 
 if TYPE_CHECKING:
@@ -17,8 +18,9 @@ class CardSelectPhase(ph.Phase):
     def _draw_cards_and_activate(self, game_state: GameState) -> GameState:
         p1: PlayerState = game_state.get_player1()
         p2: PlayerState = game_state.get_player2()
-        p1_deck, p1_hand = p1.get_deck_cards().pick_random_cards(self._NUM_CARDS)
-        p2_deck, p2_hand = p2.get_deck_cards().pick_random_cards(self._NUM_CARDS)
+        rng = game_state.get_rng().generator()
+        p1_deck, p1_hand = p1.get_deck_cards().pick_random_cards(self._NUM_CARDS, rng)
+        p2_deck, p2_hand = p2.get_deck_cards().pick_random_cards(self._NUM_CARDS, rng)
         new_p1 = p1.factory().phase(
             ACT.ACTION_PHASE
         ).card_redraw_chances(
@@ -37,7 +39,13 @@ class CardSelectPhase(ph.Phase):
         ).hand_cards(
             p2_hand
         ).build()
-        return game_state.factory().player1(new_p1).player2(new_p2).build()
+        return game_state.factory().player1(
+            new_p1
+        ).player2(
+            new_p2
+        ).f_rng(
+            lambda rng: rng.next()
+        ).build()
 
     def _to_starting_hand_select_phase(self, game_state: GameState) -> GameState:
         return game_state.factory().phase(
@@ -61,7 +69,10 @@ class CardSelectPhase(ph.Phase):
 
     def _handle_card_drawing(self, game_state: GameState, pid: PID, action: CardSelectAction) -> GameState:
         player: PlayerState = game_state.get_player(pid)
-        new_deck, new_cards = player.get_deck_cards().pick_random_cards(action.num_cards())
+        new_deck, new_cards = player.get_deck_cards().pick_random_cards(
+            action.num_cards(),
+            game_state.get_rng().generator(),
+        )
         new_deck = new_deck + action.selected_cards
         new_hand = player.get_hand_cards() - action.selected_cards
         new_hand = new_hand + new_cards
@@ -79,6 +90,8 @@ class CardSelectPhase(ph.Phase):
             .deck_cards(new_deck)
             .hand_cards(new_hand)
             .build()
+        ).f_rng(
+            lambda rng: rng.next()
         ).build()
 
     def _handle_end_round(self, game_state: GameState, pid: PID, action: EndRoundAction) -> GameState:
@@ -100,6 +113,21 @@ class CardSelectPhase(ph.Phase):
         else:
             raise Exception("Unknown Game State to process")
 
+    def legal_actions(self, game_state: GameState, pid: PID) -> tuple[PlayerAction, ...]:
+        hand_cards = game_state.get_player(pid).get_hand_cards()
+        selections: list[Cards] = [Cards.from_empty()]
+        for card in hand_cards:
+            selections = [
+                selection + {card: num}
+                for selection in selections
+                for num in range(hand_cards[card] + 1)
+            ]
+        return tuple(
+            CardSelectAction(selected_cards=selection)
+            for selection in selections
+            if selection.not_empty()
+        ) + (EndRoundAction(),)
+
     def __eq__(self, other: object) -> bool:
         return isinstance(other, CardSelectPhase)
 
@@ -34,14 +34,21 @@ class EndPhase(ph.Phase):
         active_player_id = game_state.get_active_player_id()
         active_player = game_state.get_player(active_player_id)
         other_player = game_state.get_other_player(active_player_id)
-        active_player_deck, new_cards = active_player.get_deck_cards().pick_random_cards(self._CARDS_DRAWN)
+        rng = game_state.get_rng().generator()
+        active_player_deck, new_cards = active_player.get_deck_cards().pick_random_cards(
+            self._CARDS_DRAWN, rng
+        )
         active_player_hand = active_player.get_hand_cards() + new_cards
-        other_player_deck, new_cards = other_player.get_deck_cards().pick_random_cards(self._CARDS_DRAWN)
+        other_player_deck, new_cards = other_player.get_deck_cards().pick_random_cards(
+            self._CARDS_DRAWN, rng
+        )
         other_player_hand = other_player.get_hand_cards() + new_cards
         return game_state.factory().round(
             new_round
         ).phase(
             game_state.get_mode().roll_phase()
+        ).f_rng(
+            lambda rng: rng.next()
         ).f_player(
             active_player_id,
             lambda p: p.factory().phase(
@@ -94,6 +101,16 @@ class EndPhase(ph.Phase):
         return not effect_stack.is_empty() \
             and not isinstance(effect_stack.peek(), DeathSwapPhaseStartEffect)
 
+    def _step_executes_effect(self, game_state: GameState) -> bool:
+        p1p = game_state.get_player1().get_phase()
+        p2p = game_state.get_player2().get_phase()
+        return not (p1p is ACT.PASSIVE_WAIT_PHASE and p2p is ACT.PASSIVE_WAIT_PHASE) \
+            and (
+                p1p is ACT.ACTIVE_WAIT_PHASE or p2p is ACT.ACTIVE_WAIT_PHASE
+                or p1p.is_action_phase() or p2p.is_action_phase()
+            ) \
+            and self._is_executing_effects(game_state)
+
     def step(self, game_state: GameState) -> GameState:
         p1 = game_state.get_player1()
         p2 = game_state.get_player2()
@@ -147,6 +164,12 @@ class EndPhase(ph.Phase):
 
         raise NotImplementedError
 
+    def legal_actions(self, game_state: GameState, pid: PID) -> tuple[PlayerAction, ...]:
+        death_swap_generator = game_state.swap_checker().action_generator(pid)
+        if death_swap_generator is None:
+            return ()
+        return death_swap_generator.all_actions()
+
     def waiting_for(self, game_state: GameState) -> Optional[PID]:
         effect_stack = game_state.get_effect_stack()
         # if no effects are to be executed or death swap phase is inserted
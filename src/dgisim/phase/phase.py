@@ -17,6 +17,41 @@ class Phase:
         GameState]:
         raise Exception("Not Overriden")
 
+    def legal_actions(self, game_state: GameState, pid: PID) -> tuple[PlayerAction, ...]:
+        """
+        Returns all distinct legal actions of player pid, given that game_state is
+        waiting for pid. Use GameState.legal_actions() which caches the result.
+        """
+        return ()
+
+    def _step_executes_effect(self, game_state: GameState) -> bool:
+        """ returns True if step() on game_state only executes the top effect """
+        return False
+
+    def fast_step(self, game_state: GameState) -> GameState:
+        """
+        Same as step(), except that if step() would execute an effect, all following
+        effects are executed back to back as long as step() would keep doing so,
+        without handing out the intermediate game states.
+
+        The drain works on one game state it owns: a copy of game_state without
+        the top effect is built once, and from then on the next effect is popped
+        off the state the last effect returned in place, instead of building a
+        new game state per popped effect as step() does. Effect.execute() still
+        builds the game states of the changes the effects make.
+        """
+        if not self._step_executes_effect(game_state):
+            return self.step(game_state)
+        phase_type = type(self)
+        # the working state, no one else has seen it or the states effects build from it
+        game_state, effect = game_state._pop_effect()
+        while True:
+            game_state = effect.execute(game_state)
+            phase = game_state.get_phase()
+            if type(phase) is not phase_type or not phase._step_executes_effect(game_state):
+                return game_state
+            effect = game_state._pop_effect_in_place()
+
     def waiting_for(self, game_state: GameState) -> Optional[PID]:
         players = [game_state.get_player1(), game_state.get_player2()]
         for player in players:
@@ -72,6 +72,12 @@ class StartingHandSelectPhase(ph.Phase):
         else:
             raise Exception("Unknown Game State to process")
 
+    def legal_actions(self, game_state: GameState, pid: PID) -> tuple[PlayerAction, ...]:
+        return tuple(
+            CharacterSelectAction(char_id=char.get_id())
+            for char in game_state.get_player(pid).get_characters()
+        )
+
     def __eq__(self, other: object) -> bool:
         return isinstance(other, StartingHandSelectPhase)
 
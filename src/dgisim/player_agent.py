@@ -1,15 +1,22 @@
 from __future__ import annotations
-from typing import TYPE_CHECKING
+from typing import ClassVar, TYPE_CHECKING
 
 from .action.action import PlayerAction
 
 if TYPE_CHECKING:
+    from .history_view import HistoryView
     from .state.enums import PID
-    from .state.game_state import GameState
 
 
 class PlayerAgent:
-    def choose_action(self, history: list[GameState], pid: PID) -> PlayerAction:
+    """
+    NEEDS_HISTORY tells if the agent reads states other than the current one from
+    the history passed in; agents that don't are only given the current state, so
+    the past states of a game need not be kept alive for them.
+    """
+    NEEDS_HISTORY: ClassVar[bool] = True
+
+    def choose_action(self, history: HistoryView, pid: PID) -> PlayerAction:
         return PlayerAction()
 
 
@@ -18,5 +25,5 @@ class PlayerProxyAgent(PlayerAgent):
 
 
 class ProxyAgent(PlayerProxyAgent):
-    def choose_action(self, history: list[GameState], pid: PID) -> PlayerAction:
+    def choose_action(self, history: HistoryView, pid: PID) -> PlayerAction:
         return super().choose_action(history, pid)
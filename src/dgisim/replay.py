@@ -0,0 +1,286 @@
+"""
+Replay files of recorded games.
+
+An action log stores a game as its start and the actions the players took. As
+games are deterministic given the seed of their RNG, replay() re-simulates them,
+fast-forwarding with GameState.auto_step() between actions, so they cost a few
+bytes per action. After a header, the log is the start of the game, which for a
+game that has not started is just its mode, seed and decks (otherwise the full
+encoded state), followed by one record per action: its length as a varint and
+the encoded action. Records are only ever appended.
+
+A state replay is a stream of game states stored as a keyframe (the full encoded
+state, see state/codec.py) followed by deltas (see state/delta.py), each delta
+from the previous state. After a header, each state is one record: its length
+as a varint, then a kind byte (keyframe or delta) and the data.
+"""
+from __future__ import annotations
+from typing import BinaryIO, Iterable, Iterator, Optional, TYPE_CHECKING
+
+from .action.action import PlayerAction
+from .card.cards import Cards
+from .effect.effect_stack import EffectStack
+from .helper.rng import RNG
+from .state.codec import Reader, Writer, check_header, encode_header, get_registry, header_size
+from .state.delta import apply_delta, encode_delta
+from .state.enums import PID
+from .state.game_state import GameState
+from .state.player_state import PlayerState
+
+if TYPE_CHECKING:
+    from .character.character import Character
+    from .game_state_machine import GameStateMachine
+    from .mode import Mode
+
+__all__ = [
+    "ActionLog",
+    "ActionLogWriter",
+    "StateReplayWriter",
+    "read_action_log",
+    "read_state_replay",
+    "replay",
+    "write_action_log",
+]
+
+ACTION_LOG_MAGIC = b"DGA"
+STATE_REPLAY_MAGIC = b"DGR"
+
+# how the start of the game is stored in an action log
+_NEW_GAME = 0
+_FULL_STATE = 1
+
+_KEYFRAME = 0
+_DELTA = 1
+
+
+def _read_uint(stream: BinaryIO) -> Optional[int]:
+    """ reads a varint from stream, None at the end of the stream """
+    n = 0
+    shift = 0
+    while True:
+        byte = stream.read(1)
+        if not byte:
+            if shift:
+                raise Exception("Replay ends in the middle of a record")
+            return None
+        n |= (byte[0] & 0x7f) << shift
+        shift += 7
+        if not byte[0] & 0x80:
+            return n
+
+
+def _read_exactly(stream: BinaryIO, size: int) -> bytes:
+    data = stream.read(size)
+    if len(data) != size:
+        raise Exception("Replay ends in the middle of a record")
+    return data
+
+
+# the characters and deck cards of P1 and P2
+_Decks = tuple[tuple[tuple["type[Character]", ...], Cards], ...]
+
+
+def _new_game(mode: Mode, seed: int, decks: _Decks) -> GameState:
+    """ the game state before a game with decks starts """
+    player1, player2 = (PlayerState.from_deck(mode, chars, cards) for chars, cards in decks)
+    return GameState(
+        mode=mode,
+        phase=mode.card_select_phase(),
+        round=0,
+        active_player_id=PID.P1,
+        player1=player1,
+        player2=player2,
+        effect_stack=EffectStack(()),
+        rng=RNG(seed),
+    )
+
+
+def _decks(game_state: GameState) -> _Decks:
+    return tuple(
+        (
+            tuple(type(char) for char in player.get_characters().get_characters()),
+            player.get_deck_cards(),
+        )
+        for player in (game_state.get_player1(), game_state.get_player2())
+    )
+
+
+class ActionLogWriter:
+    """
+    Appends the actions of a game starting from initial_state to a binary stream.
+
+    The actions should be written as the game goes, in the order the players
+    take them.
+    """
+
+    def __init__(self, stream: BinaryIO, initial_state: GameState) -> None:
+        self._stream = stream
+        self._registry = get_registry()
+        self._num_actions = 0
+        writer = Writer(self._registry)
+        writer.out += encode_header(self._registry, ACTION_LOG_MAGIC)
+        mode = initial_state.get_mode()
+        seed = initial_state.get_rng().seed
+        decks = _decks(initial_state)
+        if _new_game(mode, seed, decks) == initial_state:
+            writer.out.append(_NEW_GAME)
+            writer.cls(type(mode))
+            writer.int(seed)
+            for chars, cards in decks:
+                writer.value(chars)
+                writer.cards(cards)
+        else:
+            writer.out.append(_FULL_STATE)
+            writer.game_state(initial_state)
+        stream.write(writer.out)
+
+    def num_actions(self) -> int:
+        return self._num_actions
+
+    def write(self, action: PlayerAction) -> None:
+        writer = Writer(self._registry)
+        writer.dataclass(action)
+        record = Writer(self._registry)
+        record.uint(len(writer.out))
+        self._stream.write(record.out + writer.out)
+        self._num_actions += 1
+
+
+def write_action_log(stream: BinaryIO, state_machine: GameStateMachine) -> None:
+    """ writes the game played by state_machine so far as an action log """
+    writer = ActionLogWriter(stream, state_machine.get_game_state_at(0))
+    for action in state_machine.get_actions():
+        writer.write(action)
+
+
+class ActionLog:
+    """ a game read from an action log, see replay() """
+
+    def __init__(self, initial_state: GameState, actions: tuple[PlayerAction, ...]) -> None:
+        self._initial_state = initial_state
+        self._actions = actions
+
+    def get_initial_state(self) -> GameState:
+        return self._initial_state
+
+    def get_actions(self) -> tuple[PlayerAction, ...]:
+        return self._actions
+
+    def num_actions(self) -> int:
+        return len(self._actions)
+
+
+def read_action_log(stream: BinaryIO) -> ActionLog:
+    registry = get_registry()
+    check_header(registry, stream.read(header_size(ACTION_LOG_MAGIC)), ACTION_LOG_MAGIC)
+    # the start of the game has no length prefix, so it is read from the rest of the stream
+    data = stream.read()
+    reader = Reader(registry, data, 1)
+    if data[:1] == bytes((_NEW_GAME,)):
+        mode = reader.cls()()
+        seed = reader.int()
+        decks = tuple((reader.value(), reader.cards()) for _ in range(2))
+        initial_state = _new_game(mode, seed, decks)
+    elif data[:1] == bytes((_FULL_STATE,)):
+        initial_state = reader.game_state()
+    else:
+        raise Exception("Action log does not start with a game")
+    actions: list[PlayerAction] = []
+    while reader.remaining():
+        size = reader.uint()
+        end = reader.remaining() - size
+        action = reader.dataclass()
+        if reader.remaining() != end or not isinstance(action, PlayerAction):
+            raise Exception(f"Action record {len(actions)} is corrupted")
+        actions.append(action)
+    return ActionLog(initial_state, tuple(actions))
+
+
+def replay(log: ActionLog, num_actions: Optional[int] = None) -> GameState:
+    """
+    Re-simulates the game of log and returns the game state right after its
+    first num_actions actions (all actions if None), fast-forwarded to the next
+    state waiting for a player action or ending the game.
+
+    Every state in between is built again (only the history is not kept), so
+    seeking to action N costs O(N), about as much as playing the N actions.
+    """
+    actions = log.get_actions()
+    if num_actions is None:
+        num_actions = len(actions)
+    elif not 0 <= num_actions <= len(actions):
+        raise Exception(f"The log has {len(actions)} actions, cannot replay {num_actions}")
+    game_state = log.get_initial_state().auto_step()
+    for i in range(num_actions):
+        pid = game_state.waiting_for()
+        next_state = None if pid is None else game_state.action_step(pid, actions[i])
+        if next_state is None:
+            raise Exception(f"Action {i} cannot be taken in the replayed game")
+        game_state = next_state.auto_step()
+    return game_state
+
+
+class StateReplayWriter:
+    """
+    Writes game states to a binary stream, e.g. a file or a socket to a viewer.
+
+    The first state is written as a keyframe and every following state as the
+    delta from the state written before it; with `keyframe_interval`, every
+    keyframe_interval-th state is written as a keyframe again, so readers can
+    join the stream midway and corrupted data does not spread further.
+    """
+
+    def __init__(self, stream: BinaryIO, keyframe_interval: Optional[int] = None) -> None:
+        if keyframe_interval is not None and keyframe_interval <= 0:
+            raise Exception(f"keyframe_interval should be positive, got {keyframe_interval}")
+        self._stream = stream
+        self._keyframe_interval = keyframe_interval
+        self._registry = get_registry()
+        self._last: Optional[GameState] = None
+        self._num_states = 0
+        stream.write(encode_header(self._registry, STATE_REPLAY_MAGIC))
+
+    def num_states(self) -> int:
+        return self._num_states
+
+    def write(self, game_state: GameState) -> None:
+        writer = Writer(self._registry)
+        if self._last is None or (
+                self._keyframe_interval is not None
+                and self._num_states % self._keyframe_interval == 0
+        ):
+            writer.out.append(_KEYFRAME)
+            writer.game_state(game_state)
+        else:
+            writer.out.append(_DELTA)
+            writer.out += encode_delta(self._last, game_state)
+        record = Writer(self._registry)
+        record.uint(len(writer.out))
+        self._stream.write(record.out + writer.out)
+        self._last = game_state
+        self._num_states += 1
+
+    def write_all(self, game_states: Iterable[GameState]) -> None:
+        for game_state in game_states:
+            self.write(game_state)
+
+
+def read_state_replay(stream: BinaryIO) -> Iterator[GameState]:
+    """ yields the game states of a state replay written by StateReplayWriter """
+    registry = get_registry()
+    check_header(registry, stream.read(header_size(STATE_REPLAY_MAGIC)), STATE_REPLAY_MAGIC)
+    last: Optional[GameState] = None
+    while True:
+        size = _read_uint(stream)
+        if size is None:
+            return
+        record = _read_exactly(stream, size)
+        if record[0] == _KEYFRAME:
+            reader = Reader(registry, record, 1)
+            last = reader.game_state()
+            reader.end()
+        elif record[0] == _DELTA and last is not None:
+            last = apply_delta(last, record[1:])
+        else:
+            raise Exception(f"Unexpected record kind {record[0]}")
+        yield last
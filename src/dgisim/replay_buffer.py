@@ -0,0 +1,243 @@
+"""
+A replay buffer of decision points for offline RL, stored in a memory-mapped
+file so it can grow far beyond RAM and be shared by processes.
+
+The file is a fixed size header followed by `capacity` fixed-width records, one
+per decision point: the observation (ObservationEncoder) and legal mask
+(ActionSpace) of the acting player, the index of the action taken, the acting
+player and the outcome of the game for that player (1 win, -1 loss, 0 draw).
+The records of the game in progress are staged in memory and only copied into
+the file when the game ends, so readers never see games without an outcome.
+Once the buffer is full, the oldest records are overwritten.
+
+Requires numpy (`pip install dgisim[numpy]`).
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Optional, TYPE_CHECKING
+
+import numpy as np
+
+from .action.action import PlayerAction
+from .action.action_space import ActionSpace
+from .encoding import ObservationEncoder
+from .state.enums import PID
+from .state.game_state import GameState
+
+if TYPE_CHECKING:
+    from .game_state_machine import GameStateMachine
+
+__all__ = [
+    "Batch",
+    "ReplayBuffer",
+]
+
+_MAGIC = b"DGRB"
+_VERSION = 1
+
+_HEADER_DTYPE = np.dtype([
+    ("magic", "S4"),
+    ("version", "<u4"),
+    ("observation_size", "<u4"),
+    ("num_actions", "<u4"),
+    ("capacity", "<u8"),
+    ("num_written", "<u8"),
+])
+# records start at this offset of the file
+_HEADER_SIZE = 64
+
+
+def _record_dtype(observation_size: int, num_actions: int) -> np.dtype:
+    return np.dtype([
+        ("observation", "<f4", (observation_size,)),
+        ("mask", "?", (num_actions,)),
+        ("action", "<i4"),
+        ("pid", "i1"),
+        ("outcome", "<f4"),
+    ])
+
+
+@dataclass(frozen=True)
+class Batch:
+    """
+    Sampled records, row i is record `indices[i]`
+
+    - `observations`: (B, F) float32
+    - `masks`: (B, A) bool
+    - `actions`: (B,) int32
+    - `pids`: (B,) int8, the PID value of the acting player
+    - `outcomes`: (B,) float32
+    - `indices`: (B,) intp, for ReplayBuffer.update_priorities()
+    - `weights`: (B,) float32, importance sampling weights, all 1 for uniform
+      sampling
+    """
+    observations: np.ndarray
+    masks: np.ndarray
+    actions: np.ndarray
+    pids: np.ndarray
+    outcomes: np.ndarray
+    indices: np.ndarray
+    weights: np.ndarray
+
+
+class ReplayBuffer:
+    """
+    Decision points of played games in the memory-mapped file at path.
+
+    With capacity, a new buffer file is created (replacing any file at path),
+    otherwise the existing file is opened. Games are fed with
+    `state_machine.add_action_hook(buffer.on_action)` and completed with
+    `end_game()` once they end, `record()` does both for a state machine.
+
+    Priorities for prioritized sampling are kept in memory; records start with
+    the highest priority seen so far.
+    """
+
+    def __init__(
+            self,
+            path: str,
+            encoder: ObservationEncoder,
+            action_space: ActionSpace,
+            capacity: Optional[int] = None,
+            alpha: float = 0.6,
+            seed: Optional[int] = None,
+    ) -> None:
+        self._encoder = encoder
+        self._action_space = action_space
+        self._alpha = alpha
+        self._rng = np.random.default_rng(seed)
+        if capacity is not None:
+            if capacity <= 0:
+                raise Exception(f"capacity should be positive, got {capacity}")
+            self._header = np.memmap(path, dtype=_HEADER_DTYPE, mode="w+", shape=(1,))
+            self._header[0] = (_MAGIC, _VERSION, encoder.size(), action_space.size(), capacity, 0)
+        else:
+            self._header = np.memmap(path, dtype=_HEADER_DTYPE, mode="r+", shape=(1,))
+            header = self._header[0]
+            if header["magic"] != _MAGIC or header["version"] != _VERSION:
+                raise Exception(f"{path} is not a replay buffer of version {_VERSION}")
+            if (header["observation_size"], header["num_actions"]) \
+                    != (encoder.size(), action_space.size()):
+                raise Exception(f"{path} was written with a different encoder or action space")
+            capacity = int(header["capacity"])
+        self._capacity = capacity
+        self._records = np.memmap(
+            path,
+            dtype=_record_dtype(encoder.size(), action_space.size()),
+            mode="r+",
+            offset=_HEADER_SIZE,
+            shape=(capacity,),
+        )
+        self._priorities = np.zeros(capacity, dtype=np.float64)
+        self._priorities[:len(self)] = 1.0
+        self._max_priority = 1.0
+        # records of the decision points of the game in progress, the first
+        # _num_staged rows are used
+        self._staged = np.zeros(16, dtype=self._records.dtype)
+        self._num_staged = 0
+
+    def capacity(self) -> int:
+        return self._capacity
+
+    def num_written(self) -> int:
+        """ the number of records written since the buffer was created """
+        return int(self._header["num_written"][0])
+
+    def __len__(self) -> int:
+        return min(self.num_written(), self._capacity)
+
+    def on_action(self, game_state: GameState, pid: PID, action: PlayerAction) -> None:
+        """
+        GameStateMachine action hook recording the decision point, actions that
+        are not covered by the action space are skipped
+        """
+        index = self._action_space.encode(action)
+        if index is None:
+            return
+        if self._num_staged >= self._capacity:
+            raise Exception(f"A game has more decision points than the capacity {self._capacity}")
+        if self._num_staged == len(self._staged):
+            self._staged = np.resize(self._staged, 2 * len(self._staged))
+        row = self._num_staged
+        staged = self._staged
+        self._encoder.encode(game_state, pid, out=staged["observation"][row])
+        staged["mask"][row] = self._action_space.mask(game_state, pid)
+        staged["action"][row] = index
+        staged["pid"][row] = pid.value
+        staged["outcome"][row] = 0.0
+        self._num_staged += 1
+
+    def end_game(self, winner: Optional[PID]) -> None:
+        """ sets the outcomes of the game in progress and adds it to the buffer """
+        num = self._num_staged
+        if num:
+            staged = self._staged[:num]
+            if winner is not None:
+                staged["outcome"] = np.where(staged["pid"] == winner.value, 1.0, -1.0)
+            slots = (self.num_written() + np.arange(num, dtype=np.intp)) % self._capacity
+            self._records[slots] = staged
+            self._priorities[slots] = self._max_priority
+            self._header["num_written"][0] += num
+        self._num_staged = 0
+
+    def abort_game(self) -> None:
+        """ drops the decision points of the game in progress """
+        self._num_staged = 0
+
+    def record(self, state_machine: GameStateMachine) -> None:
+        """ plays the game of state_machine to the end and adds it to the buffer """
+        self.abort_game()
+        state_machine.add_action_hook(self.on_action)
+        try:
+            while not state_machine.game_end():
+                state_machine.player_step(fast=True)
+        finally:
+            state_machine.remove_action_hook(self.on_action)
+        self.end_game(state_machine.get_winner())
+
+    def flush(self) -> None:
+        """ writes the changes back to the file """
+        self._records.flush()
+        self._header.flush()
+
+    def _batch(self, indices: np.ndarray, weights: np.ndarray) -> Batch:
+        records = self._records[indices]
+        return Batch(
+            observations=records["observation"],
+            masks=records["mask"],
+            actions=records["action"],
+            pids=records["pid"],
+            outcomes=records["outcome"],
+            indices=indices,
+            weights=weights,
+        )
+
+    def sample(self, batch_size: int) -> Batch:
+        """ uniformly samples batch_size records, with replacement """
+        size = len(self)
+        if size == 0:
+            raise Exception("Cannot sample from an empty replay buffer")
+        indices = self._rng.integers(size, size=batch_size).astype(np.intp)
+        return self._batch(indices, np.ones(batch_size, dtype=np.float32))
+
+    def sample_prioritized(self, batch_size: int, beta: float = 0.4) -> Batch:
+        """
+        samples batch_size records with probabilities proportional to
+        priority ** alpha, with replacement; weights are the importance sampling
+        weights (size * probability) ** -beta, normalized by their maximum
+        """
+        size = len(self)
+        if size == 0:
+            raise Exception("Cannot sample from an empty replay buffer")
+        scaled = self._priorities[:size] ** self._alpha
+        probabilities = scaled / scaled.sum()
+        indices = self._rng.choice(size, size=batch_size, p=probabilities).astype(np.intp)
+        weights = (size * probabilities[indices]) ** -beta
+        return self._batch(indices, (weights / weights.max()).astype(np.float32))
+
+    def update_priorities(self, indices: np.ndarray, priorities: np.ndarray) -> None:
+        """ sets the priorities of the records at indices, e.g. to their TD errors """
+        priorities = np.maximum(np.abs(priorities), 1e-6)
+        self._priorities[indices] = priorities
+        self._max_priority = max(self._max_priority, float(priorities.max()))
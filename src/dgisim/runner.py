@@ -0,0 +1,159 @@
+"""
+Batch self-play of many games across a pool of worker processes.
+
+Each worker receives the factories once (on initialisation) and afterwards only
+small chunks of integer game ids, so no GameState is pickled per game.
+"""
+from __future__ import annotations
+
+import multiprocessing as mp
+import time
+from dataclasses import dataclass
+from typing import Callable, Iterator, Optional
+
+from .game_state_machine import GameStateMachine, HistoryPolicy
+from .helper.rng import RNG
+from .player_agent import PlayerAgent
+from .state.enums import PID
+from .state.game_state import GameState
+
+__all__ = [
+    "GameResult",
+    "agent_seed",
+    "game_seed",
+    "play_game",
+    "run_games",
+]
+
+GameStateFactory = Callable[[], GameState]
+# called with the keyword argument `seed`, like the constructors of the agents
+AgentFactory = Callable[..., PlayerAgent]
+
+
+@dataclass(frozen=True)
+class GameResult:
+    game_id: int
+    seed: int
+    winner: Optional[PID]
+    rounds: int
+    num_actions: int
+    wall_time: float
+
+
+def game_seed(base_seed: int, game_id: int) -> int:
+    """ the seed of a game only depends on the base seed and the id of the game """
+    return (base_seed * 0x9e3779b1 + game_id) & 0xffffffff
+
+
+def agent_seed(seed: int, pid: PID) -> int:
+    """ the seed of the agent of pid in the game with seed """
+    return game_seed(seed, pid.value)
+
+
+def play_game(
+        game_state_factory: GameStateFactory,
+        agent1_factory: AgentFactory,
+        agent2_factory: AgentFactory,
+        game_id: int = 0,
+        seed: int = 0,
+) -> GameResult:
+    """
+    plays a single game to its end in the current process
+
+    `seed` seeds the game state, and the agents are created with the seeds
+    `agent_seed(seed, pid)`
+    """
+    start = time.perf_counter()
+    game_state = game_state_factory().factory().rng(RNG(seed)).build()
+    state_machine = GameStateMachine(
+        game_state,
+        agent1_factory(seed=agent_seed(seed, PID.P1)),
+        agent2_factory(seed=agent_seed(seed, PID.P2)),
+        history_policy=HistoryPolicy.NONE,
+    )
+    while not state_machine.game_end():
+        state_machine.player_step(fast=True)
+    wall_time = time.perf_counter() - start
+    game_state = state_machine.get_game_state()
+    return GameResult(
+        game_id=game_id,
+        seed=seed,
+        winner=game_state.get_winner(),
+        rounds=game_state.get_round(),
+        num_actions=state_machine.num_actions(),
+        wall_time=wall_time,
+    )
+
+
+# per worker process configuration, set by _init_worker()
+_worker_config: Optional[tuple[GameStateFactory, AgentFactory, AgentFactory, int]] = None
+
+
+def _init_worker(
+        game_state_factory: GameStateFactory,
+        agent1_factory: AgentFactory,
+        agent2_factory: AgentFactory,
+        base_seed: int,
+) -> None:
+    global _worker_config
+    _worker_config = (game_state_factory, agent1_factory, agent2_factory, base_seed)
+
+
+def _worker_play(game_id: int) -> GameResult:
+    assert _worker_config is not None, "worker is not initialised"
+    game_state_factory, agent1_factory, agent2_factory, base_seed = _worker_config
+    return play_game(
+        game_state_factory,
+        agent1_factory,
+        agent2_factory,
+        game_id=game_id,
+        seed=game_seed(base_seed, game_id),
+    )
+
+
+def run_games(
+        game_state_factory: GameStateFactory,
+        agent1_factory: AgentFactory,
+        agent2_factory: AgentFactory,
+        num_games: int,
+        num_workers: Optional[int] = None,
+        seed: int = 0,
+        chunk_size: Optional[int] = None,
+        ordered: bool = False,
+) -> Iterator[GameResult]:
+    """
+    Plays `num_games` games and yields the GameResult of each game as soon as it is done.
+
+    - agent factories are called with the keyword argument `seed`
+    - factories must be picklable (e.g. module level functions or classes) when
+      `num_workers` is greater than 1
+    - `num_workers` defaults to the number of cores; 1 plays all games in this process
+    - game i is always played with seed `game_seed(seed, i)`, so results are reproducible
+      regardless of the number of workers or the order of completion
+    - `ordered` yields results in the order of game ids instead of completion order
+    """
+    if num_games <= 0:
+        return
+    if num_workers is None:
+        num_workers = mp.cpu_count()
+    num_workers = max(1, min(num_workers, num_games))
+    if num_workers == 1:
+        for game_id in range(num_games):
+            yield play_game(
+                game_state_factory,
+                agent1_factory,
+                agent2_factory,
+                game_id=game_id,
+                seed=game_seed(seed, game_id),
+            )
+        return
+    if chunk_size is None:
+        # a few chunks per worker balances load while keeping IPC overhead low
+        chunk_size = max(1, num_games // (num_workers * 4))
+    with mp.Pool(
+        processes=num_workers,
+        initializer=_init_worker,
+        initargs=(game_state_factory, agent1_factory, agent2_factory, seed),
+    ) as pool:
+        imap = pool.imap if ordered else pool.imap_unordered
+        yield from imap(_worker_play, range(num_games), chunksize=chunk_size)
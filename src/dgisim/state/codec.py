@@ -0,0 +1,539 @@
+"""
+Compact, versioned binary encoding of game states, without pickle.
+
+An encoded GameState is `MAGIC | FORMAT_VERSION (1 byte) | registry fingerprint
+(4 bytes) | body`. The body lays out the fields of the state and its players
+in a fixed order. Cards, characters, statuses, summons, supports, effects,
+phases, modes and enums are written as their id in the registry of classes.
+Integers are zigzag varints, so counters like HP, usages or dice counts take a
+single byte. Fields of statuses and effects, whose types vary, are written as
+tagged values.
+
+The registry holds the classes defined in the modules of the game, ordered by
+their qualified names, so ids are the same in every process running the same
+code. The fingerprint (of the registered names, dataclass fields and enum
+members) rejects data encoded by code with a different registry.
+"""
+from __future__ import annotations
+import dataclasses
+import importlib
+import zlib
+from enum import Enum
+from typing import Any, Callable, Optional, TYPE_CHECKING, cast
+
+if TYPE_CHECKING:
+    from ..card.cards import Cards
+    from ..character.character import Character
+    from ..character.characters import Characters
+    from ..dices import ActualDices, Dices
+    from ..effect.effect_stack import EffectStack
+    from ..element.element import ElementalAura
+    from ..status.statuses import Statuses
+    from .game_state import GameState
+    from .player_state import PlayerState
+
+__all__ = [
+    "FORMAT_VERSION",
+    "MAGIC",
+    "Reader",
+    "Registry",
+    "Writer",
+    "check_header",
+    "decode_game_state",
+    "encode_game_state",
+    "encode_header",
+    "get_registry",
+    "header_size",
+]
+
+MAGIC = b"DGS"
+FORMAT_VERSION = 2
+
+_PACKAGE = __name__.rsplit(".", 2)[0]
+
+# modules (relative to the package) whose classes are registered
+_MODULES = (
+    "action.action",
+    "card.card",
+    "card.cards",
+    "character.character",
+    "character.character_skill_enum",
+    "dices",
+    "effect.effect",
+    "effect.enums",
+    "effect.structs",
+    "element.element",
+    "event.event",
+    "mode",
+    "phase.action_phase",
+    "phase.card_select_phase",
+    "phase.end_phase",
+    "phase.game_end_phase",
+    "phase.roll_phase",
+    "phase.starting_hand_select_phase",
+    "state.enums",
+    "status.enums",
+    "status.status",
+    "status.statuses",
+    "summon.summon",
+    "support.support",
+)
+
+# tags of values
+_NONE = 0
+_FALSE = 1
+_TRUE = 2
+_INT = 3
+_STR = 4
+_TUPLE = 5
+_CLASS = 6
+_ENUM = 7
+_DATACLASS = 8
+_DICES = 9
+_CARDS = 10
+
+
+class Registry:
+    """ the classes the codec can encode, see the module docstring """
+
+    def __init__(self) -> None:
+        classes: dict[str, type] = {}
+        for module_name in _MODULES:
+            module = importlib.import_module(f"{_PACKAGE}.{module_name}")
+            for cls in vars(module).values():
+                if isinstance(cls, type) and cls.__module__ == module.__name__:
+                    classes[f"{module_name}.{cls.__qualname__}"] = cls
+        self.names = sorted(classes)
+        self.classes: list[type] = [classes[name] for name in self.names]
+        self.ids: dict[type, int] = dict(
+            (cls, i) for i, cls in enumerate(self.classes)
+        )
+        self.fields: dict[type, tuple[str, ...]] = dict(
+            (cls, tuple(field.name for field in dataclasses.fields(cls)))
+            for cls in self.classes
+            if dataclasses.is_dataclass(cls)
+        )
+        self.members: dict[type, tuple[Enum, ...]] = dict(
+            (cls, tuple(cls))  # type: ignore
+            for cls in self.classes
+            if issubclass(cls, Enum)
+        )
+        self.member_ids: dict[Enum, int] = dict(
+            (member, i)
+            for members in self.members.values()
+            for i, member in enumerate(members)
+        )
+        signature = "\n".join(
+            f"{name}{self.fields.get(cls, ())}{[m.name for m in self.members.get(cls, ())]}"
+            for name, cls in zip(self.names, self.classes)
+        )
+        self.fingerprint = zlib.crc32(signature.encode())
+
+    def id_of(self, cls: type) -> int:
+        cls_id = self.ids.get(cls)
+        if cls_id is None:
+            raise Exception(f"{cls.__qualname__} is not registered in the codec")
+        return cls_id
+
+
+_registry: Optional[Registry] = None
+
+
+def get_registry() -> Registry:
+    """ the registry of this process, created on first use """
+    global _registry
+    if _registry is None:
+        _registry = Registry()
+    return _registry
+
+
+############################## Encoding ##############################
+
+class Writer:
+    """
+    Appends encoded values to `out`; formats built on the codec (deltas, replays)
+    extend it or use it to encode their records.
+    """
+
+    def __init__(self, registry: Registry) -> None:
+        self._registry = registry
+        self.out = bytearray()
+
+    def uint(self, n: int) -> None:
+        out = self.out
+        while n > 0x7f:
+            out.append((n & 0x7f) | 0x80)
+            n >>= 7
+        out.append(n)
+
+    def int(self, n: int) -> None:
+        self.uint(n << 1 if n >= 0 else (-n << 1) - 1)
+
+    def cls(self, cls: type) -> None:
+        self.uint(self._registry.id_of(cls))
+
+    def enum(self, member: Enum) -> None:
+        self.uint(self._registry.member_ids[member])
+
+    def value(self, value: Any) -> None:
+        out = self.out
+        if value is None:
+            out.append(_NONE)
+        elif value is False:
+            out.append(_FALSE)
+        elif value is True:
+            out.append(_TRUE)
+        elif type(value) is int:
+            out.append(_INT)
+            self.int(value)
+        elif isinstance(value, Enum):
+            out.append(_ENUM)
+            self.cls(type(value))
+            self.enum(value)
+        elif isinstance(value, type):
+            out.append(_CLASS)
+            self.cls(value)
+        elif type(value) in self._registry.fields:
+            out.append(_DATACLASS)
+            self.dataclass(value)
+        elif isinstance(value, tuple):
+            out.append(_TUPLE)
+            self.uint(len(value))
+            for item in value:
+                self.value(item)
+        elif isinstance(value, str):
+            out.append(_STR)
+            data = value.encode()
+            self.uint(len(data))
+            out += data
+        else:
+            from ..card.cards import Cards
+            from ..dices import Dices
+            if isinstance(value, Dices):
+                out.append(_DICES)
+                self.dices(value)
+            elif isinstance(value, Cards):
+                out.append(_CARDS)
+                self.cards(value)
+            else:
+                raise Exception(f"Cannot encode {value!r} of type {type(value).__name__}")
+
+    def dataclass(self, obj: Any) -> None:
+        cls = type(obj)
+        self.cls(cls)
+        for name in self._registry.fields[cls]:
+            self.value(getattr(obj, name))
+
+    def dices(self, dices: Dices) -> None:
+        self.cls(type(dices))
+        counts = dices.to_dict()
+        self.uint(len(counts))
+        for elem, num in counts.items():
+            self.enum(elem)
+            self.int(num)
+
+    def cards(self, cards: Cards) -> None:
+        counts = cards.to_dict()
+        self.uint(len(counts))
+        for card, num in counts.items():
+            self.cls(card)
+            self.int(num)
+
+    def statuses(self, statuses: Statuses) -> None:
+        self.cls(type(statuses))
+        self.status_seq(statuses.get_statuses())
+
+    def status_seq(self, statuses: tuple) -> None:
+        self.uint(len(statuses))
+        for status in statuses:
+            self.dataclass(status)
+
+    def aura(self, aura: ElementalAura) -> None:
+        items = aura._aura.items()
+        self.uint(len(items))
+        for elem, applied in items:
+            self.uint(self._registry.member_ids[elem] << 1 | applied)
+
+    def character(self, char: Character) -> None:
+        self.cls(type(char))
+        self.int(char.get_id())
+        self.int(char.get_hp())
+        self.int(char.get_max_hp())
+        self.int(char.get_energy())
+        self.int(char.get_max_energy())
+        self.statuses(char.get_talent_statuses())
+        self.statuses(char.get_equipment_statuses())
+        self.statuses(char.get_character_statuses())
+        self.aura(char.get_elemental_aura())
+
+    def characters(self, chars: Characters) -> None:
+        self.value(chars.get_active_character_id())
+        characters = chars.get_characters()
+        self.uint(len(characters))
+        for char in characters:
+            self.character(char)
+
+    def player(self, player: PlayerState) -> None:
+        self.enum(player.get_phase())
+        self.int(player.get_card_redraw_chances())
+        self.characters(player.get_characters())
+        self.statuses(player.get_combat_statuses())
+        summons = player.get_summons()
+        self.uint(summons._max_num)
+        self.status_seq(summons.get_summons())
+        supports = player.get_supports()
+        self.uint(supports._max_num)
+        self.status_seq(supports.get_supports())
+        self.dices(player.get_dices())
+        self.cards(player.get_hand_cards())
+        self.cards(player.get_deck_cards())
+        self.cards(player.get_publicly_used_cards())
+
+    def effect_stack(self, effect_stack: EffectStack) -> None:
+        effects = effect_stack._effects
+        self.uint(len(effects))
+        for effect in effects:
+            self.dataclass(effect)
+
+    def game_state(self, game_state: GameState) -> None:
+        self.cls(type(game_state.get_mode()))
+        self.cls(type(game_state.get_phase()))
+        self.int(game_state.get_round())
+        self.enum(game_state.get_active_player_id())
+        self.player(game_state.get_player1())
+        self.player(game_state.get_player2())
+        self.effect_stack(game_state.get_effect_stack())
+        rng = game_state.get_rng()
+        self.int(rng.seed)
+        self.uint(rng.counter)
+
+
+def header_size(magic: bytes = MAGIC) -> int:
+    return len(magic) + 5
+
+
+def encode_header(registry: Registry, magic: bytes = MAGIC) -> bytes:
+    """ magic, the format version and the registry fingerprint """
+    return magic + bytes((FORMAT_VERSION,)) + registry.fingerprint.to_bytes(4, "little")
+
+
+def encode_game_state(game_state: GameState) -> bytes:
+    registry = get_registry()
+    writer = Writer(registry)
+    writer.out += encode_header(registry)
+    writer.game_state(game_state)
+    return bytes(writer.out)
+
+
+############################## Decoding ##############################
+
+class Reader:
+    """ reads the values written by Writer from data, starting at pos """
+
+    def __init__(self, registry: Registry, data: bytes, pos: int) -> None:
+        self._registry = registry
+        self._data = data
+        self._pos = pos
+        self._value_readers: dict[int, Callable[[], Any]] = {
+            _NONE: lambda: None,
+            _FALSE: lambda: False,
+            _TRUE: lambda: True,
+            _INT: self.int,
+            _STR: self._str,
+            _TUPLE: lambda: tuple(self.value() for _ in range(self.uint())),
+            _CLASS: self.cls,
+            _ENUM: self._enum,
+            _DATACLASS: self.dataclass,
+            _DICES: self.dices,
+            _CARDS: self.cards,
+        }
+
+    def remaining(self) -> int:
+        return len(self._data) - self._pos
+
+    def end(self) -> None:
+        if self._pos != len(self._data):
+            raise Exception(f"{len(self._data) - self._pos} trailing bytes after the encoded data")
+
+    def uint(self) -> int:
+        data = self._data
+        byte = data[self._pos]
+        self._pos += 1
+        n = byte & 0x7f
+        shift = 7
+        while byte & 0x80:
+            byte = data[self._pos]
+            self._pos += 1
+            n |= (byte & 0x7f) << shift
+            shift += 7
+        return n
+
+    def int(self) -> int:
+        n = self.uint()
+        return n >> 1 if not n & 1 else -((n + 1) >> 1)
+
+    def cls(self) -> Any:
+        return self._registry.classes[self.uint()]
+
+    def enum_of(self, enum_cls: type) -> Any:
+        return self._registry.members[enum_cls][self.uint()]
+
+    def _enum(self) -> Enum:
+        return self.enum_of(self.cls())
+
+    def _str(self) -> str:
+        size = self.uint()
+        data = self._data[self._pos:self._pos + size]
+        self._pos += size
+        return data.decode()
+
+    def value(self) -> Any:
+        tag = self._data[self._pos]
+        self._pos += 1
+        reader = self._value_readers.get(tag)
+        if reader is None:
+            raise Exception(f"Unknown value tag {tag} at byte {self._pos - 1}")
+        return reader()
+
+    def dataclass(self) -> Any:
+        cls = self.cls()
+        return cls(**dict(
+            (name, self.value())
+            for name in self._registry.fields[cls]
+        ))
+
+    def dices(self) -> Dices:
+        from ..element.element import Element
+        cls = self.cls()
+        return cls(dict(
+            (self.enum_of(Element), self.int())
+            for _ in range(self.uint())
+        ))
+
+    def actual_dices(self) -> ActualDices:
+        """ the dices of a player """
+        from ..dices import ActualDices
+        dices = self.dices()
+        if not isinstance(dices, ActualDices):
+            raise Exception(f"Expected ActualDices, got {type(dices).__name__}")
+        return dices
+
+    def cards(self) -> Cards:
+        from ..card.cards import Cards
+        return Cards(dict(
+            (self.cls(), self.int())
+            for _ in range(self.uint())
+        ))
+
+    def statuses(self) -> Statuses:
+        cls = self.cls()
+        return cls(self.status_seq())
+
+    def status_seq(self) -> tuple:
+        return tuple(self.dataclass() for _ in range(self.uint()))
+
+    def aura(self) -> ElementalAura:
+        from ..element.element import Element, ElementalAura
+        members = cast("tuple[Element, ...]", self._registry.members[Element])
+        aura: dict[Element, bool] = {}
+        for _ in range(self.uint()):
+            n = self.uint()
+            aura[members[n >> 1]] = bool(n & 1)
+        return ElementalAura(aura)
+
+    def character(self) -> Character:
+        cls = self.cls()
+        return cls(
+            id=self.int(),
+            hp=self.int(),
+            max_hp=self.int(),
+            energy=self.int(),
+            max_energy=self.int(),
+            talents=self.statuses(),
+            equipments=self.statuses(),
+            statuses=self.statuses(),
+            elemental_aura=self.aura(),
+        )
+
+    def characters(self) -> Characters:
+        from ..character.characters import Characters
+        active_character_id = self.value()
+        return Characters(
+            tuple(self.character() for _ in range(self.uint())),
+            active_character_id,
+        )
+
+    def player(self) -> PlayerState:
+        from ..summon.summons import Summons
+        from ..support.supports import Supports
+        from .enums import ACT
+        from .player_state import PlayerState
+        phase = self.enum_of(ACT)
+        card_redraw_chances = self.int()
+        characters = self.characters()
+        combat_statuses = self.statuses()
+        summons_max_num = self.uint()
+        summons = Summons(self.status_seq(), summons_max_num)
+        supports_max_num = self.uint()
+        supports = Supports(self.status_seq(), supports_max_num)
+        return PlayerState(
+            phase=phase,
+            card_redraw_chances=card_redraw_chances,
+            characters=characters,
+            combat_statuses=combat_statuses,
+            summons=summons,
+            supports=supports,
+            dices=self.actual_dices(),
+            hand_cards=self.cards(),
+            deck_cards=self.cards(),
+            publicly_used_cards=self.cards(),
+        )
+
+    def effect_stack(self) -> EffectStack:
+        from ..effect.effect_stack import EffectStack
+        return EffectStack(tuple(self.dataclass() for _ in range(self.uint())))
+
+    def game_state(self) -> GameState:
+        from ..helper.rng import RNG
+        from .enums import PID
+        from .game_state import GameState
+        mode = self.cls()()
+        phase = self.cls()()
+        round = self.int()
+        active_player_id = self.enum_of(PID)
+        player1 = self.player()
+        player2 = self.player()
+        effect_stack = self.effect_stack()
+        rng = RNG(seed=self.int(), counter=self.uint())
+        return GameState(
+            mode=mode,
+            phase=phase,
+            round=round,
+            active_player_id=active_player_id,
+            player1=player1,
+            player2=player2,
+            effect_stack=effect_stack,
+            rng=rng,
+        )
+
+
+def check_header(registry: Registry, header: bytes, magic: bytes = MAGIC) -> int:
+    """ checks the header at the start of header and returns its size """
+    size = header_size(magic)
+    if len(header) < size or header[:len(magic)] != magic:
+        raise Exception(f"Data does not start with {magic!r}")
+    version = header[len(magic)]
+    if version != FORMAT_VERSION:
+        raise Exception(f"Unsupported format version {version}, expected {FORMAT_VERSION}")
+    fingerprint = int.from_bytes(header[len(magic) + 1:size], "little")
+    if fingerprint != registry.fingerprint:
+        raise Exception("Data was encoded with a different registry of classes")
+    return size
+
+
+def decode_game_state(data: bytes) -> GameState:
+    registry = get_registry()
+    reader = Reader(registry, data, check_header(registry, data))
+    game_state = reader.game_state()
+    reader.end()
+    return game_state
@@ -0,0 +1,413 @@
+"""
+Deltas between game states, on top of the binary codec (see state/codec.py).
+
+A delta only holds what changed from a base state to a target state, field by
+field: a bit mask of the changed fields of GameState, PlayerState and Character
+is followed by the changes of each changed field.
+
+- Characters: the changed characters, by position (in full if the characters
+  themselves differ)
+- Statuses, summons and supports: the changed statuses, by position (in full if
+  statuses are added or removed)
+- Cards: the non-zero differences of counts
+- EffectStack: the number of effects popped down to the part shared with the
+  base, then the effects pushed on top
+- everything else: the new value in full
+
+Applying a delta re-uses all unchanged sub-objects of the base, so the result
+shares structure with the base just as consecutive states of a game do.
+
+Deltas carry no header and are only valid with the same registry of classes.
+"""
+from __future__ import annotations
+from typing import Any, Callable, Sequence, TypeVar, TYPE_CHECKING
+
+from .codec import Reader, Writer, get_registry
+
+if TYPE_CHECKING:
+    from ..card.cards import Cards
+    from ..character.character import Character
+    from ..character.characters import Characters
+    from ..effect.effect_stack import EffectStack
+    from ..status.statuses import Statuses
+    from ..summon.summons import Summons
+    from ..support.supports import Supports
+    from .game_state import GameState
+    from .player_state import PlayerState
+
+__all__ = [
+    "apply_delta",
+    "encode_delta",
+]
+
+_T = TypeVar("_T")
+
+
+def _mask(pairs: Sequence[tuple[Any, Any]]) -> int:
+    """ bit i is set if the i-th pair differs """
+    mask = 0
+    for i, (old, new) in enumerate(pairs):
+        if old is not new and old != new:
+            mask |= 1 << i
+    return mask
+
+
+def _game_state_fields(game_state: GameState) -> tuple:
+    return (
+        game_state.get_mode(),
+        game_state.get_phase(),
+        game_state.get_round(),
+        game_state.get_active_player_id(),
+        game_state.get_player1(),
+        game_state.get_player2(),
+        game_state.get_effect_stack(),
+        game_state.get_rng(),
+    )
+
+
+def _player_fields(player: PlayerState) -> tuple:
+    return (
+        player.get_phase(),
+        player.get_card_redraw_chances(),
+        player.get_characters(),
+        player.get_combat_statuses(),
+        player.get_summons(),
+        player.get_supports(),
+        player.get_dices(),
+        player.get_hand_cards(),
+        player.get_deck_cards(),
+        player.get_publicly_used_cards(),
+    )
+
+
+def _character_fields(char: Character) -> tuple:
+    return (
+        char.get_hp(),
+        char.get_max_hp(),
+        char.get_energy(),
+        char.get_max_energy(),
+        char.get_talent_statuses(),
+        char.get_equipment_statuses(),
+        char.get_character_statuses(),
+        char.get_elemental_aura(),
+    )
+
+
+############################## Encoding ##############################
+
+class _DeltaWriter(Writer):
+    def _fields(
+            self,
+            old_fields: tuple,
+            new_fields: tuple,
+            writers: tuple[Callable[[Any, Any], None], ...],
+    ) -> None:
+        mask = _mask(tuple(zip(old_fields, new_fields)))
+        self.uint(mask)
+        for i, write in enumerate(writers):
+            if mask >> i & 1:
+                write(old_fields[i], new_fields[i])
+
+    def _seq(
+            self,
+            old_seq: tuple,
+            new_seq: tuple,
+            write_full: Callable[[], None],
+            full: bool = False,
+    ) -> None:
+        """ changed positions if only items changed, otherwise in full """
+        if full or len(old_seq) != len(new_seq):
+            self.uint(1)
+            write_full()
+            return
+        mask = _mask(tuple(zip(old_seq, new_seq)))
+        self.uint(mask << 1)
+        for i, item in enumerate(new_seq):
+            if mask >> i & 1:
+                self.dataclass(item)
+
+    def statuses_delta(self, old: Statuses, new: Statuses) -> None:
+        self._seq(
+            old.get_statuses(),
+            new.get_statuses(),
+            lambda: self.statuses(new),
+            full=type(old) is not type(new),
+        )
+
+    def cards_delta(self, old: Cards, new: Cards) -> None:
+        self.cards(new - old)
+
+    def character_delta(self, old: Character, new: Character) -> None:
+        self._fields(_character_fields(old), _character_fields(new), (
+            lambda _, hp: self.int(hp),
+            lambda _, max_hp: self.int(max_hp),
+            lambda _, energy: self.int(energy),
+            lambda _, max_energy: self.int(max_energy),
+            self.statuses_delta,
+            self.statuses_delta,
+            self.statuses_delta,
+            lambda _, aura: self.aura(aura),
+        ))
+
+    def characters_delta(self, old: Characters, new: Characters) -> None:
+        self.value(new.get_active_character_id())
+        old_chars = old.get_characters()
+        new_chars = new.get_characters()
+        if len(old_chars) != len(new_chars) or any(
+                type(old_char) is not type(new_char) or old_char.get_id() != new_char.get_id()
+                for old_char, new_char in zip(old_chars, new_chars)
+        ):
+            self.uint(1)
+            self.uint(len(new_chars))
+            for char in new_chars:
+                self.character(char)
+            return
+        mask = _mask(tuple(zip(old_chars, new_chars)))
+        self.uint(mask << 1)
+        for i, (old_char, new_char) in enumerate(zip(old_chars, new_chars)):
+            if mask >> i & 1:
+                self.character_delta(old_char, new_char)
+
+    def _limited_seq_delta(self, old_max: int, old_seq: tuple, new_max: int, new_seq: tuple) -> None:
+        """ delta of summons or supports """
+        def write_full() -> None:
+            self.uint(new_max)
+            self.status_seq(new_seq)
+
+        self._seq(old_seq, new_seq, write_full, full=old_max != new_max)
+
+    def player_delta(self, old: PlayerState, new: PlayerState) -> None:
+        def summons_delta(old_summons: Summons, new_summons: Summons) -> None:
+            self._limited_seq_delta(
+                old_summons._max_num, old_summons.get_summons(),
+                new_summons._max_num, new_summons.get_summons(),
+            )
+
+        def supports_delta(old_supports: Supports, new_supports: Supports) -> None:
+            self._limited_seq_delta(
+                old_supports._max_num, old_supports.get_supports(),
+                new_supports._max_num, new_supports.get_supports(),
+            )
+
+        self._fields(_player_fields(old), _player_fields(new), (
+            lambda _, phase: self.enum(phase),
+            lambda _, chances: self.int(chances),
+            self.characters_delta,
+            self.statuses_delta,
+            summons_delta,
+            supports_delta,
+            lambda _, dices: self.dices(dices),
+            self.cards_delta,
+            self.cards_delta,
+            self.cards_delta,
+        ))
+
+    def effect_stack_delta(self, old: EffectStack, new: EffectStack) -> None:
+        old_effects = old._effects
+        new_effects = new._effects
+        shared = 0
+        for old_effect, new_effect in zip(old_effects, new_effects):
+            if old_effect is not new_effect and old_effect != new_effect:
+                break
+            shared += 1
+        self.uint(len(old_effects) - shared)
+        self.uint(len(new_effects) - shared)
+        for effect in new_effects[shared:]:
+            self.dataclass(effect)
+
+    def game_state_delta(self, old: GameState, new: GameState) -> None:
+        def rng(_: Any, rng: Any) -> None:
+            self.int(rng.seed)
+            self.uint(rng.counter)
+
+        self._fields(_game_state_fields(old), _game_state_fields(new), (
+            lambda _, mode: self.cls(type(mode)),
+            lambda _, phase: self.cls(type(phase)),
+            lambda _, round: self.int(round),
+            lambda _, pid: self.enum(pid),
+            self.player_delta,
+            self.player_delta,
+            self.effect_stack_delta,
+            rng,
+        ))
+
+
+def encode_delta(base: GameState, target: GameState) -> bytes:
+    writer = _DeltaWriter(get_registry())
+    writer.game_state_delta(base, target)
+    return bytes(writer.out)
+
+
+############################## Decoding ##############################
+
+class _DeltaReader(Reader):
+    def _fields(
+            self,
+            base_fields: tuple,
+            readers: tuple[Callable[[Any], Any], ...],
+    ) -> list:
+        mask = self.uint()
+        fields = list(base_fields)
+        for i, read in enumerate(readers):
+            if mask >> i & 1:
+                fields[i] = read(base_fields[i])
+        return fields
+
+    def _seq(
+            self,
+            base: _T,
+            base_seq: tuple,
+            read_full: Callable[[], _T],
+            rebuild: Callable[[tuple], _T],
+    ) -> _T:
+        flag = self.uint()
+        if flag & 1:
+            return read_full()
+        mask = flag >> 1
+        if not mask:
+            return base
+        return rebuild(tuple(
+            self.dataclass() if mask >> i & 1 else item
+            for i, item in enumerate(base_seq)
+        ))
+
+    def statuses_delta(self, base: Statuses) -> Statuses:
+        return self._seq(base, base.get_statuses(), self.statuses, type(base))
+
+    def cards_delta(self, base: Cards) -> Cards:
+        return base + self.cards()
+
+    def character_delta(self, base: Character) -> Character:
+        hp, max_hp, energy, max_energy, talents, equipments, statuses, aura = self._fields(
+            _character_fields(base), (
+                lambda _: self.int(),
+                lambda _: self.int(),
+                lambda _: self.int(),
+                lambda _: self.int(),
+                self.statuses_delta,
+                self.statuses_delta,
+                self.statuses_delta,
+                lambda _: self.aura(),
+            )
+        )
+        return type(base)(
+            id=base.get_id(),
+            hp=hp,
+            max_hp=max_hp,
+            energy=energy,
+            max_energy=max_energy,
+            talents=talents,
+            equipments=equipments,
+            statuses=statuses,
+            elemental_aura=aura,
+        )
+
+    def characters_delta(self, base: Characters) -> Characters:
+        from ..character.characters import Characters
+        active_character_id = self.value()
+        flag = self.uint()
+        if flag & 1:
+            chars = tuple(self.character() for _ in range(self.uint()))
+        else:
+            mask = flag >> 1
+            chars = tuple(
+                self.character_delta(char) if mask >> i & 1 else char
+                for i, char in enumerate(base.get_characters())
+            )
+        return Characters(chars, active_character_id)
+
+    def player_delta(self, base: PlayerState) -> PlayerState:
+        from ..summon.summons import Summons
+        from ..support.supports import Supports
+        from .enums import ACT
+        from .player_state import PlayerState
+
+        def full_summons() -> Summons:
+            max_num = self.uint()
+            return Summons(self.status_seq(), max_num)
+
+        def full_supports() -> Supports:
+            max_num = self.uint()
+            return Supports(self.status_seq(), max_num)
+
+        def summons_delta(base_summons: Summons) -> Summons:
+            return self._seq(
+                base_summons, base_summons.get_summons(), full_summons,
+                lambda summons: Summons(summons, base_summons._max_num),
+            )
+
+        def supports_delta(base_supports: Supports) -> Supports:
+            return self._seq(
+                base_supports, base_supports.get_supports(), full_supports,
+                lambda supports: Supports(supports, base_supports._max_num),
+            )
+
+        (
+            phase, card_redraw_chances, characters, combat_statuses, summons, supports,
+            dices, hand_cards, deck_cards, publicly_used_cards,
+        ) = self._fields(_player_fields(base), (
+            lambda _: self.enum_of(ACT),
+            lambda _: self.int(),
+            self.characters_delta,
+            self.statuses_delta,
+            summons_delta,
+            supports_delta,
+            lambda _: self.actual_dices(),
+            self.cards_delta,
+            self.cards_delta,
+            self.cards_delta,
+        ))
+        return PlayerState(
+            phase=phase,
+            card_redraw_chances=card_redraw_chances,
+            characters=characters,
+            combat_statuses=combat_statuses,
+            summons=summons,
+            supports=supports,
+            dices=dices,
+            hand_cards=hand_cards,
+            deck_cards=deck_cards,
+            publicly_used_cards=publicly_used_cards,
+        )
+
+    def effect_stack_delta(self, base: EffectStack) -> EffectStack:
+        effect_stack = base
+        for _ in range(self.uint()):
+            effect_stack, _ = effect_stack.pop()
+        return effect_stack.push_many_lf(
+            self.dataclass() for _ in range(self.uint())
+        )
+
+    def game_state_delta(self, base: GameState) -> GameState:
+        from ..helper.rng import RNG
+        from .enums import PID
+        from .game_state import GameState
+        (
+            mode, phase, round, active_player_id, player1, player2, effect_stack, rng,
+        ) = self._fields(_game_state_fields(base), (
+            lambda _: self.cls()(),
+            lambda _: self.cls()(),
+            lambda _: self.int(),
+            lambda _: self.enum_of(PID),
+            self.player_delta,
+            self.player_delta,
+            self.effect_stack_delta,
+            lambda _: RNG(seed=self.int(), counter=self.uint()),
+        ))
+        return GameState(
+            mode=mode,
+            phase=phase,
+            round=round,
+            active_player_id=active_player_id,
+            player1=player1,
+            player2=player2,
+            effect_stack=effect_stack,
+            rng=rng,
+        )
+
+
+def apply_delta(base: GameState, delta: bytes) -> GameState:
+    reader = _DeltaReader(get_registry(), delta, 0)
+    game_state = reader.game_state_delta(base)
+    reader.end()
+    return game_state
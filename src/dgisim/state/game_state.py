@@ -9,6 +9,7 @@ from ..effect import effect as eft
 from ..phase import game_end_phase as gep
 from ..phase import phase as ph
 from ..state import player_state as ps
+from ..state import zobrist as zb
 
 from ..action.action import PlayerAction
 from ..character.character import Character
@@ -21,8 +22,10 @@ from ..effect.enums import ZONE
 from ..effect.structs import StaticTarget
 from ..element.element import Element
 from ..event.event import *
+from ..helper.hash_cache import HashCache
 from ..helper.level_print import level_print, level_print_single, INDENT
 from ..helper.quality_of_life import case_val
+from ..helper.rng import RNG
 from .enums import PID
 from ..status.status_processing import StatusProcessing
 from ..status.enums import PREPROCESSABLES
@@ -32,7 +35,13 @@ if TYPE_CHECKING:
     from ..action.types import DecidedChoiceType, GivenChoiceType
 
 
-class GameState:
+class GameState(HashCache):
+    __slots__ = (
+        "_mode", "_phase", "_round", "_active_player_id", "_player1", "_player2",
+        "_effect_stack", "_rng",
+        "_hash", "_zobrist", "_legal_actions",
+        "_swap_checker", "_skill_checker", "_elem_tuning_checker",
+    )
 
     def __init__(
         self,
@@ -42,7 +51,8 @@ class GameState:
         active_player_id: PID,
         player1: ps.PlayerState,
         player2: ps.PlayerState,
-        effect_stack: EffectStack
+        effect_stack: EffectStack,
+        rng: RNG,
     ):
         # REMINDER: don't forget to update factory when adding new fields
         self._mode = mode
@@ -52,14 +62,18 @@ class GameState:
         self._player1 = player1
         self._player2 = player2
         self._effect_stack = effect_stack
-
-        # checkers
-        self._swap_checker = SwapChecker(self)
-        self._skill_checker = SkillChecker(self)
-        self._elem_tuning_checker = ElementalTuningChecker(self)
+        self._rng = rng
+        self._hash: Optional[int] = None
+        self._zobrist: Optional[int] = None
+        self._legal_actions: Optional[dict[PID, tuple[PlayerAction, ...]]] = None
+        # checkers are only needed at decision points, so they are created on first use
+        self._swap_checker: Optional[SwapChecker] = None
+        self._skill_checker: Optional[SkillChecker] = None
+        self._elem_tuning_checker: Optional[ElementalTuningChecker] = None
 
     @classmethod
-    def from_default(cls):
+    def from_default(cls, seed: Optional[int] = None):
+        """ without a seed, the RNG is seeded from the global `random` """
         mode = md.DefaultMode()
         return cls(
             mode=mode,
@@ -69,6 +83,7 @@ class GameState:
             player1=ps.PlayerState.examplePlayer(mode),
             player2=ps.PlayerState.examplePlayer(mode),
             effect_stack=EffectStack(()),
+            rng=RNG.from_random() if seed is None else RNG(seed),
         )
 
     def factory(self):
@@ -89,12 +104,80 @@ class GameState:
     def get_effect_stack(self) -> EffectStack:
         return self._effect_stack
 
+    def get_rng(self) -> RNG:
+        return self._rng
+
     def get_player1(self) -> ps.PlayerState:
         return self._player1
 
     def get_player2(self) -> ps.PlayerState:
         return self._player2
 
+    def zobrist_key(self) -> int:
+        """ 64-bit Zobrist key, maintained incrementally once computed (see state/zobrist.py) """
+        if self._zobrist is None:
+            self._zobrist = zb.game_state_key(self)
+        return self._zobrist
+
+    def to_bytes(self) -> bytes:
+        """ compact binary encoding of this game state (see state/codec.py) """
+        from .codec import encode_game_state
+        return encode_game_state(self)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> GameState:
+        """ decodes the game state encoded by to_bytes() """
+        from .codec import decode_game_state
+        return decode_game_state(data)
+
+    def diff(self, other: GameState) -> bytes:
+        """ the field level delta from this game state to other (see state/delta.py) """
+        from .delta import encode_delta
+        return encode_delta(self, other)
+
+    def apply_diff(self, diff: bytes) -> GameState:
+        """ the game state that diff, created by self.diff(), leads to """
+        from .delta import apply_delta
+        return apply_delta(self, diff)
+
+    def _pop_effect(self) -> tuple[GameState, eft.Effect]:
+        """
+        the top effect and this game state without it, built without going
+        through the factory as this is on the hot path of Phase.fast_step()
+        """
+        effect_stack, effect = self._effect_stack.pop()
+        game_state = GameState(
+            self._mode,
+            self._phase,
+            self._round,
+            self._active_player_id,
+            self._player1,
+            self._player2,
+            effect_stack,
+            self._rng,
+        )
+        if self._zobrist is not None:
+            game_state._zobrist = zb.updated_game_state_key(self, game_state, self._zobrist)
+        return game_state, effect
+
+    def _pop_effect_in_place(self) -> eft.Effect:
+        """
+        pops the top effect off this game state itself, dropping its caches; only
+        for the working state of Phase.fast_step(), which nothing else refers to
+        """
+        old_stack = self._effect_stack
+        self._effect_stack, effect = old_stack.pop()
+        if self._zobrist is not None:
+            self._zobrist = zb.updated_effect_stack_key(
+                old_stack, self._effect_stack, self._zobrist
+            )
+        self._hash = None
+        self._legal_actions = None
+        self._swap_checker = None
+        self._skill_checker = None
+        self._elem_tuning_checker = None
+        return effect
+
     def get_pid(self, player: ps.PlayerState) -> PID:
         if player is self._player1:
             return PID.P1
@@ -120,12 +203,18 @@ class GameState:
             raise Exception("player_id unknown")
 
     def swap_checker(self) -> SwapChecker:
+        if self._swap_checker is None:
+            self._swap_checker = SwapChecker(self)
         return self._swap_checker
 
     def skill_checker(self) -> SkillChecker:
+        if self._skill_checker is None:
+            self._skill_checker = SkillChecker(self)
         return self._skill_checker
 
     def elem_tuning_checker(self) -> ElementalTuningChecker:
+        if self._elem_tuning_checker is None:
+            self._elem_tuning_checker = ElementalTuningChecker(self)
         return self._elem_tuning_checker
 
     def belongs_to(self, object: Character | Support) -> None | PID:
@@ -159,6 +248,35 @@ class GameState:
     def step(self) -> GameState:
         return self._phase.step(self)
 
+    def auto_step(self) -> GameState:
+        """
+        Returns the first following game state that waits for a player action or
+        ends the game, the same as calling step() repeatedly, but effects are
+        executed back to back without building the intermediate game states
+        """
+        game_state = self
+        while not game_state.game_end() and game_state.waiting_for() is None:
+            game_state = game_state._phase.fast_step(game_state)
+        return game_state
+
+    def legal_actions(self, pid: PID) -> tuple[PlayerAction, ...]:
+        """
+        Returns all distinct legal actions of player pid, with dices paid by
+        `ActualDices.basically_satisfy()`; empty if this is not waiting for pid or
+        the game has ended.
+        The result is cached per game state.
+        """
+        if self._legal_actions is None:
+            self._legal_actions = {}
+        actions = self._legal_actions.get(pid)
+        if actions is None:
+            if not self.game_end() and self.waiting_for() is pid:
+                actions = self._phase.legal_actions(self, pid)
+            else:
+                actions = ()
+            self._legal_actions[pid] = actions
+        return actions
+
     def action_step(self, pid: PID, action: PlayerAction) -> Optional[GameState]:
         """
         Returns None if the action is illegal or undefined
@@ -186,6 +304,7 @@ class GameState:
             self._player2,
             self._effect_stack,
             self._mode,
+            self._rng,
         )
 
     def __eq__(self, other: object) -> bool:
@@ -193,10 +312,14 @@ class GameState:
             return True
         if not isinstance(other, GameState):
             return False
+        if self._hash is not None and other._hash is not None and self._hash != other._hash:
+            return False
         return self._all_unique_data() == other._all_unique_data()
 
     def __hash__(self) -> int:
-        return hash(self._all_unique_data())
+        if self._hash is None:
+            self._hash = hash(self._all_unique_data())
+        return self._hash
 
     def __str__(self) -> str:
         from ..helper.level_print import GamePrinter
@@ -228,6 +351,7 @@ class GameState:
 
 class GameStateFactory:
     def __init__(self, game_state: GameState):
+        self._base = game_state
         self._mode = game_state.get_mode()
         self._phase = game_state.get_phase()
         self._round = game_state.get_round()
@@ -235,6 +359,7 @@ class GameStateFactory:
         self._player1 = game_state.get_player1()
         self._player2 = game_state.get_player2()
         self._effect_stack = game_state.get_effect_stack()
+        self._rng = game_state.get_rng()
 
     def mode(self, new_mode: md.Mode) -> GameStateFactory:
         self._mode = new_mode
@@ -258,6 +383,13 @@ class GameStateFactory:
     def f_effect_stack(self, f: Callable[[EffectStack], EffectStack]) -> GameStateFactory:
         return self.effect_stack(f(self._effect_stack))
 
+    def rng(self, rng: RNG) -> GameStateFactory:
+        self._rng = rng
+        return self
+
+    def f_rng(self, f: Callable[[RNG], RNG]) -> GameStateFactory:
+        return self.rng(f(self._rng))
+
     def active_player_id(self, pid: PID) -> GameStateFactory:
         self._active_player = pid
         return self
@@ -309,7 +441,7 @@ class GameStateFactory:
             raise Exception("player_id unknown")
 
     def build(self) -> GameState:
-        return GameState(
+        game_state = GameState(
             mode=self._mode,
             phase=self._phase,
             round=self._round,
@@ -317,12 +449,22 @@ class GameStateFactory:
             effect_stack=self._effect_stack,
             player1=self._player1,
             player2=self._player2,
+            rng=self._rng,
         )
+        base_key = self._base._zobrist
+        if base_key is not None:
+            game_state._zobrist = zb.updated_game_state_key(self._base, game_state, base_key)
+        return game_state
 
 
 class SwapChecker:
+    """ results are memoized, as the game state checked is immutable """
+
     def __init__(self, game_state: GameState) -> None:
         self._game_state = game_state
+        self._should_death_swap: Optional[bool] = None
+        self._swap_details: dict[tuple[PID, int], None | tuple[EventSpeed, None | AbstractDices]] = {}
+        self._preprocessed_swaps: dict[tuple[PID, int], tuple[GameState, GameEvent]] = {}
 
     def _choices_helper(
             self,
@@ -415,9 +557,37 @@ class SwapChecker:
             )
 
     def should_death_swap(self) -> bool:
-        effect_stack = self._game_state.get_effect_stack()
-        return effect_stack.is_not_empty() \
-            and isinstance(effect_stack.peek(), eft.DeathSwapPhaseStartEffect)
+        if self._should_death_swap is None:
+            effect_stack = self._game_state.get_effect_stack()
+            self._should_death_swap = effect_stack.is_not_empty() \
+                and isinstance(effect_stack.peek(), eft.DeathSwapPhaseStartEffect)
+        return self._should_death_swap
+
+    def _preprocessed_swap(self, pid: PID, char_id: int) -> tuple[GameState, GameEvent]:
+        """ the game state and swap event after preprocessing a normal swap """
+        key = (pid, char_id)
+        preprocessed = self._preprocessed_swaps.get(key)
+        if preprocessed is None:
+            game_state = self._game_state
+            new_game_state, swap_action = StatusProcessing.preprocess_by_all_statuses(
+                game_state=game_state,
+                pid=pid,
+                item=GameEvent(
+                    target=StaticTarget(
+                        pid=pid,
+                        zone=ZONE.CHARACTERS,
+                        id=char_id,
+                    ),
+                    event_type=EventType.SWAP,
+                    event_speed=game_state.get_mode().swap_speed(),
+                    dices_cost=game_state.get_mode().swap_cost(),
+                ),
+                pp_type=PREPROCESSABLES.SWAP,
+            )
+            assert isinstance(swap_action, GameEvent)
+            preprocessed = (new_game_state, swap_action)
+            self._preprocessed_swaps[key] = preprocessed
+        return preprocessed
 
     def swappable(
             self,
@@ -432,6 +602,16 @@ class SwapChecker:
             self,
             pid: PID,
             char_id: int,
+    ) -> None | tuple[EventSpeed, None | AbstractDices]:
+        key = (pid, char_id)
+        if key not in self._swap_details:
+            self._swap_details[key] = self._compute_swap_details(pid, char_id)
+        return self._swap_details[key]
+
+    def _compute_swap_details(
+            self,
+            pid: PID,
+            char_id: int,
     ) -> None | tuple[EventSpeed, None | AbstractDices]:
         game_state = self._game_state
         selected_char = game_state.get_player(pid).get_characters().get_character(char_id)
@@ -445,22 +625,7 @@ class SwapChecker:
             return EventSpeed.FAST_ACTION, None
 
         # Check if player can afford Normal Swap
-        _, swap_action = StatusProcessing.preprocess_by_all_statuses(
-            game_state=game_state,
-            pid=pid,
-            item=GameEvent(
-                target=StaticTarget(
-                    pid=pid,
-                    zone=ZONE.CHARACTERS,
-                    id=char_id,
-                ),
-                event_type=EventType.SWAP,
-                event_speed=game_state.get_mode().swap_speed(),
-                dices_cost=game_state.get_mode().swap_cost(),
-            ),
-            pp_type=PREPROCESSABLES.SWAP,
-        )
-        assert isinstance(swap_action, GameEvent)
+        _, swap_action = self._preprocessed_swap(pid, char_id)
         if game_state.get_player(pid).get_dices().loosely_satisfy(swap_action.dices_cost):
             return swap_action.event_speed, swap_action.dices_cost
         else:
@@ -495,22 +660,7 @@ class SwapChecker:
                 None,
             )
         elif isinstance(action, act.SwapAction):
-            new_game_state, swap_action = StatusProcessing.preprocess_by_all_statuses(
-                game_state=game_state,
-                pid=pid,
-                item=GameEvent(
-                    target=StaticTarget(
-                        pid=pid,
-                        zone=ZONE.CHARACTERS,
-                        id=action.char_id,
-                    ),
-                    event_type=EventType.SWAP,
-                    event_speed=game_state.get_mode().swap_speed(),
-                    dices_cost=game_state.get_mode().swap_cost(),
-                ),
-                pp_type=PREPROCESSABLES.SWAP,
-            )
-            assert isinstance(swap_action, GameEvent)
+            new_game_state, swap_action = self._preprocessed_swap(pid, action.char_id)
             instruction_dices = action.instruction.dices
             player_dices = game_state.get_player(pid).get_dices()
             return case_val(
@@ -523,8 +673,18 @@ class SwapChecker:
 
 
 class SkillChecker:
+    """ results are memoized, as the game state checked is immutable """
+
     def __init__(self, game_state: GameState) -> None:
         self._game_state = game_state
+        self._usables: dict[
+            tuple[PID, int, CharacterSkill],
+            None | tuple[GameState, AbstractDices],
+        ] = {}
+        self._preprocessed_skills: dict[
+            tuple[PID, int, CharacterSkill],
+            tuple[GameState, GameEvent],
+        ] = {}
 
     def _choices_helper(
             self,
@@ -607,11 +767,52 @@ class SkillChecker:
             _fill_helper=self._fill_helper,
         )
 
+    def _preprocessed_skill(
+            self,
+            pid: PID,
+            character: Character,
+            skill_type: CharacterSkill,
+    ) -> tuple[GameState, GameEvent]:
+        """ the game state and skill event after preprocessing the skill of character """
+        key = (pid, character.get_id(), skill_type)
+        preprocessed = self._preprocessed_skills.get(key)
+        if preprocessed is None:
+            new_game_state, skill_event = StatusProcessing.preprocess_by_all_statuses(
+                game_state=self._game_state,
+                pid=pid,
+                item=GameEvent(
+                    target=StaticTarget(
+                        pid=pid,
+                        zone=ZONE.CHARACTERS,
+                        id=character.get_id(),
+                    ),
+                    event_type=skill_type.to_event_type(),
+                    event_speed=EventSpeed.COMBAT_ACTION,
+                    dices_cost=character.skill_cost(skill_type),
+                ),
+                pp_type=PREPROCESSABLES.SKILL,
+            )
+            assert isinstance(skill_event, GameEvent)
+            preprocessed = (new_game_state, skill_event)
+            self._preprocessed_skills[key] = preprocessed
+        return preprocessed
+
     def usable(
             self,
             pid: PID,
             char_id: int,
             skill_type: CharacterSkill,
+    ) -> None | tuple[GameState, AbstractDices]:
+        key = (pid, char_id, skill_type)
+        if key not in self._usables:
+            self._usables[key] = self._compute_usable(pid, char_id, skill_type)
+        return self._usables[key]
+
+    def _compute_usable(
+            self,
+            pid: PID,
+            char_id: int,
+            skill_type: CharacterSkill,
     ) -> None | tuple[GameState, AbstractDices]:
         game_state = self._game_state
         character = game_state.get_player(pid).get_characters().get_character(char_id)
@@ -622,22 +823,7 @@ class SkillChecker:
         if skill_type is CharacterSkill.ELEMENTAL_BURST \
                 and character.get_energy() < character.get_max_energy():
             return None
-        new_game_state, skill_event = StatusProcessing.preprocess_by_all_statuses(
-            game_state=game_state,
-            pid=pid,
-            item=GameEvent(
-                target=StaticTarget(
-                    pid=pid,
-                    zone=ZONE.CHARACTERS,
-                    id=char_id,
-                ),
-                event_type=skill_type.to_event_type(),
-                event_speed=EventSpeed.COMBAT_ACTION,
-                dices_cost=character.skill_cost(skill_type),
-            ),
-            pp_type=PREPROCESSABLES.SKILL,
-        )
-        assert isinstance(skill_event, GameEvent)
+        new_game_state, skill_event = self._preprocessed_skill(pid, character, skill_type)
         if game_state.get_player(pid).get_dices().loosely_satisfy(skill_event.dices_cost):
             return new_game_state, skill_event.dices_cost
         else:
@@ -658,22 +844,7 @@ class SkillChecker:
         if skill_type is CharacterSkill.ELEMENTAL_BURST \
                 and character.get_energy() < character.get_max_energy():
             return None
-        game_state, skill_event = StatusProcessing.preprocess_by_all_statuses(
-            game_state=game_state,
-            pid=pid,
-            item=GameEvent(
-                target=StaticTarget(
-                    pid=pid,
-                    zone=ZONE.CHARACTERS,
-                    id=character.get_id(),
-                ),
-                event_type=skill_type.to_event_type(),
-                event_speed=EventSpeed.COMBAT_ACTION,
-                dices_cost=character.skill_cost(skill_type),
-            ),
-            pp_type=PREPROCESSABLES.SKILL,
-        )
-        assert isinstance(skill_event, GameEvent)
+        game_state, skill_event = self._preprocessed_skill(pid, character, skill_type)
         if action.instruction.dices.just_satisfy(skill_event.dices_cost):
             return game_state
         else:
@@ -681,10 +852,21 @@ class SkillChecker:
 
 
 class ElementalTuningChecker:
+    """ results are memoized, as the game state checked is immutable """
+
     def __init__(self, game_state: GameState) -> None:
         self._game_state = game_state
+        self._usables: dict[tuple[PID, None | Element], bool] = {}
 
     def usable(self, pid: PID, elem: None | Element = None) -> bool:
+        key = (pid, elem)
+        usable = self._usables.get(key)
+        if usable is None:
+            usable = self._compute_usable(pid, elem)
+            self._usables[key] = usable
+        return usable
+
+    def _compute_usable(self, pid: PID, elem: None | Element) -> bool:
         game_state = self._game_state
         if not (type(game_state.get_phase()) == type(game_state.get_mode().action_phase())
                 or game_state.get_active_player_id() is pid):
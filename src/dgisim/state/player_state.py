@@ -8,17 +8,26 @@ from ..support import support as sp
 
 from ..character.characters import Characters
 from ..dices import ActualDices
+from ..helper.hash_cache import HashCache
 from ..helper.level_print import level_print, INDENT
 from ..summon.summons import Summons
 from ..support.supports import Supports
 
+from . import zobrist as zb
 from .enums import ACT
 
 if TYPE_CHECKING:
     from ..mode import Mode
 
 
-class PlayerState:
+class PlayerState(HashCache):
+    __slots__ = (
+        "_phase", "_card_redraw_chances", "_characters", "_combat_statuses",
+        "_summons", "_supports", "_dices", "_hand_cards", "_deck_cards",
+        "_publicly_used_cards",
+        "_hash", "_zobrist", "_status_index",
+    )
+
     def __init__(
         self,
         phase: ACT,
@@ -43,6 +52,9 @@ class PlayerState:
         self._hand_cards = hand_cards
         self._deck_cards = deck_cards
         self._publicly_used_cards = publicly_used_cards
+        self._hash: Optional[int] = None
+        self._zobrist: Optional[int] = None
+        self._status_index: Optional[dict[tuple, tuple]] = None
 
     def factory(self) -> PlayerStateFactory:
         return PlayerStateFactory(self)
@@ -77,6 +89,18 @@ class PlayerState:
     def get_publicly_used_cards(self) -> cds.Cards:
         return self._publicly_used_cards
 
+    def zobrist_key(self) -> int:
+        """ 64-bit Zobrist key, maintained incrementally once computed (see state/zobrist.py) """
+        if self._zobrist is None:
+            self._zobrist = zb.player_key(self)
+        return self._zobrist
+
+    def get_status_index(self) -> dict[tuple, tuple]:
+        """ lazily created cache of StatusProcessing, statuses indexed by what they react to """
+        if self._status_index is None:
+            self._status_index = {}
+        return self._status_index
+
     def get_active_character(self) -> Optional[chr.Character]:
         return self._characters.get_active_character()
 
@@ -108,22 +132,35 @@ class PlayerState:
         return self._characters.all_defeated()
 
     @staticmethod
-    def examplePlayer(mode: Mode):
-        cards = mode.all_cards()
-        chars = mode.all_chars()
+    def from_deck(
+            mode: Mode,
+            chars: tuple[type[chr.Character], ...],
+            deck_cards: cds.Cards,
+    ) -> PlayerState:
+        """ the player before the game starts, with chars and deck_cards """
         return PlayerState(
             phase=ACT.PASSIVE_WAIT_PHASE,
             card_redraw_chances=0,
             characters=Characters.from_default(
-                tuple([char.from_default(i + 1) for i, char in enumerate(chars)][:3])
+                tuple(char.from_default(i + 1) for i, char in enumerate(chars))
             ),
             combat_statuses=sts.Statuses(()),
             summons=Summons((), mode.summons_limit()),
             supports=Supports((), mode.supports_limit()),
-            hand_cards=cds.Cards(dict([(card, 0) for card in cards])),
+            hand_cards=cds.Cards.from_empty(),
             dices=ActualDices({}),
-            deck_cards=cds.Cards(dict([(card, 2) for card in cards])),
-            publicly_used_cards=cds.Cards(dict([(card, 0) for card in cards])),
+            deck_cards=deck_cards,
+            publicly_used_cards=cds.Cards.from_empty(),
+        )
+
+    @staticmethod
+    def examplePlayer(mode: Mode):
+        cards = mode.all_cards()
+        chars = mode.all_chars()
+        return PlayerState.from_deck(
+            mode,
+            tuple(chars)[:3],
+            cds.Cards(dict([(card, 2) for card in cards])),
         )
 
     def _all_unique_data(self) -> tuple:
@@ -131,6 +168,7 @@ class PlayerState:
             self._phase,
             self._card_redraw_chances,
             self._characters,
+            self._combat_statuses,
             self._dices,
             self._summons,
             self._supports,
@@ -140,12 +178,18 @@ class PlayerState:
         )
 
     def __eq__(self, other: object) -> bool:
+        if self is other:
+            return True
         if not isinstance(other, PlayerState):
             return False
+        if self._hash is not None and other._hash is not None and self._hash != other._hash:
+            return False
         return self._all_unique_data() == other._all_unique_data()
 
     def __hash__(self) -> int:
-        return hash(self._all_unique_data())
+        if self._hash is None:
+            self._hash = hash(self._all_unique_data())
+        return self._hash
 
     def __str__(self) -> str:
         return self.to_string(0)
@@ -179,6 +223,7 @@ class PlayerState:
 
 class PlayerStateFactory:
     def __init__(self, player_state: PlayerState) -> None:
+        self._base = player_state
         self._phase = player_state.get_phase()
         self._card_redraw_chances = player_state.get_card_redraw_chances()
         self._characters = player_state.get_characters()
@@ -253,7 +298,7 @@ class PlayerStateFactory:
         return self.publicly_used_cards(f(self._publicly_used_cards))
 
     def build(self) -> PlayerState:
-        return PlayerState(
+        player_state = PlayerState(
             phase=self._phase,
             card_redraw_chances=self._card_redraw_chances,
             characters=self._characters,
@@ -265,3 +310,7 @@ class PlayerStateFactory:
             deck_cards=self._deck_cards,
             publicly_used_cards=self._publicly_used_cards,
         )
+        base_key = self._base._zobrist
+        if base_key is not None:
+            player_state._zobrist = zb.updated_player_key(self._base, player_state, base_key)
+        return player_state
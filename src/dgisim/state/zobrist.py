@@ -0,0 +1,343 @@
+"""
+Zobrist-style 64-bit keys of game states.
+
+The key of a GameState is the XOR of the random keys of all its features, e.g.
+(hp, char_id, 10) or (dice, PYRO, 2). The keys of player 2 are rotated so that
+mirrored players do not cancel out. Keys are optional: they are only computed
+when zobrist_key() is first called on an object, and from then on the
+factories of GameState, PlayerState and Character derive the key of each new
+object from its predecessor by XOR-ing only the fields that changed.
+
+The random key of a feature is derived from its hash(), so just like hash(),
+keys are only consistent within one process.
+"""
+from __future__ import annotations
+from typing import Any, Hashable, Iterable, Sequence, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from ..card.cards import Cards
+    from ..character.character import Character
+    from ..character.characters import Characters
+    from ..dices import Dices
+    from ..effect.effect_stack import EffectStack
+    from .game_state import GameState
+    from .player_state import PlayerState
+
+__all__ = [
+    "character_key",
+    "check_zobrist_key",
+    "game_state_key",
+    "player_key",
+    "updated_character_key",
+    "updated_effect_stack_key",
+    "updated_game_state_key",
+    "updated_player_key",
+]
+
+_MASK = 0xffffffffffffffff
+
+
+def _feature_key(feature: Hashable) -> int:
+    """ spreads hash(feature) over 64 bits (splitmix64 finaliser) """
+    key = (hash(feature) + 0x9e3779b97f4a7c15) & _MASK
+    key = ((key ^ (key >> 30)) * 0xbf58476d1ce4e5b9) & _MASK
+    key = ((key ^ (key >> 27)) * 0x94d049bb133111eb) & _MASK
+    return key ^ (key >> 31)
+
+
+def _rotate(key: int) -> int:
+    return ((key << 32) | (key >> 32)) & _MASK
+
+
+def _xor_all(features: Iterable[Hashable]) -> int:
+    key = 0
+    for feature in features:
+        key ^= _feature_key(feature)
+    return key
+
+
+def _seq_features(tag: str, owner: Any, seq: Sequence[Any]) -> Iterable[Hashable]:
+    return ((tag, owner, pos, item) for pos, item in enumerate(seq))
+
+
+def _seq_diff(tag: str, owner: Any, old_seq: Sequence[Any], new_seq: Sequence[Any]) -> int:
+    """ the XOR of the features of positions that differ between old_seq and new_seq """
+    key = 0
+    old_len = len(old_seq)
+    new_len = len(new_seq)
+    for pos in range(max(old_len, new_len)):
+        old_item = old_seq[pos] if pos < old_len else None
+        new_item = new_seq[pos] if pos < new_len else None
+        if old_item is new_item:
+            continue
+        if old_item is not None:
+            key ^= _feature_key((tag, owner, pos, old_item))
+        if new_item is not None:
+            key ^= _feature_key((tag, owner, pos, new_item))
+    return key
+
+
+def _count_features(tag: str, counts: dict) -> Iterable[Hashable]:
+    return ((tag, item, num) for item, num in counts.items() if num != 0)
+
+
+def _count_diff(tag: str, old_counts: dict, new_counts: dict) -> int:
+    key = 0
+    for item in old_counts.keys() | new_counts.keys():
+        old_num = old_counts.get(item, 0)
+        new_num = new_counts.get(item, 0)
+        if old_num == new_num:
+            continue
+        if old_num != 0:
+            key ^= _feature_key((tag, item, old_num))
+        if new_num != 0:
+            key ^= _feature_key((tag, item, new_num))
+    return key
+
+
+def _dices_counts(dices: Dices) -> dict:
+    return dices.to_dict()
+
+
+def _cards_counts(cards: Cards) -> dict:
+    return cards.to_dict()
+
+
+############################## Character ##############################
+
+def _character_features(char: Character) -> Iterable[Hashable]:
+    char_id = char.get_id()
+    yield ("char", char_id, type(char).__name__)
+    yield ("hp", char_id, char.get_hp())
+    yield ("max_hp", char_id, char.get_max_hp())
+    yield ("energy", char_id, char.get_energy())
+    yield ("max_energy", char_id, char.get_max_energy())
+    for elem in char.get_elemental_aura():
+        yield ("aura", char_id, elem)
+    yield from _seq_features("talent", char_id, char.get_talent_statuses().get_statuses())
+    yield from _seq_features("equipment", char_id, char.get_equipment_statuses().get_statuses())
+    yield from _seq_features("status", char_id, char.get_character_statuses().get_statuses())
+
+
+def character_key(char: Character) -> int:
+    """ computes the key of char from scratch """
+    return _xor_all(_character_features(char))
+
+
+def updated_character_key(old_char: Character, new_char: Character, old_key: int) -> int:
+    """ derives the key of new_char from old_key, the key of old_char """
+    if old_char.get_id() != new_char.get_id() or type(old_char) is not type(new_char):
+        return character_key(new_char)
+    char_id = new_char.get_id()
+    key = old_key
+    for tag, old_val, new_val in (
+            ("hp", old_char.get_hp(), new_char.get_hp()),
+            ("max_hp", old_char.get_max_hp(), new_char.get_max_hp()),
+            ("energy", old_char.get_energy(), new_char.get_energy()),
+            ("max_energy", old_char.get_max_energy(), new_char.get_max_energy()),
+    ):
+        if old_val != new_val:
+            key ^= _feature_key((tag, char_id, old_val)) ^ _feature_key((tag, char_id, new_val))
+    old_aura = old_char.get_elemental_aura()
+    new_aura = new_char.get_elemental_aura()
+    if old_aura is not new_aura:
+        key ^= _xor_all(("aura", char_id, elem) for elem in old_aura)
+        key ^= _xor_all(("aura", char_id, elem) for elem in new_aura)
+    for tag, old_statuses, new_statuses in (
+            ("talent", old_char.get_talent_statuses(), new_char.get_talent_statuses()),
+            ("equipment", old_char.get_equipment_statuses(), new_char.get_equipment_statuses()),
+            ("status", old_char.get_character_statuses(), new_char.get_character_statuses()),
+    ):
+        if old_statuses is not new_statuses:
+            key ^= _seq_diff(
+                tag, char_id, old_statuses.get_statuses(), new_statuses.get_statuses()
+            )
+    return key
+
+
+############################## PlayerState ##############################
+
+def _player_features(player: PlayerState) -> Iterable[Hashable]:
+    yield ("player_phase", player.get_phase())
+    yield ("redraw_chances", player.get_card_redraw_chances())
+    yield ("active_char", player.get_characters().get_active_character_id())
+    yield from _seq_features("combat_status", None, player.get_combat_statuses().get_statuses())
+    yield from _seq_features("summon", None, player.get_summons().get_summons())
+    yield from _seq_features("support", None, player.get_supports().get_supports())
+    yield from _count_features("dice", _dices_counts(player.get_dices()))
+    yield from _count_features("hand", _cards_counts(player.get_hand_cards()))
+    yield from _count_features("deck", _cards_counts(player.get_deck_cards()))
+    yield from _count_features("public", _cards_counts(player.get_publicly_used_cards()))
+
+
+def player_key(player: PlayerState, recompute: bool = False) -> int:
+    """
+    computes the key of player, reusing the (possibly incrementally maintained)
+    keys of the characters unless recompute is True
+    """
+    key = _xor_all(_player_features(player))
+    for char in player.get_characters():
+        key ^= character_key(char) if recompute else char.zobrist_key()
+    return key
+
+
+def _characters_diff(old_chars: Characters, new_chars: Characters) -> int:
+    key = 0
+    old_active = old_chars.get_active_character_id()
+    new_active = new_chars.get_active_character_id()
+    if old_active != new_active:
+        key ^= _feature_key(("active_char", old_active)) ^ _feature_key(("active_char", new_active))
+    old_tuple = old_chars.get_characters()
+    new_tuple = new_chars.get_characters()
+    for pos in range(max(len(old_tuple), len(new_tuple))):
+        old_char = old_tuple[pos] if pos < len(old_tuple) else None
+        new_char = new_tuple[pos] if pos < len(new_tuple) else None
+        if old_char is new_char:
+            continue
+        if old_char is not None:
+            key ^= old_char.zobrist_key()
+        if new_char is not None:
+            key ^= new_char.zobrist_key()
+    return key
+
+
+def updated_player_key(old_player: PlayerState, new_player: PlayerState, old_key: int) -> int:
+    """ derives the key of new_player from old_key, the key of old_player """
+    key = old_key
+    if old_player.get_phase() is not new_player.get_phase():
+        key ^= _feature_key(("player_phase", old_player.get_phase()))
+        key ^= _feature_key(("player_phase", new_player.get_phase()))
+    if old_player.get_card_redraw_chances() != new_player.get_card_redraw_chances():
+        key ^= _feature_key(("redraw_chances", old_player.get_card_redraw_chances()))
+        key ^= _feature_key(("redraw_chances", new_player.get_card_redraw_chances()))
+    if old_player.get_characters() is not new_player.get_characters():
+        key ^= _characters_diff(old_player.get_characters(), new_player.get_characters())
+    if old_player.get_combat_statuses() is not new_player.get_combat_statuses():
+        key ^= _seq_diff(
+            "combat_status",
+            None,
+            old_player.get_combat_statuses().get_statuses(),
+            new_player.get_combat_statuses().get_statuses(),
+        )
+    if old_player.get_summons() is not new_player.get_summons():
+        key ^= _seq_diff(
+            "summon",
+            None,
+            old_player.get_summons().get_summons(),
+            new_player.get_summons().get_summons(),
+        )
+    if old_player.get_supports() is not new_player.get_supports():
+        key ^= _seq_diff(
+            "support",
+            None,
+            old_player.get_supports().get_supports(),
+            new_player.get_supports().get_supports(),
+        )
+    if old_player.get_dices() is not new_player.get_dices():
+        key ^= _count_diff(
+            "dice", _dices_counts(old_player.get_dices()), _dices_counts(new_player.get_dices())
+        )
+    for tag, old_cards, new_cards in (
+            ("hand", old_player.get_hand_cards(), new_player.get_hand_cards()),
+            ("deck", old_player.get_deck_cards(), new_player.get_deck_cards()),
+            ("public", old_player.get_publicly_used_cards(), new_player.get_publicly_used_cards()),
+    ):
+        if old_cards is not new_cards:
+            key ^= _count_diff(tag, _cards_counts(old_cards), _cards_counts(new_cards))
+    return key
+
+
+############################## GameState ##############################
+
+def _effects(effect_stack: EffectStack) -> Sequence[Any]:
+    return effect_stack._effects
+
+
+def _effect_stack_diff(old_stack: EffectStack, new_stack: EffectStack) -> int:
+    """
+    walks both linked stacks from their tops down to the first shared node,
+    so only the pushed and popped effects are visited
+    """
+    key = 0
+    old_node, new_node = old_stack._top, new_stack._top
+    while old_node is not new_node:
+        if new_node is not None and (old_node is None or new_node.size > old_node.size):
+            key ^= _feature_key(("effect", None, new_node.size - 1, new_node.effect))
+            new_node = new_node.below
+        elif old_node is not None and (new_node is None or old_node.size > new_node.size):
+            key ^= _feature_key(("effect", None, old_node.size - 1, old_node.effect))
+            old_node = old_node.below
+        else:
+            assert old_node is not None and new_node is not None
+            key ^= _feature_key(("effect", None, old_node.size - 1, old_node.effect))
+            key ^= _feature_key(("effect", None, new_node.size - 1, new_node.effect))
+            old_node, new_node = old_node.below, new_node.below
+    return key
+
+
+def updated_effect_stack_key(old_stack: EffectStack, new_stack: EffectStack, old_key: int) -> int:
+    """ derives the key of a game state whose effect stack went from old_stack to new_stack """
+    return old_key ^ _effect_stack_diff(old_stack, new_stack)
+
+
+def _game_state_features(game_state: GameState) -> Iterable[Hashable]:
+    yield ("mode", type(game_state.get_mode()).__name__)
+    yield ("phase", type(game_state.get_phase()).__name__)
+    yield ("round", game_state.get_round())
+    yield ("active_player", game_state.get_active_player_id())
+    yield ("rng", game_state.get_rng())
+    yield from _seq_features("effect", None, _effects(game_state.get_effect_stack()))
+
+
+def game_state_key(game_state: GameState, recompute: bool = False) -> int:
+    """
+    computes the key of game_state, reusing the (possibly incrementally
+    maintained) keys of the players unless recompute is True
+    """
+    key = _xor_all(_game_state_features(game_state))
+    if recompute:
+        key ^= player_key(game_state.get_player1(), recompute=True)
+        key ^= _rotate(player_key(game_state.get_player2(), recompute=True))
+    else:
+        key ^= game_state.get_player1().zobrist_key()
+        key ^= _rotate(game_state.get_player2().zobrist_key())
+    return key
+
+
+def updated_game_state_key(old_state: GameState, new_state: GameState, old_key: int) -> int:
+    """ derives the key of new_state from old_key, the key of old_state """
+    key = old_key
+    for tag, old_val, new_val in (
+            ("mode", type(old_state.get_mode()).__name__, type(new_state.get_mode()).__name__),
+            ("phase", type(old_state.get_phase()).__name__, type(new_state.get_phase()).__name__),
+            ("round", old_state.get_round(), new_state.get_round()),
+            ("active_player", old_state.get_active_player_id(), new_state.get_active_player_id()),
+            ("rng", old_state.get_rng(), new_state.get_rng()),
+    ):
+        if old_val != new_val:
+            key ^= _feature_key((tag, old_val)) ^ _feature_key((tag, new_val))
+    if old_state.get_effect_stack() is not new_state.get_effect_stack():
+        key ^= _effect_stack_diff(old_state.get_effect_stack(), new_state.get_effect_stack())
+    old_p1, new_p1 = old_state.get_player1(), new_state.get_player1()
+    if old_p1 is not new_p1:
+        key ^= old_p1.zobrist_key() ^ new_p1.zobrist_key()
+    old_p2, new_p2 = old_state.get_player2(), new_state.get_player2()
+    if old_p2 is not new_p2:
+        key ^= _rotate(old_p2.zobrist_key() ^ new_p2.zobrist_key())
+    return key
+
+
+def check_zobrist_key(game_state: GameState) -> None:
+    """
+    Debug checker: raises an Exception if the (incrementally maintained) key of
+    game_state or of any of its players or characters differs from a full
+    recompute.
+    """
+    for player in (game_state.get_player1(), game_state.get_player2()):
+        for char in player.get_characters():
+            if char.zobrist_key() != character_key(char):
+                raise Exception(f"Zobrist key of {char.name()} mismatches its recompute")
+        if player.zobrist_key() != player_key(player, recompute=True):
+            raise Exception("Zobrist key of player mismatches its recompute")
+    if game_state.zobrist_key() != game_state_key(game_state, recompute=True):
+        raise Exception("Zobrist key of game state mismatches its recompute")
@@ -29,11 +29,39 @@ class TriggerringEvent(Enum):
 
 @dataclass(frozen=True)
 class Status:
+    """
+    REACTABLE_SIGNALS and PREPROCESS_TYPES declare the signals `_react_to_signal()`
+    and the preprocessables `_preprocess()` may act on; StatusProcessing only visits
+    a status for what it declares. A subclass overriding one of these methods without
+    declaring the matching class variable is taken to act on everything.
+
+    Statuses are slotted dataclasses (`@dataclass(frozen=True, slots=True)`),
+    except for summons (see summon.py). The slotted class is a re-created copy
+    of the decorated one, so its methods call `super(Cls, self)` explicitly;
+    zero-argument `super()` would refer to the discarded original class.
+    """
+    __slots__ = ()
+
+    REACTABLE_SIGNALS: ClassVar[frozenset[TRIGGERING_SIGNAL]] = frozenset()
+    PREPROCESS_TYPES: ClassVar[frozenset[PREPROCESSABLES]] = frozenset()
+    INFORMABLE: ClassVar[bool] = False
 
     def __init__(self) -> None:
         if type(self) is Status:  # pragma: no cover
             raise Exception("class Status is not instantiable")
 
+    def __init_subclass__(cls, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+        attrs = cls.__dict__
+        if ("_react_to_signal" in attrs or "_post_react_to_signal" in attrs) \
+                and "REACTABLE_SIGNALS" not in attrs:
+            cls.REACTABLE_SIGNALS = frozenset(TRIGGERING_SIGNAL)
+        if ("_preprocess" in attrs or "_post_preprocess" in attrs) \
+                and "PREPROCESS_TYPES" not in attrs:
+            cls.PREPROCESS_TYPES = frozenset(PREPROCESSABLES)
+        if "_inform" in attrs:
+            cls.INFORMABLE = True
+
     def preprocess(
             self,
             game_state: GameState,
@@ -261,7 +289,7 @@ class Status:
         return self.__class__.__name__.removesuffix("Status")  # pragma: no cover
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class CharacterTalentStatus(Status):
     """
     Basic status, describing character talents
@@ -269,14 +297,14 @@ class CharacterTalentStatus(Status):
     pass
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class EquipmentStatus(Status):
     """
     Basic status, describing weapon, artifact and character unique talents
     """
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class CharacterStatus(Status):
     """
     Basic status, private status to each character
@@ -284,7 +312,7 @@ class CharacterStatus(Status):
     pass
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class CombatStatus(Status):
     """
     Basic status, status shared across the team
@@ -292,8 +320,10 @@ class CombatStatus(Status):
     pass
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class _UsageStatus(Status):
+    # _post_preprocess() only tidies up what _preprocess() returns
+    PREPROCESS_TYPES: ClassVar[frozenset[PREPROCESSABLES]] = frozenset()
     usages: int
     MAX_USAGES: ClassVar[int] = BIG_INT
 
@@ -316,7 +346,9 @@ class _UsageStatus(Status):
                 new_self = None
             elif new_self.usages < 0:
                 new_self = replace(new_self, usages=0)
-        return super()._post_preprocess(game_state, status_source, item, signal, new_item, new_self)
+        return super(_UsageStatus, self)._post_preprocess(
+            game_state, status_source, item, signal, new_item, new_self,
+        )
 
     @override
     def _post_update(self, new_self: Optional[Self]) -> Optional[Self]:
@@ -326,7 +358,7 @@ class _UsageStatus(Status):
                 new_self = None
             elif new_self.usages < 0:
                 new_self = replace(new_self, usages=0)
-        return super()._post_update(new_self)
+        return super(_UsageStatus, self)._post_update(new_self)
 
     @override
     def _update(self, other: Self) -> Optional[Self]:
@@ -334,10 +366,10 @@ class _UsageStatus(Status):
         return replace(self, usages=new_usages)
 
     def __str__(self) -> str:
-        return super().__str__() + f"({self.usages})"  # pragma: no cover
+        return super(_UsageStatus, self).__str__() + f"({self.usages})"  # pragma: no cover
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ShieldStatus(Status):
     def _is_target(
             self,
@@ -373,9 +405,12 @@ class ShieldStatus(Status):
             raise NotImplementedError  # pragma: no cover
 
 
-@dataclass(frozen=True, kw_only=True)
+@dataclass(frozen=True, slots=True, kw_only=True)
 class StackedShieldStatus(ShieldStatus, _UsageStatus):
     """ The shield status where all usages can be consumed by a DMG effect """
+    PREPROCESS_TYPES: ClassVar[frozenset[PREPROCESSABLES]] = frozenset((
+        PREPROCESSABLES.DMG_AMOUNT,
+    ))
     usages: int
     MAX_USAGES: ClassVar[int] = BIG_INT
     SHIELD_AMOUNT: ClassVar[int] = 1  # shield amount per usage
@@ -404,15 +439,18 @@ class StackedShieldStatus(ShieldStatus, _UsageStatus):
                 else:
                     return new_item, replace(self, usages=new_usages)
 
-        return super()._preprocess(game_state, status_source, item, signal)
+        return super(StackedShieldStatus, self)._preprocess(game_state, status_source, item, signal)
 
     def __str__(self) -> str:
-        return super().__str__() + f"({self.usages})"  # pragma: no cover
+        return super(StackedShieldStatus, self).__str__() + f"({self.usages})"  # pragma: no cover
 
 
-@dataclass(frozen=True, kw_only=True)
+@dataclass(frozen=True, slots=True, kw_only=True)
 class FixedShieldStatus(ShieldStatus, _UsageStatus):
     """ The shield status where only one usage can be consumed by a DMG effect """
+    PREPROCESS_TYPES: ClassVar[frozenset[PREPROCESSABLES]] = frozenset((
+        PREPROCESSABLES.DMG_AMOUNT,
+    ))
     usages: int
     MAX_USAGES: ClassVar[int] = BIG_INT
     SHIELD_AMOUNT: ClassVar[int] = 0  # shield amount per stack
@@ -443,10 +481,10 @@ class FixedShieldStatus(ShieldStatus, _UsageStatus):
                 else:
                     return new_item, replace(self, usages=new_usages)
 
-        return super()._preprocess(game_state, status_source, item, signal)
+        return super(FixedShieldStatus, self)._preprocess(game_state, status_source, item, signal)
 
 
-@dataclass(frozen=True, kw_only=True)
+@dataclass(frozen=True, slots=True, kw_only=True)
 class CrystallizeStatus(CombatStatus, StackedShieldStatus):
     usages: int = 1
     MAX_USAGES: ClassVar[int] = 2
@@ -457,7 +495,7 @@ class CrystallizeStatus(CombatStatus, StackedShieldStatus):
         return type(self)(usages=new_stacks)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class DendroCoreStatus(CombatStatus):
     """
     When you deal Pyro DMG or Electro DMG to an opposing active character, DMG dealt +2.
@@ -466,6 +504,9 @@ class DendroCoreStatus(CombatStatus):
     Experiment results:
     - normally the maxinum num of usage(s) is 1
     """
+    PREPROCESS_TYPES: ClassVar[frozenset[PREPROCESSABLES]] = frozenset((
+        PREPROCESSABLES.DMG_AMOUNT,
+    ))
     damage_boost: ClassVar[int] = 2
     usages: int = 1
 
@@ -491,7 +532,7 @@ class DendroCoreStatus(CombatStatus):
                     return new_damage, None
                 else:
                     return new_damage, DendroCoreStatus(self.usages - 1)
-        return super()._preprocess(game_state, status_source, item, signal)
+        return super(DendroCoreStatus, self)._preprocess(game_state, status_source, item, signal)
 
     # @override
     # def update(self, other: DendroCoreStatus) -> DendroCoreStatus:
@@ -499,11 +540,14 @@ class DendroCoreStatus(CombatStatus):
     #     return DendroCoreStatus(total_count)
 
     def __str__(self) -> str:
-        return super().__str__() + f"({self.usages})"  # pragma: no cover
+        return super(DendroCoreStatus, self).__str__() + f"({self.usages})"  # pragma: no cover
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class CatalyzingFieldStatus(CombatStatus):
+    PREPROCESS_TYPES: ClassVar[frozenset[PREPROCESSABLES]] = frozenset((
+        PREPROCESSABLES.DMG_AMOUNT,
+    ))
     damage_boost: ClassVar[int] = 1
     usages: int = 2
 
@@ -529,14 +573,22 @@ class CatalyzingFieldStatus(CombatStatus):
                     return new_damage, None
                 else:
                     return new_damage, CatalyzingFieldStatus(self.usages - 1)
-        return super()._preprocess(game_state, status_source, item, signal)
+        return super(CatalyzingFieldStatus, self)._preprocess(
+            game_state, status_source, item, signal,
+        )
 
     def __str__(self) -> str:
-        return super().__str__() + f"({self.usages})"  # pragma: no cover
+        return super(CatalyzingFieldStatus, self).__str__() + f"({self.usages})"  # pragma: no cover
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class FrozenStatus(CharacterStatus):
+    PREPROCESS_TYPES: ClassVar[frozenset[PREPROCESSABLES]] = frozenset((
+        PREPROCESSABLES.DMG_AMOUNT,
+    ))
+    REACTABLE_SIGNALS: ClassVar[frozenset[TRIGGERING_SIGNAL]] = frozenset((
+        TRIGGERING_SIGNAL.ROUND_END,
+    ))
     damage_boost: ClassVar[int] = 2
 
     @override
@@ -553,7 +605,7 @@ class FrozenStatus(CharacterStatus):
             is_damage_target = item.target == status_source
             if is_damage_target and can_reaction:
                 return replace(item, damage=item.damage + FrozenStatus.damage_boost), None
-        return super()._preprocess(game_state, status_source, item, signal)
+        return super(FrozenStatus, self)._preprocess(game_state, status_source, item, signal)
 
     @override
     def _react_to_signal(
@@ -565,8 +617,11 @@ class FrozenStatus(CharacterStatus):
 
 
 # <<<<<<<<<<<<<<<<<<<< Food Status <<<<<<<<<<<<<<<<<<<<
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class SatiatedStatus(CharacterStatus):
+    REACTABLE_SIGNALS: ClassVar[frozenset[TRIGGERING_SIGNAL]] = frozenset((
+        TRIGGERING_SIGNAL.ROUND_END,
+    ))
 
     @override
     def _react_to_signal(
@@ -577,8 +632,12 @@ class SatiatedStatus(CharacterStatus):
         return [], self
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class MushroomPizzaStatus(CharacterStatus, _UsageStatus):
+    REACTABLE_SIGNALS: ClassVar[frozenset[TRIGGERING_SIGNAL]] = frozenset((
+        TRIGGERING_SIGNAL.END_ROUND_CHECK_OUT,
+        TRIGGERING_SIGNAL.ROUND_END,
+    ))
     usages: int = 2
     MAX_USAGES: ClassVar[int] = 2
 
@@ -601,8 +660,14 @@ class MushroomPizzaStatus(CharacterStatus, _UsageStatus):
         return es, replace(self, usages=d_usages)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class JueyunGuobaStatus(CharacterStatus, _UsageStatus):
+    PREPROCESS_TYPES: ClassVar[frozenset[PREPROCESSABLES]] = frozenset((
+        PREPROCESSABLES.DMG_AMOUNT,
+    ))
+    REACTABLE_SIGNALS: ClassVar[frozenset[TRIGGERING_SIGNAL]] = frozenset((
+        TRIGGERING_SIGNAL.ROUND_END,
+    ))
     usages: int = 1
     MAX_USAGES: ClassVar[int] = 1
     damage_boost: ClassVar[int] = 1
@@ -620,7 +685,7 @@ class JueyunGuobaStatus(CharacterStatus, _UsageStatus):
             if item.source == status_source and item.damage_type.normal_attack:
                 item = replace(item, damage=item.damage + JueyunGuobaStatus.damage_boost)
                 return item, replace(self, usages=self.usages - 1)
-        return super()._preprocess(game_state, status_source, item, signal)
+        return super(JueyunGuobaStatus, self)._preprocess(game_state, status_source, item, signal)
 
     @override
     def _react_to_signal(
@@ -632,8 +697,14 @@ class JueyunGuobaStatus(CharacterStatus, _UsageStatus):
         return [], replace(self, usages=d_usages)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class NorthernSmokedChickenStatus(CharacterStatus, _UsageStatus):
+    PREPROCESS_TYPES: ClassVar[frozenset[PREPROCESSABLES]] = frozenset((
+        PREPROCESSABLES.SKILL,
+    ))
+    REACTABLE_SIGNALS: ClassVar[frozenset[TRIGGERING_SIGNAL]] = frozenset((
+        TRIGGERING_SIGNAL.ROUND_END,
+    ))
     usages: int = 1
     MAX_USAGES: ClassVar[int] = 1
     COST_DEDUCTION: ClassVar[int] = 1
@@ -656,7 +727,9 @@ class NorthernSmokedChickenStatus(CharacterStatus, _UsageStatus):
                     dices_cost=(item.dices_cost - {Element.ANY: self.COST_DEDUCTION}).validify()
                 )
                 return item, replace(self, usages=self.usages - 1)
-        return super()._preprocess(game_state, status_source, item, signal)
+        return super(NorthernSmokedChickenStatus, self)._preprocess(
+            game_state, status_source, item, signal,
+        )
 
     @override
     def _react_to_signal(
@@ -668,8 +741,11 @@ class NorthernSmokedChickenStatus(CharacterStatus, _UsageStatus):
         return [], replace(self, usages=d_usages)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class LotusFlowerCrispStatus(CharacterStatus, FixedShieldStatus):
+    REACTABLE_SIGNALS: ClassVar[frozenset[TRIGGERING_SIGNAL]] = frozenset((
+        TRIGGERING_SIGNAL.ROUND_END,
+    ))
     usages: int = 1
     MAX_USAGES: ClassVar[int] = 1
     SHIELD_AMOUNT: ClassVar[int] = 3
@@ -686,8 +762,14 @@ class LotusFlowerCrispStatus(CharacterStatus, FixedShieldStatus):
         return [], replace(self, usages=d_usages)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class MintyMeatRollsStatus(CharacterStatus, _UsageStatus):
+    PREPROCESS_TYPES: ClassVar[frozenset[PREPROCESSABLES]] = frozenset((
+        PREPROCESSABLES.SKILL,
+    ))
+    REACTABLE_SIGNALS: ClassVar[frozenset[TRIGGERING_SIGNAL]] = frozenset((
+        TRIGGERING_SIGNAL.ROUND_END,
+    ))
     usages: int = 3
     MAX_USAGES: ClassVar[int] = 3
     COST_DEDUCTION: ClassVar[int] = 1
@@ -710,7 +792,9 @@ class MintyMeatRollsStatus(CharacterStatus, _UsageStatus):
                     dices_cost=(item.dices_cost - {Element.ANY: self.COST_DEDUCTION}).validify()
                 )
                 return item, replace(self, usages=self.usages - 1)
-        return super()._preprocess(game_state, status_source, item, signal)
+        return super(MintyMeatRollsStatus, self)._preprocess(
+            game_state, status_source, item, signal,
+        )
 
     @override
     def _react_to_signal(
@@ -724,8 +808,11 @@ class MintyMeatRollsStatus(CharacterStatus, _UsageStatus):
 # >>>>>>>>>>>>>>>>>>>> Food Status >>>>>>>>>>>>>>>>>>>>
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ChangingShiftsStatus(CombatStatus):
+    PREPROCESS_TYPES: ClassVar[frozenset[PREPROCESSABLES]] = frozenset((
+        PREPROCESSABLES.SWAP,
+    ))
     COST_DEDUCTION: ClassVar[int] = 1
 
     @override
@@ -743,11 +830,17 @@ class ChangingShiftsStatus(CombatStatus):
                 assert item.dices_cost.num_dices() == item.dices_cost[Element.ANY]
                 new_cost = (item.dices_cost - {Element.ANY: self.COST_DEDUCTION}).validify()
                 return replace(item, dices_cost=new_cost), None
-        return super()._preprocess(game_state, status_source, item, signal)
+        return super(ChangingShiftsStatus, self)._preprocess(
+            game_state, status_source, item, signal,
+        )
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class LeaveItToMeStatus(CombatStatus):
+    PREPROCESS_TYPES: ClassVar[frozenset[PREPROCESSABLES]] = frozenset((
+        PREPROCESSABLES.SWAP,
+    ))
+
     @override
     def _preprocess(
             self,
@@ -761,14 +854,21 @@ class LeaveItToMeStatus(CombatStatus):
             if item.target.pid is status_source.pid \
                     and item.event_speed is evt.EventSpeed.COMBAT_ACTION:
                 return replace(item, event_speed=evt.EventSpeed.FAST_ACTION), None
-        return super()._preprocess(game_state, status_source, item, signal)
+        return super(LeaveItToMeStatus, self)._preprocess(game_state, status_source, item, signal)
 
 
 ############################## Infusions ##############################
 
 
-@dataclass(frozen=True, kw_only=True)
+@dataclass(frozen=True, slots=True, kw_only=True)
 class _InfusionStatus(CharacterStatus, _UsageStatus):
+    PREPROCESS_TYPES: ClassVar[frozenset[PREPROCESSABLES]] = frozenset((
+        PREPROCESSABLES.DMG_ELEMENT,
+        PREPROCESSABLES.DMG_AMOUNT,
+    ))
+    REACTABLE_SIGNALS: ClassVar[frozenset[TRIGGERING_SIGNAL]] = frozenset((
+        TRIGGERING_SIGNAL.ROUND_END,
+    ))
     MAX_USAGES: ClassVar[int] = BIG_INT
     ELEMENT: ClassVar[Optional[Element]] = None
     damage_boost: int = 0
@@ -825,7 +925,7 @@ class _InfusionStatus(CharacterStatus, _UsageStatus):
         return [], replace(self, usages=d_usages)
 
 
-@dataclass(frozen=True, kw_only=True)
+@dataclass(frozen=True, slots=True, kw_only=True)
 class ElectroInfusionStatus(_InfusionStatus):
     ELEMENT: ClassVar[Optional[Element]] = Element.ELECTRO
 
@@ -835,8 +935,11 @@ class ElectroInfusionStatus(_InfusionStatus):
 
 #### Keqing ####
 
-@dataclass(frozen=True, kw_only=True)
+@dataclass(frozen=True, slots=True, kw_only=True)
 class KeqingTalentStatus(CharacterTalentStatus):
+    REACTABLE_SIGNALS: ClassVar[frozenset[TRIGGERING_SIGNAL]] = frozenset((
+        TRIGGERING_SIGNAL.COMBAT_ACTION,
+    ))
     can_infuse: bool
 
     def _react_to_signal(
@@ -849,27 +952,32 @@ class KeqingTalentStatus(CharacterTalentStatus):
         return [], self
 
     def __str__(self) -> str:
-        return super().__str__() + f"({case_val(self.can_infuse, 1, 0)})"  # pragma: no cover
+        return super(KeqingTalentStatus, self).__str__() \
+            + f"({case_val(self.can_infuse, 1, 0)})"  # pragma: no cover
 
 
-@dataclass(frozen=True, kw_only=True)
+@dataclass(frozen=True, slots=True, kw_only=True)
 class ThunderingPenanceStatus(EquipmentStatus):
     pass
 
 
-@dataclass(frozen=True, kw_only=True)
+@dataclass(frozen=True, slots=True, kw_only=True)
 class KeqingElectroInfusionStatus(ElectroInfusionStatus):
     pass
 
     def __str__(self) -> str:
-        return super().__str__() + f"({self.damage_boost})"
+        return super(KeqingElectroInfusionStatus, self).__str__() + f"({self.damage_boost})"
 
 
 #### Kaeya ####
 
 
-@dataclass(frozen=True, kw_only=True)
+@dataclass(frozen=True, slots=True, kw_only=True)
 class Icicle(CombatStatus, _UsageStatus):
+    REACTABLE_SIGNALS: ClassVar[frozenset[TRIGGERING_SIGNAL]] = frozenset((
+        TRIGGERING_SIGNAL.SWAP_EVENT_1,
+        TRIGGERING_SIGNAL.SWAP_EVENT_2,
+    ))
     usages: int = 3
 
     def _react_to_signal(
@@ -892,11 +1000,15 @@ class Icicle(CombatStatus, _UsageStatus):
         return [], self
 
 
-@dataclass(frozen=True, kw_only=True)
+@dataclass(frozen=True, slots=True, kw_only=True)
 class ColdBloodedStrikeStatus(EquipmentStatus):
     """
     Equipping this status implies the equipped character is Kaeya
     """
+    REACTABLE_SIGNALS: ClassVar[frozenset[TRIGGERING_SIGNAL]] = frozenset((
+        TRIGGERING_SIGNAL.COMBAT_ACTION,
+        TRIGGERING_SIGNAL.ROUND_END,
+    ))
     usages: int = 1
     activated: bool = False
 
@@ -946,11 +1058,11 @@ class ColdBloodedStrikeStatus(EquipmentStatus):
         return es, new_self
 
     def __str__(self) -> str:
-        return super().__str__() + case_val(self.activated, "(*)", '')
+        return super(ColdBloodedStrikeStatus, self).__str__() + case_val(self.activated, "(*)", '')
 
 
 #### Rhodeia of Loch ####
 
-@dataclass(frozen=True, kw_only=True)
+@dataclass(frozen=True, slots=True, kw_only=True)
 class StreamingSurgeStatus(EquipmentStatus):
     pass
@@ -1,5 +1,5 @@
 from __future__ import annotations
-from typing import Callable, TYPE_CHECKING
+from typing import Callable, Iterator, TYPE_CHECKING
 
 from ..effect import effect as eft
 from ..status import status as stt
@@ -16,23 +16,24 @@ from .enums import PREPROCESSABLES
 if TYPE_CHECKING:
     from ..card.card import Card
     from ..state.game_state import GameState
+    from ..state.player_state import PlayerState
 
     from .types import Preprocessable
 
 
+StatusKey = None | TRIGGERING_SIGNAL | PREPROCESSABLES
+StatusEntries = tuple[tuple[stt.Status, StaticTarget], ...]
+
+
 class StatusProcessing:
     @staticmethod
-    def loop_one_player_all_statuses(
-            game_state: GameState,
+    def _all_statuses_of(
+            player: PlayerState,
             pid: PID,
-            f: Callable[[GameState, stt.Status, StaticTarget], GameState]
-    ) -> GameState:
+    ) -> Iterator[tuple[stt.Status, StaticTarget]]:
         """
-        Perform f on all statuses of player pid in order
-        f(game_state, status, status_source) -> game_state
+        Yields all statuses of player (whose id is pid) in order, with their sources
         """
-        player = game_state.get_player(pid)
-
         # characters first
         characters = player.get_characters()
         ordered_characters = characters.get_character_in_activity_order()
@@ -46,7 +47,7 @@ class StatusProcessing:
                 character_id
             )
             for status in statuses:
-                game_state = f(game_state, status, target)
+                yield status, target
 
         # combat status
         combat_statuses = player.get_combat_statuses()
@@ -56,7 +57,7 @@ class StatusProcessing:
             -1,  # not used
         )
         for status in combat_statuses:
-            game_state = f(game_state, status, target)
+            yield status, target
 
         # summons
         summons = player.get_summons()
@@ -66,7 +67,7 @@ class StatusProcessing:
             -1,
         )
         for summon in summons:
-            game_state = f(game_state, summon, target)
+            yield summon, target
 
         # supports
         supports = player.get_supports()
@@ -76,8 +77,47 @@ class StatusProcessing:
                 ZONE.SUPPORTS,
                 support.sid,
             )
-            game_state = f(game_state, support, target)
+            yield support, target
+
+    @staticmethod
+    def _is_relevant(status: stt.Status, key: StatusKey) -> bool:
+        if isinstance(key, TRIGGERING_SIGNAL):
+            return key in status.REACTABLE_SIGNALS
+        if isinstance(key, PREPROCESSABLES):
+            return key in status.PREPROCESS_TYPES
+        return status.INFORMABLE
+
+    @staticmethod
+    def _relevant_statuses_of(player: PlayerState, pid: PID, key: StatusKey) -> StatusEntries:
+        """
+        Returns the statuses of player (in order) that may act on key, where key is a
+        signal, a preprocessable or None for information.
+        The result is cached per PlayerState as a PlayerState never changes.
+        """
+        index = player.get_status_index()
+        entries = index.get((pid, key))
+        if entries is None:
+            entries = tuple(
+                (status, target)
+                for status, target in StatusProcessing._all_statuses_of(player, pid)
+                if StatusProcessing._is_relevant(status, key)
+            )
+            index[(pid, key)] = entries
+        return entries
 
+    @staticmethod
+    def loop_one_player_all_statuses(
+            game_state: GameState,
+            pid: PID,
+            f: Callable[[GameState, stt.Status, StaticTarget], GameState]
+    ) -> GameState:
+        """
+        Perform f on all statuses of player pid in order
+        f(game_state, status, status_source) -> game_state
+        """
+        player = game_state.get_player(pid)
+        for status, target in StatusProcessing._all_statuses_of(player, pid):
+            game_state = f(game_state, status, target)
         return game_state
 
     @staticmethod
@@ -94,6 +134,22 @@ class StatusProcessing:
         game_state = StatusProcessing.loop_one_player_all_statuses(game_state, pid.other(), f)
         return game_state
 
+    @staticmethod
+    def loop_all_relevant_statuses(
+            game_state: GameState,
+            pid: PID,
+            key: StatusKey,
+            f: Callable[[GameState, stt.Status, StaticTarget], GameState]
+    ) -> GameState:
+        """
+        Same as loop_all_statuses(), but skips statuses that never act on key
+        """
+        for player_id in (pid, pid.other()):
+            player = game_state.get_player(player_id)
+            for status, target in StatusProcessing._relevant_statuses_of(player, player_id, key):
+                game_state = f(game_state, status, target)
+        return game_state
+
     @staticmethod
     def trigger_all_statuses_effects(
             game_state: GameState, pid: PID, signal: TRIGGERING_SIGNAL
@@ -123,7 +179,7 @@ class StatusProcessing:
 
             return game_state
 
-        StatusProcessing.loop_all_statuses(game_state, pid, f)
+        StatusProcessing.loop_all_relevant_statuses(game_state, pid, signal, f)
         return effects
 
     @staticmethod
@@ -197,7 +253,7 @@ class StatusProcessing:
 
             return game_state
 
-        game_state = StatusProcessing.loop_all_statuses(game_state, pid, f)
+        game_state = StatusProcessing.loop_all_relevant_statuses(game_state, pid, pp_type, f)
         return game_state, item
 
     @staticmethod
@@ -215,5 +271,5 @@ class StatusProcessing:
                 info_source=source,
             )
 
-        game_state = StatusProcessing.loop_all_statuses(game_state, pid, f)
+        game_state = StatusProcessing.loop_all_relevant_statuses(game_state, pid, None, f)
         return game_state
@@ -4,15 +4,19 @@ from typing_extensions import Self
 
 from ..status import status as stt
 
+from ..helper.hash_cache import HashCache
 from ..helper.quality_of_life import just
 
 
 _U = TypeVar('_U')
 
 
-class Statuses:
+class Statuses(HashCache):
+    __slots__ = ("_statuses", "_hash")
+
     def __init__(self, statuses: tuple[stt.Status, ...]):
         self._statuses = statuses
+        self._hash: Optional[int] = None
 
     def update_status(self, incoming_status: stt.Status, override: bool = False) -> Self:
         """
@@ -63,12 +67,16 @@ class Statuses:
         return iter(self._statuses)
 
     def __eq__(self, other: object) -> bool:
+        if self is other:
+            return True
         if not isinstance(other, Statuses):
             return False
-        return self is other or self == other
+        return type(self) is type(other) and self._statuses == other._statuses
 
     def __hash__(self) -> int:
-        return hash(self._statuses)
+        if self._hash is None:
+            self._hash = hash(self._statuses)
+        return self._hash
 
     def __str__(self) -> str:
         return '[' + ', '.join(map(str, self._statuses)) + ']'
@@ -81,12 +89,12 @@ class Statuses:
 
 
 class EquipmentStatuses(Statuses):
-    pass
+    __slots__ = ()
 
 
 class OrderedStatuses(Statuses):
-    pass
+    __slots__ = ()
 
 
 class TalentStatuses(Statuses):
-    pass
+    __slots__ = ()
@@ -15,6 +15,8 @@ if TYPE_CHECKING:
     from ..effect.structs import StaticTarget
 
 
+# Summons are not slotted, as some are also shield statuses and both Summon and
+# _UsageStatus declare `usages`, which slotted bases cannot share.
 @dataclass(frozen=True, kw_only=True)
 class Summon(stt.Status):
     usages: int = -1
@@ -38,6 +40,10 @@ class _DestroyOnNumSummon(Summon):
 
 @dataclass(frozen=True, kw_only=True)
 class _DestoryOnEndNumSummon(Summon):
+    REACTABLE_SIGNALS: ClassVar[frozenset[TRIGGERING_SIGNAL]] = frozenset((
+        TRIGGERING_SIGNAL.END_ROUND_CHECK_OUT,
+    ))
+
     @override
     def _post_react_to_signal(
             self,
@@ -57,6 +63,9 @@ class _DestoryOnEndNumSummon(Summon):
 
 @dataclass(frozen=True, kw_only=True)
 class _DmgPerRoundSummon(_DestroyOnNumSummon):
+    REACTABLE_SIGNALS: ClassVar[frozenset[TRIGGERING_SIGNAL]] = frozenset((
+        TRIGGERING_SIGNAL.END_ROUND_CHECK_OUT,
+    ))
     usages: int = -1
     MAX_USAGES: ClassVar[int] = BIG_INT
     DMG: ClassVar[int] = 0
@@ -97,6 +106,9 @@ class BurningFlameSummon(_DmgPerRoundSummon):
 
 @dataclass(frozen=True, kw_only=True)
 class OceanicMimicFrogSummon(_DestoryOnEndNumSummon, stt.FixedShieldStatus):
+    REACTABLE_SIGNALS: ClassVar[frozenset[TRIGGERING_SIGNAL]] = frozenset((
+        TRIGGERING_SIGNAL.END_ROUND_CHECK_OUT,
+    ))
     usages: int = 2
     MAX_USAGES: ClassVar[int] = 2
     SHIELD_AMOUNT: ClassVar[int] = 1
@@ -1,17 +1,21 @@
 from __future__ import annotations
 from typing import Iterator, Optional, TYPE_CHECKING, Union
 
+from ..helper.hash_cache import HashCache
 from ..helper.quality_of_life import just
 
 if TYPE_CHECKING:
     from .summon import Summon
 
 
-class Summons:
+class Summons(HashCache):
+    __slots__ = ("_summons", "_max_num", "_hash")
+
     def __init__(self, summons: tuple[Summon, ...], max_num: int):
         assert len(summons) <= max_num
         self._summons = summons
         self._max_num = max_num
+        self._hash: Optional[int] = None
 
     def get_summons(self) -> tuple[Summon, ...]:
         return self._summons
@@ -59,6 +63,18 @@ class Summons:
     def __iter__(self) -> Iterator[Summon]:
         return iter(self._summons)
 
+    def __eq__(self, other: object) -> bool:
+        if self is other:
+            return True
+        if not isinstance(other, Summons):
+            return False
+        return self._summons == other._summons and self._max_num == other._max_num
+
+    def __hash__(self) -> int:
+        if self._hash is None:
+            self._hash = hash((self._summons, self._max_num))
+        return self._hash
+
     def __str__(self) -> str:  # pragma: no cover
         return f"[{', '.join(map(str, self._summons))}]"
 
@@ -19,7 +19,7 @@ if TYPE_CHECKING:
     from ..status.types import Preprocessable
 
 
-@dataclass(frozen=True, kw_only=True)
+@dataclass(frozen=True, slots=True, kw_only=True)
 class Support(stt.Status):
     sid: int
 
@@ -32,8 +32,14 @@ class Support(stt.Status):
         return ""
 
 
-@dataclass(frozen=True, kw_only=True)
+@dataclass(frozen=True, slots=True, kw_only=True)
 class XudongSupport(Support):
+    PREPROCESS_TYPES: ClassVar[frozenset[PREPROCESSABLES]] = frozenset((
+        PREPROCESSABLES.CARD,
+    ))
+    REACTABLE_SIGNALS: ClassVar[frozenset[TRIGGERING_SIGNAL]] = frozenset((
+        TRIGGERING_SIGNAL.ROUND_END,
+    ))
     usages: int = 1
     COST_DEDUCTION: ClassVar[int] = 2
 
@@ -61,7 +67,7 @@ class XudongSupport(Support):
                     raise NotImplementedError
                 new_cost = (item.dices_cost - {major_elem: self.COST_DEDUCTION}).validify()
                 return replace(item, dices_cost=new_cost), replace(self, usages=self.usages - 1)
-        return super()._preprocess(game_state, status_source, item, signal)
+        return super(XudongSupport, self)._preprocess(game_state, status_source, item, signal)
 
     @override
     def _react_to_signal(
@@ -1,16 +1,20 @@
 from __future__ import annotations
-from typing import Iterator
+from typing import Iterator, Optional
 
+from ..helper.hash_cache import HashCache
 from ..helper.quality_of_life import just
 
 from .support import Support
 
 
-class Supports:
+class Supports(HashCache):
+    __slots__ = ("_supports", "_max_num", "_hash")
+
     def __init__(self, supports: tuple[Support, ...], max_num: int):
         assert len(supports) <= max_num
         self._supports = supports
         self._max_num = max_num
+        self._hash: Optional[int] = None
 
     def get_supports(self) -> tuple[Support, ...]:
         return self._supports
@@ -103,6 +107,18 @@ class Supports:
     def __iter__(self) -> Iterator[Support]:
         return iter(self._supports)
 
+    def __eq__(self, other: object) -> bool:
+        if self is other:
+            return True
+        if not isinstance(other, Supports):
+            return False
+        return self._supports == other._supports and self._max_num == other._max_num
+
+    def __hash__(self) -> int:
+        if self._hash is None:
+            self._hash = hash((self._supports, self._max_num))
+        return self._hash
+
     def __str__(self) -> str:  # pragma: no cover
         return f"[{', '.join(map(str, self._supports))}]"
 
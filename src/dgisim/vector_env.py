@@ -0,0 +1,297 @@
+"""
+A batched, gym style environment over many independent games for RL training.
+
+Between two decisions of the learner, games are fast-forwarded with
+`GameState.auto_step()` and the opponent's (if any) actions are played in place,
+so only decision points are ever returned. Finished games are reset right away.
+
+Requires numpy (`pip install dgisim[numpy]`).
+"""
+from __future__ import annotations
+
+import multiprocessing as mp
+from dataclasses import dataclass
+from multiprocessing.connection import Connection
+from typing import Callable, Optional, Sequence
+
+import numpy as np
+
+from .action.action_space import ActionSpace
+from .encoding import ObservationEncoder
+from .helper.rng import RNG
+from .history_view import HistoryView
+from .player_agent import PlayerAgent
+from .runner import agent_seed, game_seed
+from .state.enums import PID
+from .state.game_state import GameState
+
+__all__ = [
+    "StepResult",
+    "VectorEnv",
+]
+
+GameStateFactory = Callable[[], GameState]
+# called with the keyword argument `seed`, like the constructors of the agents
+AgentFactory = Callable[..., PlayerAgent]
+
+
+@dataclass(frozen=True)
+class StepResult:
+    """
+    The batched outcome of VectorEnv.reset() or VectorEnv.step(), row i is game i
+
+    - `observations`: (K, F) float32, encoded from the perspective of `pids`
+    - `rewards`: (K,) float32, 1 for a win and -1 for a loss of the player that
+      acted, 0 otherwise
+    - `dones`: (K,) bool, whether game i ended (and was reset) in this step
+    - `masks`: (K, A) bool, legal actions of the next decision
+    - `pids`: (K,) int8, the PID value of the player to make the next decision
+    """
+    observations: np.ndarray
+    rewards: np.ndarray
+    dones: np.ndarray
+    masks: np.ndarray
+    pids: np.ndarray
+
+
+class _EnvShard:
+    """ the games of a VectorEnv hosted by one process """
+
+    _PATIENCE = 5
+
+    def __init__(
+            self,
+            game_state_factory: GameStateFactory,
+            opponent_factory: Optional[AgentFactory],
+            learner_pid: PID,
+            env_ids: Sequence[int],
+            num_envs: int,
+            seed: int,
+    ) -> None:
+        self._game_state_factory = game_state_factory
+        self._opponent_factory = opponent_factory
+        self._learner_pid = learner_pid
+        self._env_ids = tuple(env_ids)
+        self._num_envs = num_envs
+        self._seed = seed
+        mode = game_state_factory().get_mode()
+        self.action_space = ActionSpace(mode)
+        self.encoder = ObservationEncoder(mode)
+        self._episodes = [0] * len(self._env_ids)
+        self._game_states: list[GameState] = []
+        self._opponents: list[Optional[PlayerAgent]] = []
+
+    def _new_game(self, i: int) -> tuple[GameState, Optional[PlayerAgent]]:
+        # episodes of all envs are numbered apart, so seeds never repeat
+        episode_id = self._episodes[i] * self._num_envs + self._env_ids[i]
+        self._episodes[i] += 1
+        seed = game_seed(self._seed, episode_id)
+        game_state = self._game_state_factory().factory().rng(RNG(seed)).build()
+        opponent = None if self._opponent_factory is None else self._opponent_factory(
+            seed=agent_seed(seed, self._learner_pid.other())
+        )
+        return self._fast_forward(game_state, opponent), opponent
+
+    def _fast_forward(self, game_state: GameState, opponent: Optional[PlayerAgent]) -> GameState:
+        """ plays on until the game ends or waits for the learner """
+        while True:
+            game_state = game_state.auto_step()
+            if game_state.game_end():
+                return game_state
+            pid = game_state.waiting_for()
+            if opponent is None or pid is self._learner_pid:
+                return game_state
+            assert pid is not None
+            next_state: Optional[GameState] = None
+            patience = self._PATIENCE
+            while next_state is None and patience > 0:
+                next_state = game_state.action_step(
+                    pid,
+                    opponent.choose_action(HistoryView.of_state(game_state), pid),
+                )
+                patience -= 1
+            if next_state is None:
+                raise Exception(f"Opponent failed to act at game state:\n{game_state}")
+            game_state = next_state
+
+    def _acting_pid(self, i: int) -> PID:
+        pid = self._game_states[i].waiting_for()
+        assert pid is not None
+        return pid
+
+    def _result(self, rewards: np.ndarray, dones: np.ndarray) -> StepResult:
+        pids = [self._acting_pid(i) for i in range(len(self._game_states))]
+        return StepResult(
+            observations=self.encoder.encode_batch(self._game_states, pids),
+            rewards=rewards,
+            dones=dones,
+            masks=self.action_space.batch_mask(self._game_states, pids),
+            pids=np.fromiter((pid.value for pid in pids), dtype=np.int8, count=len(pids)),
+        )
+
+    def reset(self) -> StepResult:
+        games = [self._new_game(i) for i in range(len(self._env_ids))]
+        self._game_states = [game_state for game_state, _ in games]
+        self._opponents = [opponent for _, opponent in games]
+        num = len(self._env_ids)
+        return self._result(np.zeros(num, dtype=np.float32), np.zeros(num, dtype=np.bool_))
+
+    def step(self, actions: Sequence[int]) -> StepResult:
+        num = len(self._env_ids)
+        if len(actions) != num:
+            raise Exception(f"Expected {num} actions but got {len(actions)}")
+        rewards = np.zeros(num, dtype=np.float32)
+        dones = np.zeros(num, dtype=np.bool_)
+        for i, index in enumerate(actions):
+            game_state = self._game_states[i]
+            pid = self._acting_pid(i)
+            action = self.action_space.decode(index, game_state, pid)
+            next_state = game_state.action_step(pid, action)
+            assert next_state is not None
+            game_state = self._fast_forward(next_state, self._opponents[i])
+            if game_state.game_end():
+                winner = game_state.get_winner()
+                if winner is not None:
+                    rewards[i] = 1 if winner is pid else -1
+                dones[i] = True
+                self._game_states[i], self._opponents[i] = self._new_game(i)
+            else:
+                self._game_states[i] = game_state
+        return self._result(rewards, dones)
+
+    def get_game_states(self) -> tuple[GameState, ...]:
+        return tuple(self._game_states)
+
+
+def _shard_worker(conn: Connection, shard_args: tuple) -> None:
+    shard = _EnvShard(*shard_args)
+    try:
+        while True:
+            command, data = conn.recv()
+            if command == "reset":
+                conn.send(shard.reset())
+            elif command == "step":
+                conn.send(shard.step(data))
+            elif command == "game_states":
+                conn.send(shard.get_game_states())
+            elif command == "close":
+                break
+    finally:
+        conn.close()
+
+
+class VectorEnv:
+    """
+    K independent games stepped together.
+
+    - `opponent_factory` creates the opponent of each game, who plays the player
+      other than `learner_pid`; without it, the learner plays both players and
+      each decision is observed from the player to act (`StepResult.pids`); it
+      is called with the keyword argument `seed`, `agent_seed()` of the game
+    - game factories must be picklable (e.g. module level functions or classes)
+      when `num_workers` is greater than 1, games are then sharded across that
+      many subprocesses
+    - the n-th game of env i is played with seed `game_seed(seed, n * K + i)`, so
+      results do not depend on the number of workers
+
+    Actions are indices of `action_space`; an illegal index raises.
+    """
+
+    def __init__(
+            self,
+            num_envs: int,
+            game_state_factory: GameStateFactory = GameState.from_default,
+            opponent_factory: Optional[AgentFactory] = None,
+            learner_pid: PID = PID.P1,
+            num_workers: int = 1,
+            seed: int = 0,
+    ) -> None:
+        if num_envs <= 0:
+            raise Exception(f"num_envs should be positive, got {num_envs}")
+        self._num_envs = num_envs
+        mode = game_state_factory().get_mode()
+        self.action_space = ActionSpace(mode)
+        self.encoder = ObservationEncoder(mode)
+        num_workers = max(1, min(num_workers, num_envs))
+        shards = [
+            list(range(num_envs))[w::num_workers]
+            for w in range(num_workers)
+        ]
+        # shards are interleaved, order maps each shard's rows back to env ids
+        self._order = np.argsort(np.concatenate(shards))
+        self._local: Optional[_EnvShard] = None
+        self._conns: list[Connection] = []
+        self._processes: list[mp.process.BaseProcess] = []
+        if num_workers == 1:
+            self._local = _EnvShard(
+                game_state_factory, opponent_factory, learner_pid,
+                shards[0], num_envs, seed,
+            )
+            return
+        for env_ids in shards:
+            conn, worker_conn = mp.Pipe()
+            process = mp.Process(
+                target=_shard_worker,
+                args=(
+                    worker_conn,
+                    (game_state_factory, opponent_factory, learner_pid, env_ids, num_envs, seed),
+                ),
+                daemon=True,
+            )
+            process.start()
+            worker_conn.close()
+            self._conns.append(conn)
+            self._processes.append(process)
+
+    def num_envs(self) -> int:
+        return self._num_envs
+
+    def _merge(self, results: list[StepResult]) -> StepResult:
+        return StepResult(*(
+            np.concatenate([getattr(result, field) for result in results])[self._order]
+            for field in ("observations", "rewards", "dones", "masks", "pids")
+        ))
+
+    def reset(self) -> StepResult:
+        """ starts a new game in every env """
+        if self._local is not None:
+            return self._local.reset()
+        for conn in self._conns:
+            conn.send(("reset", None))
+        return self._merge([conn.recv() for conn in self._conns])
+
+    def step(self, actions: Sequence[int] | np.ndarray) -> StepResult:
+        """ plays actions[i] in game i, games that end are reset """
+        if len(actions) != self._num_envs:
+            raise Exception(f"Expected {self._num_envs} actions but got {len(actions)}")
+        if self._local is not None:
+            return self._local.step([int(index) for index in actions])
+        num_workers = len(self._conns)
+        for w, conn in enumerate(self._conns):
+            conn.send(("step", [int(index) for index in actions[w::num_workers]]))
+        return self._merge([conn.recv() for conn in self._conns])
+
+    def get_game_states(self) -> tuple[GameState, ...]:
+        """ the current game state of each env """
+        if self._local is not None:
+            return self._local.get_game_states()
+        for conn in self._conns:
+            conn.send(("game_states", None))
+        shard_states = [conn.recv() for conn in self._conns]
+        game_states = [game_state for states in shard_states for game_state in states]
+        return tuple(game_states[i] for i in self._order)
+
+    def close(self) -> None:
+        for conn in self._conns:
+            conn.send(("close", None))
+            conn.close()
+        for process in self._processes:
+            process.join()
+        self._conns = []
+        self._processes = []
+
+    def __enter__(self) -> VectorEnv:
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
@@ -0,0 +1,45 @@
+"""
+Compares GameState.to_bytes() / from_bytes() with pickle, in size and speed, on
+the states of recorded random games.
+
+Run with `python -m src.profiles.codec_vs_pickle [num_games]`.
+"""
+import pickle
+import sys
+import time
+from typing import Callable, Iterable
+
+from src.dgisim.state.game_state import GameState
+from src.profiles.memory_game_state import recorded_states
+
+
+def _timed(f: Callable, items: Iterable) -> tuple[list, float]:
+    start = time.perf_counter()
+    results = [f(item) for item in items]
+    return results, time.perf_counter() - start
+
+
+def compare(num_games: int = 5) -> None:
+    game_states = recorded_states(num_games)
+    num = len(game_states)
+    encoded, encode_time = _timed(GameState.to_bytes, game_states)
+    _, decode_time = _timed(GameState.from_bytes, encoded)
+    pickled, pickle_time = _timed(
+        lambda game_state: pickle.dumps(game_state, pickle.HIGHEST_PROTOCOL),
+        game_states,
+    )
+    _, unpickle_time = _timed(pickle.loads, pickled)
+    print(f"{num} game states")
+    print(f"{'':>8} {'bytes/state':>12} {'encode us':>10} {'decode us':>10}")
+    for name, data, dump_time, load_time in (
+            ("codec", encoded, encode_time, decode_time),
+            ("pickle", pickled, pickle_time, unpickle_time),
+    ):
+        print(
+            f"{name:>8} {sum(map(len, data)) / num:12.1f}"
+            f" {dump_time / num * 1e6:10.1f} {load_time / num * 1e6:10.1f}"
+        )
+
+
+if __name__ == "__main__":
+    compare(*(int(arg) for arg in sys.argv[1:]))
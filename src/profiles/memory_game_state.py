@@ -0,0 +1,77 @@
+"""
+Reports the memory retained per GameState of fully recorded random games.
+
+Consecutive game states share most of their sub-objects, so the figure is the
+memory freed when the recorded states are dropped (measured with tracemalloc),
+divided by the number of states. The distinct objects reachable from the states
+are also counted per type.
+
+Run with `python -m src.profiles.memory_game_state [num_games]`.
+"""
+import gc
+import sys
+import tracemalloc
+from collections import Counter
+from enum import Enum
+from types import BuiltinFunctionType, FunctionType, ModuleType
+
+from src.dgisim.agents import RandomAgent
+from src.dgisim.game_state_machine import GameStateMachine
+from src.dgisim.phase.game_end_phase import GameEndPhase
+from src.dgisim.state.game_state import GameState
+
+_SHARED = (type, ModuleType, FunctionType, BuiltinFunctionType, Enum)
+
+
+def object_counts(roots: list) -> Counter:
+    """ the number of distinct objects of each type reachable from roots """
+    seen: set[int] = {id(roots)}
+    counts: Counter = Counter()
+    stack = list(roots)
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen or isinstance(obj, _SHARED):
+            continue
+        seen.add(id(obj))
+        counts[type(obj).__name__] += 1
+        stack.extend(gc.get_referents(obj))
+    return counts
+
+
+def recorded_states(num_games: int) -> list[GameState]:
+    game_states: list[GameState] = []
+    for seed in range(num_games):
+        state_machine = GameStateMachine(
+            GameState.from_default(seed=seed),
+            RandomAgent(seed=seed),
+            RandomAgent(seed=seed + num_games),
+        )
+        state_machine.step_until_phase(GameEndPhase)
+        game_states.extend(state_machine.get_history())
+    return game_states
+
+
+def retained_bytes(num_games: int = 5) -> tuple[int, int]:
+    """ the bytes retained by the recorded states of num_games games, and their number """
+    recorded_states(1)  # warms up module level caches
+    gc.collect()
+    tracemalloc.start()
+    game_states = recorded_states(num_games)
+    gc.collect()
+    with_states = tracemalloc.get_traced_memory()[0]
+    num_states = len(game_states)
+    counts = object_counts(game_states)
+    del game_states
+    gc.collect()
+    without_states = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    print(f"{num_states} game states retain {with_states - without_states} bytes")
+    print(f"{(with_states - without_states) / num_states:.1f} bytes per game state")
+    print("distinct objects per game state:")
+    for name, count in counts.most_common(15):
+        print(f"{name:>30}: {count / num_states:7.2f}")
+    return with_states - without_states, num_states
+
+
+if __name__ == "__main__":
+    retained_bytes(*(int(arg) for arg in sys.argv[1:]))
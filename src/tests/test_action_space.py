@@ -0,0 +1,52 @@
+import unittest
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None  # type: ignore
+
+from src.dgisim.agents import RandomAgent
+from src.dgisim.game_state_machine import GameStateMachine
+from src.dgisim.mode import DefaultMode
+from src.dgisim.state.enums import PID
+from src.dgisim.state.game_state import GameState
+
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class TestActionSpace(unittest.TestCase):
+    def test_legal_actions_round_trip(self):
+        from src.dgisim.action.action_space import ActionSpace
+        action_space = ActionSpace(DefaultMode())
+        state_machine = GameStateMachine(
+            GameState.from_default(seed=3),
+            RandomAgent(seed=3),
+            RandomAgent(seed=4),
+        )
+        game_states: list[GameState] = []
+        while not state_machine.game_end():
+            state_machine.auto_step(fast=True)
+            game_state = state_machine.get_game_state()
+            if game_state.game_end():
+                self.assertFalse(action_space.mask(game_state).any())
+                break
+            pid = game_state.waiting_for()
+            assert pid is not None
+            game_states.append(game_state)
+
+            mask = action_space.mask(game_state)
+            self.assertEqual(mask.shape, (action_space.size(),))
+            self.assertTrue(mask.any())
+            self.assertFalse(action_space.mask(game_state, pid.other()).any())
+            for index in np.flatnonzero(mask):
+                action = action_space.decode(int(index), game_state)
+                self.assertIn(action, game_state.legal_actions(pid))
+                self.assertEqual(action_space.encode(action), index)
+            for index in np.flatnonzero(~mask):
+                self.assertRaises(Exception, action_space.decode, int(index), game_state)
+            state_machine.one_step()
+
+        batch_mask = action_space.batch_mask(game_states)
+        self.assertEqual(batch_mask.shape, (len(game_states), action_space.size()))
+        for row, game_state in zip(batch_mask, game_states):
+            self.assertTrue((row == action_space.mask(game_state)).all())
+        self.assertEqual(action_space.batch_mask([]).shape, (0, action_space.size()))
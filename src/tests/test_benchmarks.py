@@ -0,0 +1,52 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+
+from src.benchmarks.__main__ import main
+from src.benchmarks.suite import BENCHMARKS, record_games
+
+
+class TestBenchmarks(unittest.TestCase):
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.path = os.path.join(tmp_dir.name, "results.json")
+
+    def _main(self, *args: str) -> int:
+        with redirect_stdout(io.StringIO()), redirect_stderr(io.StringIO()):
+            return main(["--results", self.path, *args])
+
+    def test_every_benchmark_runs(self):
+        recorded = record_games(num_games=1, repeats=1)
+        for name, benchmark in BENCHMARKS.items():
+            self.assertGreater(benchmark(recorded).value, 0, name)
+
+    def test_run_and_compare(self):
+        self.assertEqual(self._main("run", "--games", "1", "--repeats", "1", "--only", "eq_us"), 0)
+        with open(self.path) as file:
+            all_results = json.load(file)
+        self.assertEqual(len(all_results), 1)
+        (_, run), = all_results.items()
+        self.assertIn("eq_us", run["results"])
+
+        def with_values(eq_us: float, steps: float) -> dict:
+            return {"results": {
+                "eq_us": {"value": eq_us, "unit": "us", "higher_is_better": False},
+                "steps": {"value": steps, "unit": "steps/s", "higher_is_better": True},
+            }}
+
+        with open(self.path, "w") as file:
+            json.dump({
+                "base": with_values(10, 100),
+                "faster": with_values(9, 120),
+                "slower": with_values(10, 80),
+            }, file)
+        self.assertEqual(self._main("compare", "base", "faster"), 0)
+        self.assertEqual(self._main("compare", "base", "slower"), 1)
+        self.assertEqual(self._main("compare", "base", "slower", "--threshold", "0.25"), 0)
+        # the two latest runs by default
+        self.assertEqual(self._main("compare"), 1)
+        self.assertEqual(self._main("compare", "base", "missing"), 2)
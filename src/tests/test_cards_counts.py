@@ -0,0 +1,49 @@
+import pickle
+import random
+import unittest
+
+from src.dgisim.card.card import *
+from src.dgisim.card.cards import Cards, card_id
+
+
+class TestCardsCounts(unittest.TestCase):
+
+    def test_arithmetics(self):
+        cards = Cards({JueyunGuoba: 2, Starsigns: 1})
+        self.assertEqual(cards.num_cards(), 3)
+        self.assertTrue(cards.contains(JueyunGuoba))
+        self.assertFalse(cards.contains(SweetMadame))
+        self.assertEqual(cards[SweetMadame], 0)
+        self.assertEqual(cards.add(SweetMadame)[SweetMadame], 1)
+        self.assertEqual(cards.remove_all(JueyunGuoba), Cards({Starsigns: 1}))
+        self.assertEqual(cards - cards, Cards.from_empty())
+        self.assertTrue((cards - cards).empty())
+        self.assertFalse((cards - cards).not_empty())
+        self.assertTrue(cards.not_empty())
+        self.assertFalse(cards.empty())
+        self.assertEqual(Cards({SweetMadame: 0}), Cards({}))
+        self.assertEqual(hash(Cards({SweetMadame: 0})), hash(Cards({})))
+        self.assertEqual(list(cards), sorted(cards, key=card_id))
+        self.assertEqual(pickle.loads(pickle.dumps(cards)), cards)
+
+    def test_pick_random_cards(self):
+        deck = Cards({JueyunGuoba: 2, Starsigns: 1, SweetMadame: 3})
+        left, picked = deck.pick_random_cards(4, random.Random(0))
+        self.assertEqual(picked.num_cards(), 4)
+        self.assertEqual(left + picked, deck)
+        self.assertEqual(
+            (left, picked),
+            deck.pick_random_cards(4, random.Random(0)),
+        )
+        left, picked = deck.pick_random_cards(10, random.Random(0))
+        self.assertEqual(picked, deck)
+        self.assertTrue(left.empty())
+
+    def test_stable_ids(self):
+        from src.dgisim.card.cards_set import default_cards, generated_cards
+        ids = [
+            card_id(card)
+            for cards in (default_cards(), generated_cards())
+            for card in sorted(cards, key=lambda card: card.name())
+        ]
+        self.assertEqual(ids, list(range(len(ids))))
@@ -0,0 +1,117 @@
+import unittest
+
+from src.dgisim.agents import RandomAgent
+from src.dgisim.card.cards import Cards
+from src.dgisim.card.cards_set import default_cards, generated_cards
+from src.dgisim.character.characters import Characters
+from src.dgisim.character.characters_set import default_characters
+from src.dgisim.dices import ActualDices
+from src.dgisim.element.element import Element
+from src.dgisim.game_state_machine import GameStateMachine
+from src.dgisim.phase.game_end_phase import GameEndPhase
+from src.dgisim.state.game_state import GameState
+from src.dgisim.status import status as stt
+from src.dgisim.status.statuses import Statuses
+
+
+class TestCodec(unittest.TestCase):
+    def assertRoundTrips(self, game_state: GameState) -> None:
+        data = game_state.to_bytes()
+        decoded = GameState.from_bytes(data)
+        self.assertEqual(decoded, game_state)
+        self.assertEqual(decoded.to_bytes(), data)
+
+    def test_round_trip_random_games(self):
+        for seed in range(3):
+            state_machine = GameStateMachine(
+                GameState.from_default(seed=seed),
+                RandomAgent(seed=seed),
+                RandomAgent(seed=seed + 10),
+            )
+            state_machine.step_until_phase(GameEndPhase)
+            for game_state in state_machine.get_history():
+                self.assertRoundTrips(game_state)
+
+    def test_negative_seed(self):
+        for seed in (-1, -2 ** 70):
+            game_state = GameState.from_default(seed=seed)
+            self.assertRoundTrips(game_state)
+            self.assertRoundTrips(game_state.step())
+
+    def test_every_card_and_character(self):
+        game_state = GameState.from_default(seed=1)
+        player = game_state.get_player1()
+        all_cards = Cards(dict((card, 1) for card in default_cards() | generated_cards()))
+        no_arg_statuses = []
+        for cls in vars(stt).values():
+            if isinstance(cls, type) and issubclass(cls, stt.Status) \
+                    and not cls.__name__.startswith("_"):
+                try:
+                    no_arg_statuses.append(cls())
+                except Exception:
+                    pass
+        self.assertTrue(no_arg_statuses)
+        for char_type in default_characters():
+            characters = tuple(
+                char_type.from_default(i).factory().hp(i).build()
+                for i in range(1, 4)
+            )
+            new_state = game_state.factory().player1(
+                player.factory().characters(
+                    Characters(characters, 2)
+                ).combat_statuses(
+                    Statuses(tuple(no_arg_statuses))
+                ).hand_cards(
+                    all_cards
+                ).publicly_used_cards(
+                    all_cards + all_cards
+                ).dices(
+                    ActualDices({Element.OMNI: 3, Element.PYRO: 1, Element.GEO: 2})
+                ).build()
+            ).build()
+            self.assertRoundTrips(new_state)
+
+    def test_rejects_invalid_data(self):
+        data = GameState.from_default(seed=2).to_bytes()
+        self.assertRaises(Exception, GameState.from_bytes, b"")
+        self.assertRaises(Exception, GameState.from_bytes, b"XXX" + data[3:])
+        self.assertRaises(Exception, GameState.from_bytes, data[:3] + b"\xff" + data[4:])
+        self.assertRaises(Exception, GameState.from_bytes, data[:4] + b"\0\0\0\0" + data[8:])
+        self.assertRaises(Exception, GameState.from_bytes, data + b"\0")
+
+    def test_diff_round_trip(self):
+        state_machine = GameStateMachine(
+            GameState.from_default(seed=3),
+            RandomAgent(seed=3),
+            RandomAgent(seed=13),
+        )
+        state_machine.step_until_phase(GameEndPhase)
+        history = state_machine.get_history()
+        for base, target in zip(history, history[1:]):
+            diff = base.diff(target)
+            self.assertLess(len(diff), len(target.to_bytes()))
+            self.assertEqual(base.apply_diff(diff), target)
+        # deltas between unrelated states and from decoded states
+        for base, target in zip(history[::7], history[len(history) // 2::5]):
+            decoded_base = GameState.from_bytes(base.to_bytes())
+            self.assertEqual(decoded_base.apply_diff(decoded_base.diff(target)), target)
+            self.assertEqual(target.apply_diff(target.diff(base)), base)
+        # deltas changing the RNG to and from negative seeds
+        negative = GameState.from_default(seed=-3)
+        self.assertEqual(history[0].apply_diff(history[0].diff(negative)), negative)
+        self.assertEqual(negative.apply_diff(negative.diff(history[0])), history[0])
+
+    def test_apply_diff_shares_unchanged_parts(self):
+        base = GameState.from_default(seed=4).step()
+        base_player = base.get_player2()
+        target = base.factory().player1(
+            base.get_player1().factory().dices(ActualDices({Element.OMNI: 8})).build()
+        ).build()
+        new_state = base.apply_diff(base.diff(target))
+        self.assertEqual(new_state, target)
+        self.assertIs(new_state.get_player2(), base_player)
+        self.assertIs(
+            new_state.get_player1().get_characters(),
+            base.get_player1().get_characters(),
+        )
+        self.assertEqual(base.apply_diff(base.diff(base)), base)
@@ -0,0 +1,54 @@
+import unittest
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None  # type: ignore
+
+from src.dgisim.agents import RandomAgent
+from src.dgisim.game_state_machine import GameStateMachine
+from src.dgisim.state.enums import PID
+from src.dgisim.state.game_state import GameState
+
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class TestDeterminization(unittest.TestCase):
+    def test_samples_are_consistent(self):
+        from src.dgisim.determinization import Determinizer
+        state_machine = GameStateMachine(
+            GameState.from_default(seed=8),
+            RandomAgent(seed=8),
+            RandomAgent(seed=9),
+        )
+        for _ in range(20):
+            state_machine.player_step(fast=True)
+        game_state = state_machine.get_game_state()
+        me = game_state.get_player1()
+        opponent = game_state.get_player2()
+        unseen = opponent.get_hand_cards() + opponent.get_deck_cards()
+
+        determinizer = Determinizer(seed=8)
+        samples = determinizer.sample(game_state, PID.P1, 50)
+        self.assertEqual(len(samples), 50)
+        hands = set()
+        for sample in samples:
+            self.assertIs(sample.get_player1(), me)
+            sample_opponent = sample.get_player2()
+            hand = sample_opponent.get_hand_cards()
+            hands.add(hand)
+            self.assertEqual(hand.num_cards(), opponent.get_hand_cards().num_cards())
+            self.assertEqual(hand + sample_opponent.get_deck_cards(), unseen)
+            self.assertIs(sample_opponent.get_characters(), opponent.get_characters())
+            self.assertIs(sample_opponent.get_dices(), opponent.get_dices())
+            self.assertNotEqual(sample.get_rng(), game_state.get_rng())
+        self.assertGreater(len(hands), 1)
+
+        # the samples of an information set are cached
+        fewer = determinizer.sample(game_state, PID.P1, 10)
+        self.assertEqual(
+            [sample.get_player2() for sample in fewer],
+            [sample.get_player2() for sample in samples[:10]],
+        )
+        # determinizations can be played on
+        for sample in samples[:5]:
+            sample.auto_step()
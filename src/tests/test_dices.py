@@ -2,6 +2,7 @@ import unittest
 
 from src.dgisim.dices import *
 from src.dgisim.element.element import *
+from src.dgisim.helper.quality_of_life import BIG_INT
 
 
 class TestDices(unittest.TestCase):
@@ -116,3 +117,72 @@ class TestDices(unittest.TestCase):
         self.assertFalse(payment4.just_satisfy(requirement))
         self.assertFalse(payment5.just_satisfy(requirement))
 
+
+    def test_arithmetics_and_legality(self):
+        dices = ActualDices({Element.OMNI: 2, Element.PYRO: 1})
+        self.assertEqual(dices + {Element.PYRO: 1}, ActualDices({Element.OMNI: 2, Element.PYRO: 2}))
+        self.assertEqual(dices - dices, ActualDices.from_empty())
+        self.assertEqual(ActualDices({Element.GEO: 0}), ActualDices({}))
+        self.assertEqual(hash(ActualDices({Element.GEO: 0})), hash(ActualDices({})))
+        self.assertEqual((dices + dices).num_dices(), 6)
+
+        negative = dices - {Element.PYRO: 2}
+        self.assertFalse(negative.is_legal())
+        self.assertEqual(negative.validify(), ActualDices({Element.OMNI: 2}))
+        self.assertFalse(ActualDices({Element.ANY: 1}).is_legal())
+        self.assertTrue(AbstractDices({Element.ANY: 1}).is_legal())
+        self.assertIsNone(ActualDices.from_dices(AbstractDices({Element.ANY: 1})))
+
+        big = AbstractDices({Element.OMNI: BIG_INT})
+        self.assertTrue(big.is_legal())
+        self.assertEqual(big[Element.OMNI], BIG_INT)
+        self.assertFalse(ActualDices({Element.OMNI: 8}).loosely_satisfy(big))
+
+    def test_basically_satisfy(self):
+        dices = ActualDices({
+            Element.OMNI: 2,
+            Element.PYRO: 1,
+            Element.GEO: 2,
+        })
+        self.assertEqual(
+            dices.basically_satisfy(AbstractDices({Element.ANY: 2})),
+            ActualDices({Element.PYRO: 1, Element.GEO: 1}),
+        )
+        self.assertEqual(
+            dices.basically_satisfy(AbstractDices({Element.PYRO: 2})),
+            ActualDices({Element.PYRO: 1, Element.OMNI: 1}),
+        )
+        self.assertEqual(
+            dices.basically_satisfy(AbstractDices({Element.OMNI: 2})),
+            ActualDices({Element.GEO: 2}),
+        )
+        self.assertIsNone(dices.basically_satisfy(AbstractDices({Element.ELECTRO: 3})))
+        self.assertIsNone(dices.basically_satisfy(AbstractDices({Element.ANY: 6})))
+
+    def test_all_payments(self):
+        dices = ActualDices({
+            Element.OMNI: 1,
+            Element.PYRO: 2,
+            Element.GEO: 1,
+        })
+        payments = dices.all_payments(AbstractDices({Element.OMNI: 2}))
+        self.assertCountEqual(payments, (
+            ActualDices({Element.PYRO: 2}),
+            ActualDices({Element.OMNI: 1, Element.PYRO: 1}),
+            ActualDices({Element.OMNI: 1, Element.GEO: 1}),
+        ))
+        payments = dices.all_payments(AbstractDices({Element.PYRO: 1, Element.ANY: 1}))
+        self.assertCountEqual(payments, (
+            ActualDices({Element.PYRO: 2}),
+            ActualDices({Element.OMNI: 1, Element.PYRO: 1}),
+            ActualDices({Element.PYRO: 1, Element.GEO: 1}),
+            ActualDices({Element.OMNI: 1, Element.GEO: 1}),
+        ))
+        for payment in payments:
+            self.assertTrue(payment.just_satisfy(AbstractDices({Element.PYRO: 1, Element.ANY: 1})))
+        self.assertIn(
+            dices.basically_satisfy(AbstractDices({Element.PYRO: 1, Element.ANY: 1})),
+            payments,
+        )
+        self.assertEqual(dices.all_payments(AbstractDices({Element.GEO: 3})), ())
+        self.assertEqual(dices.all_payments(AbstractDices({Element.ANY: 5})), ())
@@ -0,0 +1,48 @@
+import pickle
+import unittest
+
+from src.dgisim.effect.effect import *
+from src.dgisim.effect.effect_stack import EffectStack
+
+
+class TestEffectStack(unittest.TestCase):
+    _EFFECTS = (
+        TurnEndEffect(),
+        EndRoundEffect(),
+        DeathSwapPhaseStartEffect(),
+    )
+
+    def test_push_and_pop(self):
+        effect_stack = EffectStack(())
+        self.assertTrue(effect_stack.is_empty())
+        effect_stack = effect_stack.push_many_lf(self._EFFECTS)
+        self.assertEqual(effect_stack, EffectStack(self._EFFECTS))
+        self.assertEqual(effect_stack.peek(), self._EFFECTS[-1])
+        popped_stack, effect = effect_stack.pop()
+        self.assertEqual(effect, self._EFFECTS[-1])
+        self.assertEqual(popped_stack, EffectStack(self._EFFECTS[:-1]))
+        self.assertEqual(effect_stack, EffectStack(self._EFFECTS))  # immutable
+        self.assertEqual(
+            EffectStack(()).push_many_fl(self._EFFECTS),
+            EffectStack(self._EFFECTS[::-1]),
+        )
+        self.assertTrue(effect_stack.contains(EndRoundEffect))
+        self.assertFalse(popped_stack.contains(DeathSwapPhaseStartEffect))
+
+    def test_eq_and_hash(self):
+        base = EffectStack(self._EFFECTS[:1])
+        shared = base.push_one(self._EFFECTS[1])
+        separate = EffectStack(self._EFFECTS[:2])
+        self.assertEqual(shared, separate)
+        self.assertEqual(hash(shared), hash(separate))
+        self.assertEqual(hash(shared), hash(shared.push_one(self._EFFECTS[2]).pop()[0]))
+        self.assertNotEqual(shared, base)
+        self.assertNotEqual(shared, EffectStack(self._EFFECTS[1::-1]))
+        self.assertEqual(hash(EffectStack(())), hash(base.pop()[0]))
+
+    def test_pickle(self):
+        effect_stack = EffectStack(self._EFFECTS)
+        hash(effect_stack)
+        unpickled_stack = pickle.loads(pickle.dumps(effect_stack))
+        self.assertEqual(unpickled_stack, effect_stack)
+        self.assertEqual(hash(unpickled_stack), hash(effect_stack))
@@ -0,0 +1,63 @@
+import unittest
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None  # type: ignore
+
+from src.dgisim.agents import RandomAgent
+from src.dgisim.game_state_machine import GameStateMachine
+from src.dgisim.mode import DefaultMode
+from src.dgisim.state.enums import PID
+from src.dgisim.state.game_state import GameState
+
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class TestEncoding(unittest.TestCase):
+    @staticmethod
+    def _game_states() -> list[GameState]:
+        state_machine = GameStateMachine(
+            GameState.from_default(seed=5),
+            RandomAgent(seed=5),
+            RandomAgent(seed=6),
+        )
+        while not state_machine.game_end():
+            state_machine.one_step()
+        return list(state_machine.get_history())
+
+    def test_encode_batch(self):
+        from src.dgisim.encoding import ObservationEncoder
+        encoder = ObservationEncoder(DefaultMode())
+        game_states = self._game_states()
+
+        batch = encoder.encode_batch(game_states, PID.P1)
+        self.assertEqual(batch.shape, (len(game_states), encoder.size()))
+        self.assertEqual(batch.dtype, np.float32)
+        for row, game_state in zip(batch, game_states):
+            self.assertTrue((row == encoder.encode(game_state, PID.P1)).all())
+
+        out = np.full((len(game_states) + 2, encoder.size()), -1, dtype=np.float32)
+        pids = [PID.P1 if i % 2 else PID.P2 for i in range(len(game_states))]
+        self.assertIs(encoder.encode_batch(game_states, pids, out=out), out)
+        for row, game_state, pid in zip(out, game_states, pids):
+            self.assertTrue((row == encoder.encode(game_state, pid)).all())
+        self.assertTrue((out[-2:] == -1).all())
+        self.assertRaises(Exception, encoder.encode_batch, game_states, PID.P1, out[:1])
+
+    def test_perspective(self):
+        from src.dgisim.encoding import ObservationEncoder
+        encoder = ObservationEncoder(DefaultMode(), hide_opponent=False)
+        hiding_encoder = ObservationEncoder(DefaultMode())
+        me, opponent, size = encoder._me, encoder._opponent, encoder.size()
+        for game_state in self._game_states()[::10]:
+            p1_view = encoder.encode(game_state, PID.P1)
+            p2_view = encoder.encode(game_state, PID.P2)
+            self.assertTrue((p1_view[me:opponent] == p2_view[opponent:size]).all())
+            self.assertTrue((p1_view[opponent:size] == p2_view[me:opponent]).all())
+
+            hidden_view = hiding_encoder.encode(game_state, PID.P1)
+            self.assertTrue((hidden_view[:opponent] == p1_view[:opponent]).all())
+            self.assertLessEqual(
+                np.count_nonzero(hidden_view[opponent:]),
+                np.count_nonzero(p1_view[opponent:]),
+            )
@@ -9,3 +9,136 @@ class TestGameState(unittest.TestCase):
         game_state = GameState.from_default()
         other_state = game_state.factory().build()
         self.assertEqual(game_state, other_state)
+
+    def test_rng_determinism(self):
+        game_state = GameState.from_default(seed=42)
+        self.assertEqual(game_state, GameState.from_default(seed=42))
+        self.assertNotEqual(game_state, GameState.from_default(seed=43))
+        next_state = game_state.step()
+        self.assertEqual(next_state, GameState.from_default(seed=42).step())
+        self.assertEqual(next_state.get_rng(), game_state.get_rng().next())
+
+    def test_hash(self):
+        import pickle
+        game_state = GameState.from_default(seed=1).step()
+        other_state = GameState.from_default(seed=1).step()
+        self.assertIsNot(game_state, other_state)
+        self.assertEqual(hash(game_state), hash(other_state))
+        self.assertEqual(hash(game_state), hash(game_state))
+        unpickled_state = pickle.loads(pickle.dumps(game_state))
+        self.assertEqual(unpickled_state, game_state)
+        self.assertEqual(hash(unpickled_state), hash(game_state))
+
+    def test_eq_checks_statuses(self):
+        from src.dgisim.status.status import SatiatedStatus
+        game_state = GameState.from_default()
+        p1 = game_state.get_player1()
+        char = p1.get_characters().get_characters()[0]
+        other_state = game_state.factory().player1(
+            p1.factory().f_characters(
+                lambda cs: cs.factory().character(
+                    char.factory().f_character_statuses(
+                        lambda sts: sts.update_status(SatiatedStatus())
+                    ).build()
+                ).build()
+            ).build()
+        ).build()
+        self.assertNotEqual(game_state, other_state)
+
+    def test_lazy_memoized_checkers(self):
+        import pickle
+        from src.dgisim.character.character_skill_enum import CharacterSkill
+        game_state = GameState.from_default(seed=2).auto_step()
+        self.assertIsNone(game_state._skill_checker)
+        pid = game_state.waiting_for()
+        assert pid is not None
+        skill_checker = game_state.skill_checker()
+        self.assertIs(skill_checker, game_state.skill_checker())
+        self.assertIs(game_state.swap_checker(), game_state.swap_checker())
+        usable = skill_checker.usable(pid, 1, CharacterSkill.NORMAL_ATTACK)
+        self.assertIs(usable, skill_checker.usable(pid, 1, CharacterSkill.NORMAL_ATTACK))
+        self.assertEqual(
+            game_state.swap_checker().swap_details(pid, 2),
+            game_state.factory().build().swap_checker().swap_details(pid, 2),
+        )
+        unpickled_state = pickle.loads(pickle.dumps(game_state))
+        self.assertIsNone(unpickled_state._skill_checker)
+        self.assertEqual(unpickled_state.legal_actions(pid), game_state.legal_actions(pid))
+
+    def test_core_objects_are_slotted(self):
+        import sys
+        from src.dgisim.character.characters_set import default_characters
+        from src.dgisim.effect.effect import Effect
+        from src.dgisim.status.status import Status
+        from src.dgisim.summon.summon import Summon
+
+        def subclasses(cls: type) -> set[type]:
+            # dataclass(slots=True) leaves the replaced classes behind until collected
+            subs: list[type] = cls.__subclasses__()
+            subs = [
+                sub for sub in subs
+                if getattr(sys.modules[sub.__module__], sub.__name__, None) is sub
+            ]
+            return set(subs).union(*(subclasses(sub) for sub in subs))
+
+        # summons share `usages` with shield statuses through multiple inheritance,
+        # so they cannot be slotted
+        summons = subclasses(Summon) | {Summon}
+        for cls in subclasses(Status) | subclasses(Effect) | default_characters():
+            if cls not in summons:
+                self.assertEqual(cls.__dictoffset__, 0, cls)
+
+        game_state = GameState.from_default(seed=4).auto_step()
+        player = game_state.get_player1()
+        objects = [
+            game_state, player, player.get_characters(), player.get_combat_statuses(),
+            player.get_summons(), player.get_supports(), player.get_dices(),
+            player.get_hand_cards(), game_state.get_effect_stack(),
+        ]
+        for character in player.get_characters():
+            objects += [
+                character, character.get_character_statuses(), character.get_elemental_aura(),
+            ]
+        for obj in objects:
+            self.assertFalse(hasattr(obj, "__dict__"), type(obj))
+
+    def test_slotted_methods_refer_to_their_class(self):
+        import ast
+        import inspect
+        import sys
+        import textwrap
+        from src.dgisim.effect.effect import Effect
+        from src.dgisim.status.status import KeqingElectroInfusionStatus, Status
+        from src.dgisim.support.support import Support
+
+        def subclasses(cls: type) -> set[type]:
+            subs: list[type] = cls.__subclasses__()
+            subs = [
+                sub for sub in subs
+                if getattr(sys.modules[sub.__module__], sub.__name__, None) is sub
+            ]
+            return set(subs).union(*(subclasses(sub) for sub in subs))
+
+        def calls_bare_super(func) -> bool:
+            tree = ast.parse(textwrap.dedent(inspect.getsource(func)))
+            return any(
+                isinstance(node, ast.Call) and isinstance(node.func, ast.Name)
+                and node.func.id == "super" and not node.args
+                for node in ast.walk(tree)
+            )
+
+        # dataclass(slots=True) copies the methods into a new class, so their
+        # zero-argument super() would still refer to the replaced class
+        for cls in subclasses(Status) | subclasses(Effect) | subclasses(Support):
+            for member in cls.__dict__.values():
+                func = getattr(member, "__func__", member)
+                if not inspect.isfunction(func) or func.__closure__ is None:
+                    continue
+                cells = dict(zip(func.__code__.co_freevars, func.__closure__))
+                if "__class__" in cells and cells["__class__"].cell_contents is not cls:
+                    self.assertFalse(calls_bare_super(func), func)
+
+        # super() through _InfusionStatus and _UsageStatus
+        status = KeqingElectroInfusionStatus(usages=2, damage_boost=1)
+        self.assertEqual(str(status), "KeqingElectroInfusion(2)(1)")
+        self.assertIsNone(status.update(KeqingElectroInfusionStatus(usages=-2)))
@@ -2,15 +2,16 @@ import unittest
 
 from src.dgisim.agents import *
 from src.dgisim.card.cards import Cards
-from src.dgisim.game_state_machine import GameStateMachine
+from src.dgisim.game_state_machine import GameStateMachine, HistoryPolicy
 from src.dgisim.helper.level_print import GamePrinter
+from src.dgisim.history_view import HistoryView
 from src.dgisim.phase.action_phase import ActionPhase
 from src.dgisim.phase.card_select_phase import CardSelectPhase
 from src.dgisim.phase.end_phase import EndPhase
 from src.dgisim.phase.game_end_phase import GameEndPhase
 from src.dgisim.phase.roll_phase import RollPhase
 from src.dgisim.phase.starting_hand_select_phase import StartingHandSelectPhase
-from src.dgisim.state.enums import ACT
+from src.dgisim.state.enums import ACT, PID
 from src.dgisim.state.game_state import GameState
 
 
@@ -168,3 +169,170 @@ class TestGameStateMachine(unittest.TestCase):
             except Exception:
                 print(GamePrinter.dict_game_printer(state_machine.get_game_state().dict_str()))
                 raise Exception("Test failed")
+
+    def test_seeded_games_are_reproducible(self):
+        def play(seed: int) -> tuple[GameState, ...]:
+            state_machine = GameStateMachine(
+                GameState.from_default(seed=seed),
+                RandomAgent(seed=seed),
+                RandomAgent(seed=seed + 1),
+            )
+            state_machine.step_until_phase(GameEndPhase)
+            return state_machine.get_history()
+
+        history = play(7)
+        self.assertEqual(history, play(7))
+        self.assertNotEqual(history, play(8))
+
+    def test_fast_auto_step_matches_stepping(self):
+        for seed in range(3):
+            state_machine = GameStateMachine(
+                GameState.from_default(seed=seed),
+                RandomAgent(seed=seed),
+                RandomAgent(seed=seed + 1),
+            )
+            state_machine.step_until_phase(GameEndPhase)
+            history = state_machine.get_history()
+            for game_state in history[::7]:
+                expected_state = game_state
+                while not expected_state.game_end() and expected_state.waiting_for() is None:
+                    expected_state = expected_state.step()
+                self.assertEqual(game_state.auto_step(), expected_state)
+
+            fast_state_machine = GameStateMachine(
+                GameState.from_default(seed=seed),
+                RandomAgent(seed=seed),
+                RandomAgent(seed=seed + 1),
+            )
+            while not fast_state_machine.game_end():
+                fast_state_machine.player_step(fast=True)
+            self.assertEqual(fast_state_machine.get_game_state(), state_machine.get_game_state())
+            self.assertEqual(
+                fast_state_machine.get_action_history(),
+                state_machine.get_action_history(),
+            )
+            self.assertLess(len(fast_state_machine.get_history()), len(history))
+
+    def test_fast_step_leaves_its_input_intact(self):
+        from src.dgisim.state.zobrist import check_zobrist_key
+        state_machine = GameStateMachine(
+            GameState.from_default(seed=5),
+            RandomAgent(seed=5),
+            RandomAgent(seed=6),
+        )
+        state_machine.step_until_phase(GameEndPhase)
+        drained = 0
+        for game_state in state_machine.get_history():
+            phase = game_state.get_phase()
+            if game_state.game_end() or not phase._step_executes_effect(game_state):
+                continue
+            copy = GameState.from_bytes(game_state.to_bytes())
+            game_state.zobrist_key()
+            fast_state = phase.fast_step(game_state)
+            self.assertEqual(game_state, copy)
+            self.assertEqual(game_state.zobrist_key(), copy.zobrist_key())
+            check_zobrist_key(fast_state)
+            drained += 1
+        self.assertGreater(drained, 0)
+
+    def test_history_policies(self):
+        def play(policy: HistoryPolicy, fast: bool) -> GameStateMachine:
+            state_machine = GameStateMachine(
+                GameState.from_default(seed=4),
+                RandomAgent(seed=4),
+                RandomAgent(seed=5),
+                history_policy=policy,
+                keyframe_interval=5,
+            )
+            while not state_machine.game_end():
+                state_machine.player_step(fast=fast)
+            return state_machine
+
+        for fast in (False, True):
+            full = play(HistoryPolicy.FULL, fast)
+            history = full.get_history()
+            for policy in (HistoryPolicy.KEYFRAMES, HistoryPolicy.ACTIONS):
+                state_machine = play(policy, fast)
+                self.assertEqual(state_machine.latest_index(), full.latest_index())
+                self.assertEqual(state_machine.num_actions(), full.num_actions())
+                self.assertEqual(state_machine.get_last_action(), full.get_last_action())
+                # backwards, forwards and random access
+                for index in [*range(len(history) - 1, -1, -97), *range(0, len(history), 13), 7, 3]:
+                    self.assertEqual(state_machine.get_game_state_at(index), history[index])
+                    self.assertEqual(state_machine.action_at(index), full.action_at(index))
+                self.assertEqual(state_machine.get_history(), history)
+                self.assertEqual(
+                    state_machine.get_action_history(),
+                    full.get_action_history(),
+                )
+
+            state_machine = play(HistoryPolicy.NONE, fast)
+            self.assertEqual(state_machine.get_game_state(), full.get_game_state())
+            self.assertEqual(state_machine.num_actions(), len(full.get_action_history()))
+            self.assertEqual(state_machine.get_last_action(), full.get_last_action())
+            self.assertEqual(state_machine.get_last_action_idx(), full.get_last_action_idx())
+            self.assertIs(
+                state_machine.get_game_state_at(state_machine.latest_index()),
+                state_machine.get_game_state(),
+            )
+            self.assertRaises(Exception, state_machine.get_game_state_at, 0)
+
+    def test_agents_get_history_views(self):
+        test = self
+
+        class HistoryAgent(RandomAgent):
+            NEEDS_HISTORY = True
+
+            def choose_action(self, history, pid):
+                test.assertIsInstance(history, HistoryView)
+                test.assertIs(history[-1], state_machine.get_game_state())
+                test.assertIs(history.current(), history[-1])
+                test.assertEqual(len(history), state_machine.latest_index() + 1)
+                test.assertEqual(history[0], initial_state)
+                test.assertEqual(history[-3:], state_machine.get_history()[-3:])
+                test.assertIs(history.last_action(), state_machine.get_last_action())
+                return super().choose_action(history, pid)
+
+        class MemorylessAgent(RandomAgent):
+            def choose_action(self, history, pid):
+                test.assertEqual(len(history), 1)
+                test.assertIs(history[0], state_machine.get_game_state())
+                test.assertRaises(IndexError, history.__getitem__, 1)
+                test.assertIs(history.last_action(), state_machine.get_last_action())
+                return super().choose_action(history, pid)
+
+        initial_state = GameState.from_default(seed=2)
+        for policy in (HistoryPolicy.FULL, HistoryPolicy.KEYFRAMES):
+            state_machine = GameStateMachine(
+                initial_state,
+                HistoryAgent(seed=2),
+                MemorylessAgent(seed=3),
+                history_policy=policy,
+            )
+            for _ in range(30):
+                state_machine.player_step(fast=True)
+            self.assertIs(state_machine.get_history_view()[-1], state_machine.get_game_state())
+
+    def test_legal_actions_cover_random_agent(self):
+        for seed in range(3):
+            state_machine = GameStateMachine(
+                GameState.from_default(seed=seed),
+                RandomAgent(seed=seed),
+                RandomAgent(seed=seed + 1),
+            )
+            while not state_machine.game_end():
+                state_machine.auto_step(fast=True)
+                game_state = state_machine.get_game_state()
+                if game_state.game_end():
+                    self.assertEqual(game_state.legal_actions(PID.P1), ())
+                    break
+                pid = game_state.waiting_for()
+                assert pid is not None
+                legal_actions = game_state.legal_actions(pid)
+                self.assertIs(legal_actions, game_state.legal_actions(pid))
+                self.assertEqual(game_state.legal_actions(pid.other()), ())
+                self.assertEqual(len(set(legal_actions)), len(legal_actions))
+                for action in legal_actions:
+                    self.assertIsNotNone(game_state.action_step(pid, action))
+                state_machine.one_step()
+                self.assertIn(state_machine.get_last_action(), legal_actions)
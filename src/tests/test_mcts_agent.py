@@ -0,0 +1,61 @@
+import unittest
+
+from src.dgisim.agents import MCTSAgent, RandomAgent
+from src.dgisim.game_state_machine import GameStateMachine, HistoryPolicy
+from src.dgisim.history_view import HistoryView
+from src.dgisim.state.game_state import GameState
+
+
+class TestMCTSAgent(unittest.TestCase):
+    def test_plays_legal_actions(self):
+        state_machine = GameStateMachine(
+            GameState.from_default(seed=1),
+            MCTSAgent(iterations=4, rollout_depth=4, table_size=64, seed=1),
+            RandomAgent(seed=2),
+            history_policy=HistoryPolicy.NONE,
+        )
+        for _ in range(12):
+            state_machine.auto_step(fast=True)
+            game_state = state_machine.get_game_state()
+            pid = game_state.waiting_for()
+            state_machine.one_step()
+            if pid is not None and pid.is_player1():
+                self.assertIn(state_machine.get_last_action(), game_state.legal_actions(pid))
+
+    def test_budget_and_table(self):
+        game_state = GameState.from_default(seed=3).auto_step()
+        pid = game_state.waiting_for()
+        assert pid is not None
+        agent = MCTSAgent(iterations=None, time_limit=0.05, rollout_depth=2, table_size=8, seed=3)
+        action = agent.choose_action(HistoryView.of_state(game_state), pid)
+        self.assertIn(action, game_state.legal_actions(pid))
+        self.assertLessEqual(len(agent._search._table), 8)
+        self.assertRaises(Exception, MCTSAgent, iterations=None, time_limit=None)
+
+    def test_table_evicts_least_recently_used(self):
+        game_state = GameState.from_default(seed=4).auto_step()
+        agent = MCTSAgent(iterations=1, rollout_depth=2, table_size=16, seed=4)
+        search = agent._search
+        # fills the table with nodes of another (stale) game first
+        search.search(GameState.from_default(seed=6).auto_step(), 40, None)
+        visits = search.search(game_state, 200, None)
+        self.assertLessEqual(len(search._table), 16)
+        self.assertIn(game_state, search._table)
+        self.assertEqual(sum(visits.values()), 200)
+
+    def test_reproducible_with_workers(self):
+        game_state = GameState.from_default(seed=5).auto_step()
+        pid = game_state.waiting_for()
+        assert pid is not None
+
+        def choose(num_workers: int):
+            agent = MCTSAgent(iterations=6, rollout_depth=3, num_workers=num_workers, seed=5)
+            try:
+                return agent.choose_action(HistoryView.of_state(game_state), pid)
+            finally:
+                agent.close()
+
+        self.assertEqual(choose(1), choose(1))
+        action = choose(2)
+        self.assertIn(action, game_state.legal_actions(pid))
+        self.assertEqual(action, choose(2))
@@ -0,0 +1,107 @@
+import io
+import unittest
+
+from src.dgisim.agents import RandomAgent
+from src.dgisim.game_state_machine import GameStateMachine, HistoryPolicy
+from src.dgisim.phase.game_end_phase import GameEndPhase
+from src.dgisim.replay import *
+from src.dgisim.state.game_state import GameState
+
+
+class TestActionLog(unittest.TestCase):
+    def _played(self, game_state: GameState, seed: int, **kwargs) -> GameStateMachine:
+        state_machine = GameStateMachine(
+            game_state,
+            RandomAgent(seed=seed),
+            RandomAgent(seed=seed + 1),
+            **kwargs,
+        )
+        state_machine.step_until_phase(GameEndPhase)
+        return state_machine
+
+    def _log_of(self, state_machine: GameStateMachine) -> tuple[ActionLog, bytes]:
+        stream = io.BytesIO()
+        write_action_log(stream, state_machine)
+        data = stream.getvalue()
+        return read_action_log(io.BytesIO(data)), data
+
+    def test_replay_and_seek(self):
+        state_machine = self._played(GameState.from_default(seed=7), 7)
+        log, data = self._log_of(state_machine)
+        self.assertEqual(log.get_actions(), state_machine.get_actions())
+        self.assertEqual(log.get_initial_state(), state_machine.get_game_state_at(0))
+        self.assertEqual(replay(log), state_machine.get_game_state())
+        decision_states = state_machine.get_action_history()
+        for i in range(0, log.num_actions(), 5):
+            self.assertEqual(replay(log, i), decision_states[i])
+        self.assertRaises(Exception, replay, log, log.num_actions() + 1)
+        # a few bytes per action
+        self.assertLess(len(data), 20 * log.num_actions() + 200)
+
+    def test_negative_seed(self):
+        new_game = GameState.from_default(seed=-7)
+        for game_state in (new_game, new_game.auto_step()):
+            state_machine = self._played(game_state, 7)
+            log, _ = self._log_of(state_machine)
+            self.assertEqual(log.get_initial_state(), game_state)
+            self.assertEqual(replay(log), state_machine.get_game_state())
+
+    def test_started_game_and_history_policy(self):
+        game_state = GameState.from_default(seed=8).auto_step()
+        state_machine = self._played(game_state, 8, history_policy=HistoryPolicy.ACTIONS)
+        log, _ = self._log_of(state_machine)
+        self.assertEqual(log.get_initial_state(), game_state)
+        self.assertEqual(replay(log), state_machine.get_game_state())
+
+    def test_append_as_the_game_goes(self):
+        game_state = GameState.from_default(seed=9)
+        stream = io.BytesIO()
+        writer = ActionLogWriter(stream, game_state)
+        state_machine = GameStateMachine(game_state, RandomAgent(seed=9), RandomAgent(seed=10))
+        while not state_machine.game_end():
+            state_machine.player_step(fast=True)
+            if state_machine.num_actions() > writer.num_actions():
+                writer.write(state_machine.get_actions()[-1])
+        log = read_action_log(io.BytesIO(stream.getvalue()))
+        self.assertEqual(replay(log), state_machine.get_game_state())
+
+    def test_rejects_invalid_logs(self):
+        state_machine = self._played(GameState.from_default(seed=11), 11)
+        _, data = self._log_of(state_machine)
+        self.assertRaises(Exception, read_action_log, io.BytesIO(b"XXX" + data[3:]))
+        self.assertRaises(Exception, read_action_log, io.BytesIO(data[:-1]))
+        log = read_action_log(io.BytesIO(data))
+        illegal_log = ActionLog(log.get_initial_state(), log.get_actions()[1:])
+        self.assertRaises(Exception, replay, illegal_log)
+
+
+class TestStateReplay(unittest.TestCase):
+    def _history(self, seed: int) -> tuple[GameState, ...]:
+        state_machine = GameStateMachine(
+            GameState.from_default(seed=seed),
+            RandomAgent(seed=seed),
+            RandomAgent(seed=seed + 1),
+        )
+        state_machine.step_until_phase(GameEndPhase)
+        return state_machine.get_history()
+
+    def test_write_and_read(self):
+        history = self._history(5)
+        for keyframe_interval in (None, 16):
+            stream = io.BytesIO()
+            writer = StateReplayWriter(stream, keyframe_interval=keyframe_interval)
+            writer.write_all(history)
+            self.assertEqual(writer.num_states(), len(history))
+            stream.seek(0)
+            self.assertEqual(tuple(read_state_replay(stream)), history)
+            if keyframe_interval is None:
+                size = len(stream.getvalue())
+                self.assertLess(size * 10, sum(len(gs.to_bytes()) for gs in history))
+
+    def test_rejects_invalid_streams(self):
+        stream = io.BytesIO()
+        StateReplayWriter(stream).write(GameState.from_default(seed=6))
+        data = stream.getvalue()
+        self.assertRaises(Exception, list, read_state_replay(io.BytesIO(b"XXX" + data[3:])))
+        self.assertRaises(Exception, list, read_state_replay(io.BytesIO(data[:-1])))
+        self.assertRaises(Exception, StateReplayWriter, io.BytesIO(), keyframe_interval=0)
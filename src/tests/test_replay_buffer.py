@@ -0,0 +1,126 @@
+import os
+import tempfile
+import unittest
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None  # type: ignore
+
+from src.dgisim.agents import RandomAgent
+from src.dgisim.game_state_machine import GameStateMachine
+from src.dgisim.mode import DefaultMode
+from src.dgisim.state.enums import PID
+from src.dgisim.state.game_state import GameState
+
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class TestReplayBuffer(unittest.TestCase):
+    def setUp(self):
+        from src.dgisim.action.action_space import ActionSpace
+        from src.dgisim.encoding import ObservationEncoder
+        self.encoder = ObservationEncoder(DefaultMode())
+        self.action_space = ActionSpace(DefaultMode())
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.path = os.path.join(tmp_dir.name, "buffer.bin")
+
+    def _buffer(self, **kwargs):
+        from src.dgisim.replay_buffer import ReplayBuffer
+        return ReplayBuffer(self.path, self.encoder, self.action_space, seed=0, **kwargs)
+
+    def _state_machine(self, seed: int) -> GameStateMachine:
+        return GameStateMachine(
+            GameState.from_default(seed=seed),
+            RandomAgent(seed=seed),
+            RandomAgent(seed=seed + 1),
+        )
+
+    def test_records_decision_points(self):
+        buffer = self._buffer(capacity=1000)
+        state_machine = self._state_machine(1)
+        decisions = []
+        state_machine.add_action_hook(
+            lambda game_state, pid, action: decisions.append((game_state, pid, action))
+        )
+        buffer.record(state_machine)
+        self.assertEqual(len(decisions), state_machine.num_actions())
+        covered = [
+            (game_state, pid, self.action_space.encode(action))
+            for game_state, pid, action in decisions
+            if self.action_space.encode(action) is not None
+        ]
+        self.assertEqual(len(buffer), len(covered))
+        winner = state_machine.get_winner()
+
+        batch = buffer.sample(64)
+        self.assertEqual(batch.observations.shape, (64, self.encoder.size()))
+        self.assertTrue((batch.weights == 1).all())
+        for i, index in enumerate(batch.indices):
+            game_state, pid, action_index = covered[index]
+            self.assertTrue(
+                (batch.observations[i] == self.encoder.encode(game_state, pid)).all()
+            )
+            self.assertTrue((batch.masks[i] == self.action_space.mask(game_state, pid)).all())
+            self.assertEqual(batch.actions[i], action_index)
+            self.assertEqual(batch.pids[i], pid.value)
+            expected_outcome = 0 if winner is None else (1 if pid is winner else -1)
+            self.assertEqual(batch.outcomes[i], expected_outcome)
+
+    def test_ring_reopen_and_priorities(self):
+        buffer = self._buffer(capacity=100)
+        for seed in range(3):
+            buffer.record(self._state_machine(seed))
+        self.assertEqual(len(buffer), 100)
+        self.assertGreater(buffer.num_written(), 100)
+        # a game in progress is not part of the buffer
+        buffer.on_action(*self._decision(10))
+        num_written = buffer.num_written()
+        buffer.flush()
+        del buffer
+
+        buffer = self._buffer()
+        self.assertEqual((len(buffer), buffer.num_written()), (100, num_written))
+        priorities = np.zeros(100)
+        priorities[7] = 1e6
+        buffer.update_priorities(np.arange(100), priorities)
+        batch = buffer.sample_prioritized(32)
+        self.assertTrue((batch.indices == 7).all())
+        self.assertTrue((batch.weights == 1).all())
+
+        self.assertRaises(Exception, self._buffer, capacity=0)
+        from src.dgisim.replay_buffer import ReplayBuffer
+        from src.dgisim.encoding import ObservationEncoder
+        other_encoder = ObservationEncoder(DefaultMode(), num_chars=2)
+        self.assertRaises(Exception, ReplayBuffer, self.path, other_encoder, self.action_space)
+
+    def test_game_in_progress_leaves_the_ring_intact(self):
+        buffer = self._buffer(capacity=120)
+        for seed in range(3):
+            buffer.record(self._state_machine(seed))
+        self.assertGreater(buffer.num_written(), 120)
+        committed = np.array(buffer._records)
+        for seed in range(10, 15):
+            buffer.on_action(*self._decision(seed))
+        self.assertTrue((np.array(buffer._records) == committed).all())
+        batch = buffer.sample(256)
+        self.assertTrue((batch.outcomes == committed["outcome"][batch.indices]).all())
+        buffer.abort_game()
+        self.assertTrue((np.array(buffer._records) == committed).all())
+
+        # the next game ends up in the slots after the committed ones
+        num_written = buffer.num_written()
+        game_state, pid, action = self._decision(10)
+        buffer.on_action(game_state, pid, action)
+        buffer.end_game(pid.other())
+        self.assertEqual(buffer.num_written(), num_written + 1)
+        slot = num_written % 120
+        self.assertEqual(buffer._records["outcome"][slot], -1.0)
+        self.assertEqual(buffer._records["pid"][slot], pid.value)
+        self.assertTrue((np.delete(np.array(buffer._records), slot) == np.delete(committed, slot)).all())
+
+    def _decision(self, seed: int):
+        game_state = GameState.from_default(seed=seed).auto_step()
+        pid = game_state.waiting_for()
+        assert pid is not None
+        return game_state, pid, game_state.legal_actions(pid)[0]
@@ -0,0 +1,56 @@
+import random
+import unittest
+
+from src.dgisim.agents import HardCodedRandomAgent, RandomAgent
+from src.dgisim.runner import *
+from src.dgisim.state.game_state import GameState
+
+
+class TestRunner(unittest.TestCase):
+    def test_play_game(self):
+        result = play_game(GameState.from_default, RandomAgent, RandomAgent, game_id=3, seed=7)
+        self.assertEqual(result.game_id, 3)
+        self.assertEqual(result.seed, 7)
+        self.assertGreater(result.rounds, 0)
+        self.assertGreater(result.num_actions, 0)
+        self.assertGreater(result.wall_time, 0)
+
+    def test_run_games_reproducible(self):
+        serial = list(run_games(
+            GameState.from_default, RandomAgent, RandomAgent,
+            num_games=4, num_workers=1, seed=11,
+        ))
+        self.assertEqual([result.game_id for result in serial], [0, 1, 2, 3])
+        parallel = sorted(
+            run_games(
+                GameState.from_default, RandomAgent, RandomAgent,
+                num_games=4, num_workers=2, seed=11, chunk_size=1,
+            ),
+            key=lambda result: result.game_id,
+        )
+
+        def outcome(result: GameResult) -> tuple:
+            return (result.game_id, result.seed, result.winner, result.rounds, result.num_actions)
+
+        self.assertEqual(
+            [outcome(result) for result in serial],
+            [outcome(result) for result in parallel],
+        )
+
+    def test_agents_seeded_without_global_random(self):
+        def outcome(result: GameResult) -> tuple:
+            return (result.winner, result.rounds, result.num_actions)
+
+        def game_state_factory() -> GameState:
+            return GameState.from_default(seed=0)
+
+        random.seed(1)
+        first = play_game(game_state_factory, HardCodedRandomAgent, RandomAgent, seed=9)
+        random.seed(2)
+        global_state = random.getstate()
+        second = play_game(game_state_factory, HardCodedRandomAgent, RandomAgent, seed=9)
+        self.assertEqual(random.getstate(), global_state)
+        self.assertEqual(outcome(first), outcome(second))
+
+    def test_run_no_games(self):
+        self.assertEqual(list(run_games(GameState.from_default, RandomAgent, RandomAgent, 0)), [])
@@ -1,9 +1,15 @@
 import unittest
+from dataclasses import dataclass
 
 from src.dgisim.action.action import *
 from src.dgisim.agents import PuppetAgent
 from src.dgisim.card.card import *
+from src.dgisim.effect.effect import TriggerStatusEffect
+from src.dgisim.effect.enums import TRIGGERING_SIGNAL
 from src.dgisim.game_state_machine import GameStateMachine
+from src.dgisim.state.enums import PID
+from src.dgisim.status.enums import PREPROCESSABLES
+from src.dgisim.status.status_processing import StatusProcessing
 from src.dgisim.status.status import *
 from src.dgisim.status.statuses import *
 from src.tests.helpers.game_state_templates import *
@@ -88,3 +94,53 @@ class TestStatus(unittest.TestCase):
         assert isinstance(status, MushroomPizzaStatus)
         self.assertEqual(character.get_hp(), 3)
         self.assertEqual(status.usages, 1)
+
+    def testDeclaredSignalsAndPreprocessTypes(self):
+        self.assertEqual(FrozenStatus.REACTABLE_SIGNALS, {TRIGGERING_SIGNAL.ROUND_END})
+        self.assertEqual(FrozenStatus.PREPROCESS_TYPES, {PREPROCESSABLES.DMG_AMOUNT})
+        self.assertEqual(
+            KeqingElectroInfusionStatus.PREPROCESS_TYPES,
+            {PREPROCESSABLES.DMG_ELEMENT, PREPROCESSABLES.DMG_AMOUNT},
+        )
+        self.assertFalse(ThunderingPenanceStatus.REACTABLE_SIGNALS)
+        self.assertFalse(ThunderingPenanceStatus.PREPROCESS_TYPES)
+        self.assertTrue(ColdBloodedStrikeStatus.INFORMABLE)
+        self.assertFalse(SatiatedStatus.INFORMABLE)
+
+        @dataclass(frozen=True)
+        class UndeclaredStatus(CombatStatus):
+            def _react_to_signal(self, source, signal):
+                return [], self
+
+        self.assertEqual(UndeclaredStatus.REACTABLE_SIGNALS, frozenset(TRIGGERING_SIGNAL))
+        self.assertFalse(UndeclaredStatus.PREPROCESS_TYPES)
+
+    def testOnlyRelevantStatusesAreTriggered(self):
+        game_state = ACTION_TEMPLATE.factory().f_player1(
+            lambda p: p.factory().f_characters(
+                lambda cs: cs.factory().f_character(
+                    2,
+                    lambda c: c.factory().character_statuses(
+                        Statuses((SatiatedStatus(), ThunderingPenanceStatus()))
+                    ).build()
+                ).build()
+            ).build()
+        ).build()
+        effects = StatusProcessing.trigger_all_statuses_effects(
+            game_state, PID.P1, TRIGGERING_SIGNAL.ROUND_END
+        )
+        self.assertIn(
+            SatiatedStatus,
+            [effect.status for effect in effects if isinstance(effect, TriggerStatusEffect)]
+        )
+        self.assertNotIn(
+            ThunderingPenanceStatus,
+            [effect.status for effect in effects if isinstance(effect, TriggerStatusEffect)]
+        )
+        effects = StatusProcessing.trigger_all_statuses_effects(
+            game_state, PID.P1, TRIGGERING_SIGNAL.COMBAT_ACTION
+        )
+        self.assertNotIn(
+            SatiatedStatus,
+            [effect.status for effect in effects if isinstance(effect, TriggerStatusEffect)]
+        )
@@ -0,0 +1,72 @@
+import random
+import unittest
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None  # type: ignore
+
+from src.dgisim.agents import RandomAgent
+from src.dgisim.state.enums import PID
+
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class TestVectorEnv(unittest.TestCase):
+    @staticmethod
+    def _random_actions(masks: "np.ndarray", rng: random.Random) -> list[int]:
+        return [rng.choice(np.flatnonzero(mask)) for mask in masks]
+
+    def _check(self, env, result) -> None:
+        num_envs = env.num_envs()
+        self.assertEqual(result.observations.shape, (num_envs, env.encoder.size()))
+        self.assertEqual(result.masks.shape, (num_envs, env.action_space.size()))
+        self.assertTrue(result.masks.any(axis=1).all())
+        for game_state, pid, obs, mask in zip(
+                env.get_game_states(), result.pids, result.observations, result.masks
+        ):
+            self.assertIs(game_state.waiting_for(), PID(pid))
+            self.assertTrue((obs == env.encoder.encode(game_state, PID(pid))).all())
+            self.assertTrue((mask == env.action_space.mask(game_state, PID(pid))).all())
+
+    def test_self_play(self):
+        from src.dgisim.vector_env import VectorEnv
+        env = VectorEnv(3, seed=1)
+        rng = random.Random(1)
+        result = env.reset()
+        self._check(env, result)
+        num_dones = 0
+        for _ in range(200):
+            result = env.step(self._random_actions(result.masks, rng))
+            self._check(env, result)
+            num_dones += result.dones.sum()
+            self.assertTrue((result.rewards[~result.dones] == 0).all())
+            self.assertTrue((result.pids[~result.dones] != 0).all())
+        self.assertGreater(num_dones, 0)
+        self.assertRaises(Exception, env.step, [0])
+
+    def test_against_opponent_across_workers(self):
+        from src.dgisim.vector_env import VectorEnv
+
+        def play(num_workers: int) -> list:
+            rng = random.Random(2)
+            outcomes = []
+            with VectorEnv(
+                    4, opponent_factory=RandomAgent, learner_pid=PID.P2,
+                    num_workers=num_workers, seed=2,
+            ) as env:
+                result = env.reset()
+                self.assertTrue((result.pids == PID.P2.value).all())
+                for _ in range(100):
+                    result = env.step(self._random_actions(result.masks, rng))
+                    self.assertTrue((result.pids == PID.P2.value).all())
+                    outcomes.append((
+                        result.rewards.tolist(),
+                        result.dones.tolist(),
+                        result.observations.sum(axis=1).tolist(),
+                    ))
+                self._check(env, result)
+            return outcomes
+
+        serial = play(1)
+        self.assertTrue(any(any(dones) for _, dones, _ in serial))
+        self.assertEqual(serial, play(2))
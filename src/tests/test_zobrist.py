@@ -0,0 +1,40 @@
+import unittest
+
+from src.dgisim.agents import RandomAgent
+from src.dgisim.game_state_machine import GameStateMachine
+from src.dgisim.phase.game_end_phase import GameEndPhase
+from src.dgisim.state.game_state import GameState
+from src.dgisim.state.zobrist import check_zobrist_key
+
+
+class TestZobrist(unittest.TestCase):
+    def test_key_is_lazy(self):
+        game_state = GameState.from_default(seed=0)
+        self.assertIsNone(game_state._zobrist)
+        self.assertIsNone(game_state.step()._zobrist)
+        game_state.zobrist_key()
+        self.assertIsNotNone(game_state.step()._zobrist)
+
+    def test_equal_states_have_equal_keys(self):
+        game_state = GameState.from_default(seed=0).step()
+        other_state = GameState.from_default(seed=0).step()
+        self.assertEqual(game_state, other_state)
+        self.assertEqual(game_state.zobrist_key(), other_state.zobrist_key())
+        self.assertNotEqual(
+            game_state.zobrist_key(),
+            GameState.from_default(seed=1).step().zobrist_key(),
+        )
+
+    def test_incremental_key_matches_recompute(self):
+        for seed in range(3):
+            initial_state = GameState.from_default(seed=seed)
+            initial_state.zobrist_key()
+            state_machine = GameStateMachine(
+                initial_state,
+                RandomAgent(seed=seed),
+                RandomAgent(seed=seed + 100),
+            )
+            state_machine.step_until_phase(GameEndPhase)
+            for game_state in state_machine.get_history():
+                self.assertIsNotNone(game_state._zobrist)
+                check_zobrist_key(game_state)